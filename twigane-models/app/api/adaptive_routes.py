@@ -1,16 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.services.adaptive_service import AdaptiveService
+from app.api.dependencies import get_adaptive_service
 from app.middleware.auth import AuthMiddleware
-from typing import List
+from typing import Dict, List, Optional
+from datetime import datetime
 
 adaptive_router = APIRouter()
-adaptive_service = AdaptiveService()
 auth = AuthMiddleware()
 
 @adaptive_router.post("/initialize")
 async def initialize_learning_path(
     initial_assessment: dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    adaptive_service: AdaptiveService = Depends(get_adaptive_service)
 ):
     return await adaptive_service.initialize_learning_path(
         current_user["sub"],
@@ -18,15 +20,46 @@ async def initialize_learning_path(
     )
 
 @adaptive_router.get("/recommendations")
-async def get_recommendations(current_user: dict = Depends(auth)):
+async def get_recommendations(
+    current_user: dict = Depends(auth),
+    adaptive_service: AdaptiveService = Depends(get_adaptive_service)
+):
     return await adaptive_service.get_recommendations(current_user["sub"])
 
 @adaptive_router.put("/update")
 async def update_learning_path(
     performance_data: dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    adaptive_service: AdaptiveService = Depends(get_adaptive_service)
 ):
     return await adaptive_service.update_learning_path(
         current_user["sub"],
         performance_data
-    )
\ No newline at end of file
+    )
+
+@adaptive_router.get("/path")
+async def get_learning_path(
+    current_user: dict = Depends(auth),
+    adaptive_service: AdaptiveService = Depends(get_adaptive_service)
+):
+    """The learner's precomputed level, recommended topics and next lessons"""
+    return await adaptive_service.get_learning_path(current_user["sub"])
+
+@adaptive_router.post("/progress/{lesson_id}")
+async def record_lesson_progress(
+    lesson_id: str,
+    performance: Dict[str, float],
+    current_user: dict = Depends(auth),
+    adaptive_service: AdaptiveService = Depends(get_adaptive_service)
+):
+    return await adaptive_service.update_progress(current_user["sub"], lesson_id, performance)
+
+@adaptive_router.get("/history")
+async def get_lesson_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(auth),
+    adaptive_service: AdaptiveService = Depends(get_adaptive_service)
+):
+    return await adaptive_service.get_lesson_history(current_user["sub"], start, end, limit)
@@ -1,37 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List
 from app.services.analytics_service import AnalyticsService
-from app.middleware.auth import AuthMiddleware
+from app.api.dependencies import get_current_user, get_analytics_service, get_profile_service
 from app.services.profile_service import ProfileService
 
 analytics_router = APIRouter()
-analytics_service = AnalyticsService()
-profile_service = ProfileService()
-auth = AuthMiddleware()
 
 @analytics_router.get("/user/{user_id}")
 async def get_user_analytics(
     user_id: str,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     if not profile_service.check_permission(current_user["role"], "view_analytics"):
         raise HTTPException(status_code=403, detail="Permission denied")
     return await analytics_service.generate_user_analytics(user_id)
 
+@analytics_router.get("/content")
+async def get_many_content_metrics(
+    content_ids: List[str] = Query(...),
+    current_user: dict = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    if not profile_service.check_permission(current_user["role"], "view_analytics"):
+        raise HTTPException(status_code=403, detail="Permission denied")
+    return await analytics_service.get_many_content_metrics(content_ids)
+
+@analytics_router.post("/content/recompute", status_code=202)
+async def recompute_content_metrics(
+    current_user: dict = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    if not profile_service.check_permission(current_user["role"], "view_analytics"):
+        raise HTTPException(status_code=403, detail="Permission denied")
+    started = analytics_service.start_content_metrics_recompute()
+    return {"status": "started" if started else "already_running"}
+
 @analytics_router.get("/content/{content_id}")
 async def get_content_metrics(
     content_id: str,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     if not profile_service.check_permission(current_user["role"], "view_analytics"):
         raise HTTPException(status_code=403, detail="Permission denied")
-    return await analytics_service.generate_content_metrics(content_id)
+    return await analytics_service.get_content_metrics(content_id)
 
 @analytics_router.get("/progress/{user_id}")
 async def get_progress_report(
     user_id: str,
     period: str = "weekly",
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(get_current_user),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     if not profile_service.check_permission(current_user["role"], "view_analytics"):
         raise HTTPException(status_code=403, detail="Permission denied")
-    return await analytics_service.generate_progress_report(user_id, period)
\ No newline at end of file
+    return await analytics_service.generate_progress_report(user_id, period)
@@ -1,35 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.services.assessment_service import AssessmentService
+from app.api.dependencies import get_current_user, get_assessment_service, get_profile_service
 from app.middleware.auth import AuthMiddleware
 from app.services.profile_service import ProfileService
-from typing import List
+from app.models.assessment_models import AssessmentSubmission, BulkSubmissionResult
+from typing import List, Optional
+from datetime import datetime
 
 assessment_router = APIRouter()
-assessment_service = AssessmentService()
-profile_service = ProfileService()
 auth = AuthMiddleware()
 
 @assessment_router.post("/create")
 async def create_assessment(
     assessment_data: dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(get_current_user),
+    assessment_service: AssessmentService = Depends(get_assessment_service),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     if not profile_service.check_permission(current_user["role"], "create_assessment"):
         raise HTTPException(status_code=403, detail="Permission denied")
     return await assessment_service.create_assessment(assessment_data)
 
+@assessment_router.get("/history")
+async def get_assessment_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(auth),
+    assessment_service: AssessmentService = Depends(get_assessment_service)
+):
+    return await assessment_service.get_assessment_history(current_user["sub"], start, end, limit)
+
+@assessment_router.post("/submit/bulk", response_model=BulkSubmissionResult)
+async def submit_assessments(
+    submissions: List[AssessmentSubmission],
+    current_user: dict = Depends(get_current_user),
+    assessment_service: AssessmentService = Depends(get_assessment_service),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    for submission in submissions:
+        if submission.user_id is None:
+            submission.user_id = current_user["sub"]
+        elif submission.user_id != current_user["sub"] and not profile_service.check_permission(
+            current_user["role"], "manage_students"
+        ):
+            raise HTTPException(status_code=403, detail="Permission denied")
+    return await assessment_service.submit_many(submissions)
+
 @assessment_router.get("/{assessment_id}")
-async def get_assessment(assessment_id: str, current_user: dict = Depends(auth)):
+async def get_assessment(
+    assessment_id: str,
+    current_user: dict = Depends(auth),
+    assessment_service: AssessmentService = Depends(get_assessment_service)
+):
     return await assessment_service.get_assessment(assessment_id)
 
 @assessment_router.post("/{assessment_id}/submit")
 async def submit_assessment(
     assessment_id: str,
     submission: dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    assessment_service: AssessmentService = Depends(get_assessment_service)
 ):
     return await assessment_service.submit_assessment(
         current_user["sub"],
         assessment_id,
         submission
-    )
\ No newline at end of file
+    )
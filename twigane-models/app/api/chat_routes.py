@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.services.chatbot_service import ChatbotService
+from app.core.websocket_manager import WebSocketManager
+from app.middleware.auth import AuthMiddleware
+import json
+
+chat_router = APIRouter()
+auth = AuthMiddleware()
+chatbot_service = ChatbotService()
+chat_connections = WebSocketManager()
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+@chat_router.api_route("/stream", methods=["GET", "POST"])
+async def stream_chat_message(
+    message: str = Query(..., description="Message text"),
+    current_user: dict = Depends(auth)
+):
+    """Server-sent events: ``token``, ``sentence`` and a final ``done`` event"""
+    user_id = current_user["sub"]
+
+    async def events():
+        try:
+            async for event in chatbot_service.stream_response(user_id, message):
+                yield _sse(event)
+        except Exception as e:
+            yield _sse({"type": "error", "detail": f"Chat processing error: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Proxies must not hold the stream back until it completes
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@chat_router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket):
+    """Send ``{"message": ...}``; receive the same events as ``/chat/stream``"""
+    current_user = await auth.authenticate_websocket(websocket)
+    if current_user is None:
+        return
+    user_id = current_user["sub"]
+
+    await chat_connections.connect(websocket, user_id)
+    try:
+        while True:
+            try:
+                data = await websocket.receive_json()
+            except (ValueError, UnicodeDecodeError):
+                await websocket.send_json({"type": "error", "detail": "Expected {\"message\": <text>}"})
+                continue
+            message = data.get("message") if isinstance(data, dict) else None
+            if not message:
+                await websocket.send_json({"type": "error", "detail": "Expected {\"message\": <text>}"})
+                continue
+            try:
+                async for event in chatbot_service.stream_response(user_id, message):
+                    await websocket.send_json(event)
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                await websocket.send_json({"type": "error", "detail": f"Chat processing error: {str(e)}"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await chat_connections.disconnect(websocket, user_id)
@@ -1,26 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.ndjson import encode as ndjson_encode, read_lines
+from app.models.content_models import ContentPage, ImportReport
 from app.services.content_service import ContentService
+from app.api.dependencies import get_current_user, get_content_service, get_profile_service
 from app.middleware.auth import AuthMiddleware
 from app.services.profile_service import ProfileService
 from typing import List, Optional
 
 content_router = APIRouter()
-content_service = ContentService()
-profile_service = ProfileService()
 auth = AuthMiddleware()
 
 @content_router.post("/create")
-async def create_content(content_data: dict, current_user: dict = Depends(auth)):
+async def create_content(
+    content_data: dict,
+    current_user: dict = Depends(get_current_user),
+    content_service: ContentService = Depends(get_content_service),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
     if not profile_service.check_permission(current_user["role"], "create_content"):
         raise HTTPException(status_code=403, detail="Permission denied")
     return await content_service.create_content(content_data, current_user["sub"])
 
-@content_router.get("/list")
+@content_router.get("/list", response_model=ContentPage)
 async def list_content(
     subject: Optional[str] = None,
     difficulty: Optional[str] = None,
     grade: Optional[str] = None,
-    current_user: dict = Depends(auth)
+    limit: int = Query(settings.CONTENT_PAGE_SIZE, ge=1, le=settings.CONTENT_PAGE_MAX_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. title_rw,subject"),
+    stream: bool = Query(False, description="Stream every match as NDJSON instead of one page"),
+    current_user: dict = Depends(auth),
+    content_service: ContentService = Depends(get_content_service)
 ):
     filters = {}
     if subject:
@@ -29,17 +42,67 @@ async def list_content(
         filters["difficulty_level"] = difficulty
     if grade:
         filters["grade_level"] = grade
-    return await content_service.list_content(filters)
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    if stream:
+        documents = content_service.stream_content(filters, cursor, field_list)
+
+        async def ndjson():
+            async for doc in documents:
+                yield ndjson_encode(doc)
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    return await content_service.list_content(filters, limit, cursor, field_list)
+
+@content_router.post("/import", response_model=ImportReport)
+async def import_content(
+    request: Request,
+    kind: str = Query("content", description="content or exercises"),
+    current_user: dict = Depends(get_current_user),
+    content_service: ContentService = Depends(get_content_service),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    """Bulk import NDJSON records from the request body, one JSON object per line"""
+    if not profile_service.check_permission(current_user["role"], "create_content"):
+        raise HTTPException(status_code=403, detail="Permission denied")
+    return await content_service.import_records(kind, read_lines(request.stream()), current_user["sub"])
+
+@content_router.get("/export")
+async def export_content(
+    kind: str = Query("content", description="content or exercises"),
+    current_user: dict = Depends(get_current_user),
+    content_service: ContentService = Depends(get_content_service),
+    profile_service: ProfileService = Depends(get_profile_service)
+):
+    """Stream every record of ``kind`` as NDJSON, in the format /import accepts"""
+    if not profile_service.check_permission(current_user["role"], "export_content"):
+        raise HTTPException(status_code=403, detail="Permission denied")
+    documents = content_service.export_records(kind)
+
+    async def ndjson():
+        async for doc in documents:
+            yield ndjson_encode(doc)
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{kind}.ndjson"'}
+    )
 
 @content_router.get("/{content_id}")
-async def get_content(content_id: str, current_user: dict = Depends(auth)):
+async def get_content(
+    content_id: str,
+    current_user: dict = Depends(auth),
+    content_service: ContentService = Depends(get_content_service)
+):
     return await content_service.get_content(content_id)
 
 @content_router.put("/{content_id}")
 async def update_content(
     content_id: str,
     update_data: dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(get_current_user),
+    content_service: ContentService = Depends(get_content_service),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     if not profile_service.check_permission(current_user["role"], "edit_content"):
         raise HTTPException(status_code=403, detail="Permission denied")
@@ -49,9 +112,11 @@ async def update_content(
 async def add_exercise(
     content_id: str,
     exercise_data: dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(get_current_user),
+    content_service: ContentService = Depends(get_content_service),
+    profile_service: ProfileService = Depends(get_profile_service)
 ):
     if not profile_service.check_permission(current_user["role"], "create_exercise"):
         raise HTTPException(status_code=403, detail="Permission denied")
     exercise_data["content_id"] = content_id
-    return await content_service.create_exercise(exercise_data)
\ No newline at end of file
+    return await content_service.create_exercise(exercise_data)
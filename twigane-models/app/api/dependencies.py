@@ -0,0 +1,60 @@
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.core.database import get_database
+from app.middleware.auth import AuthMiddleware
+from app.services.adaptive_service import AdaptiveService
+from app.services.analytics_service import AnalyticsService
+from app.services.assessment_service import AssessmentService
+from app.services.auth_service import AuthService
+from app.services.content_service import ContentService
+from app.services.i18n_service import I18nService
+from app.services.mobile_service import MobileService
+from app.services.notification_service import NotificationService
+from app.services.profile_service import ProfileService
+from app.services.user_service import UserService
+
+auth = AuthMiddleware()
+
+# Services are cheap wrappers around the shared client, so each request gets
+# its own instance bound to the connected database.
+
+def get_adaptive_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> AdaptiveService:
+    return AdaptiveService(db)
+
+def get_analytics_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> AnalyticsService:
+    return AnalyticsService(db)
+
+def get_assessment_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> AssessmentService:
+    return AssessmentService(db)
+
+def get_auth_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> AuthService:
+    return AuthService(db)
+
+def get_content_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> ContentService:
+    return ContentService(db)
+
+def get_i18n_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> I18nService:
+    return I18nService(db)
+
+def get_mobile_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> MobileService:
+    return MobileService(db)
+
+def get_notification_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> NotificationService:
+    return NotificationService(db)
+
+def get_profile_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> ProfileService:
+    return ProfileService(db)
+
+def get_user_service(db: AsyncIOMotorDatabase = Depends(get_database)) -> UserService:
+    return UserService(db)
+
+async def get_current_user(
+    current_user: dict = Depends(auth),
+    profile_service: ProfileService = Depends(get_profile_service)
+) -> dict:
+    """The authenticated principal with the ``role`` from the user's profile.
+
+    Tokens only carry the user id, and a role can change after the token is
+    issued, so it is read per request through the profile cache.
+    """
+    return {**current_user, "role": await profile_service.get_role(current_user["sub"])}
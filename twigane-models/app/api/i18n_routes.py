@@ -1,20 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.services.i18n_service import I18nService
+from app.api.dependencies import get_i18n_service
 from app.middleware.auth import AuthMiddleware
 from app.models.i18n_models import AccessibilityPreferences
 
 i18n_router = APIRouter()
-i18n_service = I18nService()
 auth = AuthMiddleware()
 
 @i18n_router.get("/preferences")
-async def get_preferences(current_user: dict = Depends(auth)):
+async def get_preferences(
+    current_user: dict = Depends(auth),
+    i18n_service: I18nService = Depends(get_i18n_service)
+):
     return await i18n_service.get_user_preferences(current_user["sub"])
 
 @i18n_router.put("/preferences")
 async def update_preferences(
     preferences: AccessibilityPreferences,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    i18n_service: I18nService = Depends(get_i18n_service)
 ):
     return await i18n_service.update_user_preferences(
         current_user["sub"],
@@ -22,7 +26,8 @@ async def update_preferences(
     )
 
 @i18n_router.get("/translations/{lang}")
-async def get_translations(lang: str):
+async def get_translations(lang: str, i18n_service: I18nService = Depends(get_i18n_service)):
     if lang not in i18n_service.supported_languages:
         raise HTTPException(status_code=400, detail="Language not supported")
-    return i18n_service.translations.get(lang, {})
\ No newline at end of file
+    translations = await i18n_service.load_translations()
+    return translations.get(lang, {})
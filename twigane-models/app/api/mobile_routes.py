@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.services.mobile_service import MobileService
+from app.api.dependencies import get_mobile_service
 from app.middleware.auth import AuthMiddleware
 from typing import Dict
 
 mobile_router = APIRouter()
-mobile_service = MobileService()
 auth = AuthMiddleware()
 
 @mobile_router.get("/config")
-async def get_mobile_config():
+async def get_mobile_config(mobile_service: MobileService = Depends(get_mobile_service)):
     return mobile_service.config
 
 @mobile_router.post("/register")
 async def register_device(
     device_info: Dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    mobile_service: MobileService = Depends(get_mobile_service)
 ):
     return await mobile_service.register_device(current_user["sub"], device_info)
 
@@ -22,7 +23,8 @@ async def register_device(
 async def update_push_token(
     device_id: str,
     push_token: str,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    mobile_service: MobileService = Depends(get_mobile_service)
 ):
     return await mobile_service.update_push_token(device_id, push_token)
 
@@ -30,6 +32,7 @@ async def update_push_token(
 async def sync_data(
     device_id: str,
     offline_data: Dict,
-    current_user: dict = Depends(auth)
+    current_user: dict = Depends(auth),
+    mobile_service: MobileService = Depends(get_mobile_service)
 ):
-    return await mobile_service.sync_offline_data(device_id, offline_data)
\ No newline at end of file
+    return await mobile_service.sync_offline_data(device_id, offline_data)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from app.core.model_registry import model_registry
+from app.middleware.auth import AuthMiddleware
+
+model_router = APIRouter()
+auth = AuthMiddleware()
+
+@model_router.get("/status")
+async def get_models_status():
+    return model_registry.status()
+
+@model_router.get("/{model_name}/ready")
+async def get_model_readiness(model_name: str):
+    """Readiness probe: 200 once the model is loaded, 503 otherwise"""
+    status = model_registry.status(model_name)
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@model_router.post("/{model_name}/warmup")
+async def warmup_model(model_name: str, current_user: dict = Depends(auth)):
+    return await model_registry.warmup(model_name)
+
+@model_router.post("/{model_name}/unload")
+async def unload_model(model_name: str, current_user: dict = Depends(auth)):
+    return {"unloaded": model_registry.unload(model_name), **model_registry.status(model_name)}
@@ -5,6 +5,8 @@ from app.services.emotion_service import EmotionService
 from app.services.chatbot_service import ChatbotService
 from app.services.tts_service import TTSService
 from app.services.user_service import UserService
+from app.core.executor import inference_pool
+from app.api.dependencies import get_user_service
 from app.api.auth_routes import auth_router
 from app.api.content_routes import content_router
 from app.api.assessment_routes import assessment_router
@@ -12,8 +14,11 @@ from app.api.adaptive_routes import adaptive_router
 from app.api.analytics_routes import analytics_router
 from app.api.notification_routes import notification_router
 from app.api.i18n_routes import i18n_router
-from app.middleware.accessibility import AccessibilityMiddleware
 from app.api.mobile_routes import mobile_router
+from app.api.model_routes import model_router
+from app.api.translation_routes import translation_router
+from app.api.chat_routes import chat_router
+from app.api.system_routes import system_router
 
 # Create main router
 from app.api.tts_routes import tts_router
@@ -33,43 +38,48 @@ router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
 router.include_router(adaptive_router, prefix="/adaptive", tags=["adaptive"])
 router.include_router(assessment_router, prefix="/assessment", tags=["assessment"])
 router.include_router(content_router, prefix="/content", tags=["content"])
+router.include_router(model_router, prefix="/models", tags=["models"])
+router.include_router(translation_router, prefix="/translation", tags=["translation"])
+router.include_router(chat_router, prefix="/chat", tags=["chat"])
+router.include_router(system_router, prefix="/system", tags=["system"])
 router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 
-# Remove this line as middleware should be added in main.py
-# app.add_middleware(AccessibilityMiddleware)
-
 # Initialize services
 essay_service = EssayService()
 emotion_service = EmotionService()
 chatbot_service = ChatbotService()
-user_service = UserService()
 
 # Remove the standalone TTS route since it's now handled by tts_router
 @router.post("/user/progress")
-async def create_user_progress(user_id: str):
+async def create_user_progress(user_id: str, user_service: UserService = Depends(get_user_service)):
     return await user_service.create_user_progress(user_id)
 
 @router.get("/user/progress/{user_id}")
-async def get_user_progress(user_id: str):
+async def get_user_progress(user_id: str, user_service: UserService = Depends(get_user_service)):
     return await user_service.get_progress(user_id)
 
 @router.put("/user/progress/{user_id}")
-async def update_user_progress(user_id: str, update_data: dict):
+async def update_user_progress(
+    user_id: str,
+    update_data: dict,
+    user_service: UserService = Depends(get_user_service)
+):
     return await user_service.update_progress(user_id, update_data)
 
 @router.post("/user/session")
-async def create_user_session(user_id: str):
+async def create_user_session(user_id: str, user_service: UserService = Depends(get_user_service)):
     return await user_service.create_session(user_id)
 
 @router.get("/user/session/{user_id}")
-async def get_user_session(user_id: str):
+async def get_user_session(user_id: str, user_service: UserService = Depends(get_user_service)):
     return await user_service.get_session(user_id)
 
 @router.put("/user/session/{user_id}")
 async def update_user_session(
     user_id: str, 
     chat_history: list, 
-    emotion_context: dict
+    emotion_context: dict,
+    user_service: UserService = Depends(get_user_service)
 ):
     return await user_service.update_session(user_id, chat_history, emotion_context)
 
@@ -144,6 +154,8 @@ async def chat_message(
             "user_id": user_id,
             "status": "success"
         }
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(
             status_code=400, 
@@ -155,9 +167,26 @@ async def analyze_emotion(text: str):
     try:
         result = await emotion_service.analyze_emotion(text)
         return result
+    except HTTPException as he:
+        raise he
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/chat/memory/stats")
+async def chat_memory_stats():
+    """Conversations held in memory and the per-user token window"""
+    return chatbot_service.get_memory_stats()
+
+@router.get("/emotion/stats")
+async def emotion_batch_stats():
+    """Queue depth and batch-size statistics for the emotion batcher"""
+    return emotion_service.get_batch_stats()
+
+@router.get("/inference/stats")
+async def inference_stats():
+    """Per-model concurrency, queue and rejection counters"""
+    return inference_pool.stats()
+
 # Remove the duplicate chat_message route that was here
 @router.post("/tts/generate", operation_id="text_to_speech_generation")
 async def generate_speech(text: str):
@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from app.core.database import Database
+from app.core.cache import ReadThroughCache
+from app.core.executor import hashing_pool
+from app.middleware.auth import token_cache
+from app.services.notification_service import notification_connections
+from app.api.chat_routes import chat_connections
+
+system_router = APIRouter()
+
+@system_router.get("/db/pool")
+async def get_db_pool_stats():
+    """Connection pool sizing, open and checked-out connections and checkout wait times"""
+    return Database.get_pool_stats()
+
+@system_router.get("/websockets")
+async def get_websocket_stats():
+    return {
+        "notifications": notification_connections.stats(),
+        "chat": chat_connections.stats()
+    }
+
+@system_router.get("/cache")
+async def get_cache_stats():
+    """Entries, hits by tier, misses, coalesced loads and hit rate for each read-through cache"""
+    return ReadThroughCache.all_stats()
+
+@system_router.get("/hashing")
+async def get_hashing_stats():
+    """Password hashing threads: running, waiting, rejected and average bcrypt time"""
+    return hashing_pool.stats()
+
+@system_router.get("/auth/tokens")
+async def get_token_cache_stats():
+    """Verified-token cache size and how often a request skipped JWT verification"""
+    return token_cache.stats()
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.services.translation_service import TranslationService
+from app.middleware.auth import AuthMiddleware
+from app.models.api_models import BatchTranslationRequest, BatchTranslationResponse
+import json
+
+translation_router = APIRouter()
+translation_service = TranslationService()
+auth = AuthMiddleware()
+
+@translation_router.post("/batch")
+async def translate_batch(request: BatchTranslationRequest, current_user: dict = Depends(auth)):
+    """Translate a list of texts; with ``stream`` set, results arrive as NDJSON
+    lines ``{"index": i, "translation": ...}`` in completion order."""
+    if request.stream:
+        # Once the stream starts the status is sent, so bad input is refused first
+        translation_service.check_languages(request.source_lang, request.target_lang)
+
+        async def ndjson():
+            async for index, translation in translation_service.translate_batch_stream(
+                request.texts, request.source_lang, request.target_lang
+            ):
+                yield json.dumps({"index": index, "translation": translation}, ensure_ascii=False) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    translations = await translation_service.translate_batch(
+        request.texts, request.source_lang, request.target_lang
+    )
+    return BatchTranslationResponse(translations=translations)
+
+@translation_router.get("/cache/stats")
+async def get_translation_cache_stats(current_user: dict = Depends(auth)):
+    return translation_service.get_cache_stats()
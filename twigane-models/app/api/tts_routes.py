@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from app.services.tts_service import TTSService
 from typing import Optional
 
@@ -12,25 +13,59 @@ SUPPORTED_LANGUAGES = {
     'rw': 'Kinyarwanda'  # We'll map this to another supported language
 }
 
+def _resolve_language(language: str) -> str:
+    # Map 'rw' to a supported language (e.g., English)
+    if language == 'rw':
+        language = 'en'
+        
+    # Validate language
+    if language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Language '{language}' not supported. Supported languages: {list(SUPPORTED_LANGUAGES.keys())}"
+        )
+    return language
+
 @tts_router.post("/generate")
 async def generate_speech(
     text: str = Query(..., description="Text to convert to speech"),
     language: Optional[str] = Query('en', description="Language code (en, fr, sw)")
 ):
     try:
-        # Map 'rw' to a supported language (e.g., English)
-        if language == 'rw':
-            language = 'en'
-            
-        # Validate language
-        if language not in SUPPORTED_LANGUAGES:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Language '{language}' not supported. Supported languages: {list(SUPPORTED_LANGUAGES.keys())}"
-            )
-            
+        language = _resolve_language(language)
         audio_data = await tts_service.generate_speech(text, language)
         return {"audio_url": audio_data}
         
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@tts_router.api_route("/stream", methods=["GET", "POST"])
+async def stream_speech(
+    text: str = Query(..., description="Text to convert to speech"),
+    language: Optional[str] = Query('en', description="Language code (en, fr, sw)")
+):
+    """Stream a WAV file sentence by sentence as each one is synthesized"""
+    try:
+        language = _resolve_language(language)
+        chunks = tts_service.stream_speech(text, language)
+        # Synthesize the first sentence before answering so errors still get a status code
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=400, detail="No text to synthesize")
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def body():
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(body(), media_type="audio/wav")
+
+@tts_router.get("/cache/stats")
+async def get_tts_cache_stats():
+    return tts_service.get_cache_stats()
@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_CACHE_FILE = re.compile(r"^[0-9a-f]{64}\.wav$")
+_TMP_FILE = re.compile(r"^[0-9a-f]{64}\.[0-9a-f]{32}\.tmp\.wav$")
+
+
+class AudioCache:
+    """Content-addressed store for synthesized audio.
+
+    Files are named by a hash of (model, language, text) so a URL always
+    refers to the same audio and can be served as an immutable static file.
+    Each file is written to a unique temporary name and atomically renamed,
+    and concurrent requests for the same key share one synthesis. When the
+    directory exceeds ``max_bytes`` the least recently used files are deleted.
+    Scanning, sweeping and evicting walk the whole directory, so they run on
+    a single background thread rather than the event loop.
+    """
+
+    # Temporary files older than this were left by a crashed worker process
+    STALE_TMP_SECONDS = 3600
+
+    def __init__(self, directory: str, url_prefix: str, max_bytes: int):
+        self.directory = directory
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes
+        self._creating: Dict[str, asyncio.Task] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Only read and written on the executor thread (None until first scanned)
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(model: str, language: str, text: str) -> str:
+        return hashlib.sha256("\x1f".join([model, language, text]).encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def url_for(self, key: str) -> str:
+        return f"{self.url_prefix}/{key}.wav"
+
+    def _touch(self, path: str) -> bool:
+        """Mark a cached file as recently used; False if it does not exist"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-cache")
+        return self._executor
+
+    async def _in_background(self, fn: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._sweep_tmp()
+            self._size = sum(
+                entry.stat().st_size for entry in os.scandir(self.directory)
+                if _CACHE_FILE.match(entry.name)
+            )
+        return self._size
+
+    async def get_or_create(self, key: str, synthesize: Callable[[str], Awaitable[None]]) -> str:
+        """Return the cached file for ``key``, calling ``synthesize(tmp_path)`` on a miss"""
+        path = self.path_for(key)
+        if self._touch(path):
+            self.hits += 1
+            return path
+
+        # Synthesis runs as its own task: a cancelled request (e.g. a dropped
+        # stream's prefetch) must not remove the temporary file while the
+        # model thread is still writing it, and the result is still cached
+        task = self._creating.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._create(key, synthesize))
+            self._creating[key] = task
+            task.add_done_callback(lambda done: self._finish_create(key, done))
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    def _finish_create(self, key: str, task: asyncio.Task):
+        if self._creating.get(key) is task:
+            del self._creating[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Speech synthesis for {key} failed: {task.exception()}")
+
+    async def _create(self, key: str, synthesize: Callable[[str], Awaitable[None]]) -> str:
+        path = self.path_for(key)
+        await self._in_background(self._current_size)
+        tmp_path = os.path.join(self.directory, f"{key}.{uuid.uuid4().hex}.tmp.wav")
+        try:
+            await synthesize(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        await self._in_background(self._added, path)
+        return path
+
+    def _added(self, path: str):
+        self._size = self._current_size() + os.path.getsize(path)
+        if self._size > self.max_bytes:
+            self._evict(keep=path)
+
+    def _sweep_tmp(self):
+        """Delete temporary files no synthesis in any worker is still writing"""
+        cutoff = time.time() - self.STALE_TMP_SECONDS
+        for entry in os.scandir(self.directory):
+            if not _TMP_FILE.match(entry.name):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+
+    def _evict(self, keep: str):
+        self._sweep_tmp()
+        # Trim to 90% of the budget so we don't evict on every write
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if _CACHE_FILE.match(e.name) and e.path != keep),
+            key=lambda e: e.stat().st_mtime
+        )
+        for entry in entries:
+            if self._size <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+            self.evictions += 1
+        logger.info(f"Audio cache trimmed to {self._size / (1024 * 1024):.1f} MB")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            # Not known until the first synthesis has scanned the directory
+            "size_mb": round(self._size / (1024 * 1024), 1) if self._size is not None else None,
+            "max_mb": round(self.max_bytes / (1024 * 1024), 1),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "in_flight": len(self._creating)
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+audio_cache = AudioCache(
+    directory=settings.TTS_AUDIO_DIR,
+    url_prefix=settings.TTS_AUDIO_URL_PREFIX,
+    max_bytes=settings.TTS_AUDIO_CACHE_MAX_MB * 1024 * 1024
+)
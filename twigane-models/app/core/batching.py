@@ -0,0 +1,144 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Tuple
+from app.core.executor import ModelBusyError
+from app.core.timing import timed
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collects concurrent single-item requests into batches.
+
+    Callers ``await submit(item)``; a background worker gathers queued items
+    until either ``max_batch_size`` items are waiting or ``max_wait_ms`` has
+    passed since the first one arrived, runs ``batch_fn`` once on the whole
+    list and resolves each caller's future with its own result.
+
+    The worker runs in an empty context, so the batch is not charged to the
+    request that happened to start it; each caller's wait for its result is
+    recorded as its own ``model`` stage instead.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        name: str = "batcher",
+        max_queue_size: Optional[int] = None,
+        retry_after: int = 5,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.retry_after = retry_after
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Stats
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._rejected = 0
+        self._max_observed = 0
+        self._recent_sizes: Deque[int] = deque(maxlen=100)
+        self._recent_waits: Deque[float] = deque(maxlen=100)
+
+    async def submit(self, item: Any) -> Any:
+        """Queue a single item and wait for its result."""
+        self._ensure_worker()
+        if self.max_queue_size is not None and self._queue.qsize() >= self.max_queue_size:
+            self._rejected += 1
+            raise ModelBusyError(self.name, self.retry_after)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        with timed("model"):
+            return await future
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        # The queue is bound to the loop it was created on, so rebuild both
+        # if we are running under a new loop (e.g. between test cases).
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+
+    async def close(self):
+        """Stop the background worker; pending callers are cancelled."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _, _ in batch]
+            started = time.perf_counter()
+
+            self._batches += 1
+            self._items += len(batch)
+            self._max_observed = max(self._max_observed, len(batch))
+            self._recent_sizes.append(len(batch))
+            self._recent_waits.extend(started - queued_at for _, _, queued_at in batch)
+
+            try:
+                results = await self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name}: batch function returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"{self.name}: batch of {len(items)} failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                # The caller may have been cancelled while we were working
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        recent = list(self._recent_sizes)
+        waits = list(self._recent_waits)
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._batches,
+            "items": self._items,
+            "errors": self._errors,
+            "rejected": self._rejected,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "recent_avg_batch_size": sum(recent) / len(recent) if recent else 0.0,
+            "max_batch_size_observed": self._max_observed,
+            "recent_avg_wait_ms": sum(waits) / len(waits) * 1000 if waits else 0.0,
+        }
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis = None
+
+def get_redis():
+    """Shared redis.asyncio client, or None when CACHE_REDIS_URL is not set"""
+    global _redis
+    if _redis is None and settings.CACHE_REDIS_URL:
+        import redis.asyncio as redis
+        _redis = redis.from_url(settings.CACHE_REDIS_URL, socket_timeout=0.5)
+    return _redis
+
+async def close_redis():
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
+
+
+class ReadThroughCache:
+    """Read-through cache for single-document lookups.
+
+    ``get_or_load`` serves a value from process memory (LRU with a TTL), then
+    from Redis when ``CACHE_REDIS_URL`` is set, and only then calls the
+    loader; concurrent misses for the same key share one load. Values must be
+    JSON-serialisable and ``None`` results are not cached.
+
+    Writes call ``invalidate``. Memory tiers in other worker processes are not
+    notified, so ``ttl`` bounds how long they can serve a stale value.
+
+    With Redis, access counts are kept in a sorted set so a restarted process
+    can warm up the most-read keys.
+    """
+
+    registry: Dict[str, "ReadThroughCache"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float = settings.CACHE_TTL_SECONDS,
+        max_entries: int = settings.CACHE_MAX_ENTRIES,
+        flush_every: int = 100
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._accesses: Counter = Counter()
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+        ReadThroughCache.registry[name] = self
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    @property
+    def _popular_key(self) -> str:
+        return f"cache:{self.name}:popular"
+
+    def _remember(self, key: str, value: Any):
+        self._memory[key] = (time.monotonic() + self.ttl, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _from_memory(self, key: str) -> Optional[Any]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        await self._record_access(key)
+
+        value = self._from_memory(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        # The load runs as its own task so a cancelled request doesn't fail the others waiting on it
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, load))
+            self._loading[key] = task
+            task.add_done_callback(lambda done: self._finish_load(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish_load(self, key: str, task: asyncio.Task):
+        if self._loading.get(key) is task:
+            del self._loading[key]
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(self._redis_key(key))
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Redis read for {self.name} cache failed: {e}")
+                raw = None
+            if raw is not None:
+                self.redis_hits += 1
+                value = json.loads(raw)
+                self._remember(key, value)
+                return value
+
+        self.misses += 1
+        value = await load()
+        # Skip caching a value read before an invalidate that arrived mid-load
+        if value is not None and self._loading.get(key) is asyncio.current_task():
+            await self.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any):
+        self._remember(key, value)
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.set(self._redis_key(key), json.dumps(value), ex=int(self.ttl))
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Redis write for {self.name} cache failed: {e}")
+
+    async def invalidate(self, key: str):
+        self.invalidations += 1
+        self._memory.pop(key, None)
+        self._loading.pop(key, None)
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.delete(self._redis_key(key))
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Redis delete for {self.name} cache failed: {e}")
+
+    async def _record_access(self, key: str):
+        if get_redis() is None:
+            return
+        self._accesses[key] += 1
+        if sum(self._accesses.values()) >= self.flush_every:
+            await self._flush_accesses()
+
+    async def _flush_accesses(self):
+        accesses, self._accesses = self._accesses, Counter()
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for key, count in accesses.items():
+                pipe.zincrby(self._popular_key, count, key)
+            # Keep only the keys that could still be warmed up
+            pipe.zremrangebyrank(self._popular_key, 0, -(settings.CACHE_POPULAR_KEYS + 1))
+            await pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Redis access count flush for {self.name} cache failed: {e}")
+
+    async def popular_keys(self, limit: int) -> List[str]:
+        """Most-read keys recorded in Redis, most popular first"""
+        client = get_redis()
+        if client is None or limit <= 0:
+            return []
+        try:
+            keys = await client.zrevrange(self._popular_key, 0, limit - 1)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Redis popular keys for {self.name} cache failed: {e}")
+            return []
+        return [k.decode() if isinstance(k, bytes) else k for k in keys]
+
+    def clear(self):
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.redis_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._memory),
+            "capacity": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors,
+            "hit_rate": (self.memory_hits + self.redis_hits + self.coalesced) / lookups if lookups else 0.0
+        }
+
+    @classmethod
+    def all_stats(cls) -> dict:
+        return {
+            "redis": settings.CACHE_REDIS_URL is not None,
+            "caches": {name: cache.stats() for name, cache in cls.registry.items()}
+        }
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Dict, Optional
 from dotenv import load_dotenv
 import os
 
@@ -13,10 +13,114 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "twigane_db"
+    # Create the indexes in app/core/indexes.py at startup
+    MONGO_ENSURE_INDEXES: bool = True
+
+    # Motor connection pool (per worker process) and wire compression
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 5
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    MONGO_MAX_CONNECTING: int = 2
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    # Comma-separated, in order of preference; zstd/snappy need extra packages
+    MONGO_COMPRESSORS: str = "zlib"
     
     # Model configurations
     TRANSLATION_MODEL: str = "mbazaNLP/Nllb_finetuned_education_en_kin"
     EMOTION_MODEL: str = "joeddav/distilbert-base-uncased-go-emotions"
+
+    # Emotion micro-batching
+    EMOTION_BATCH_SIZE: int = 32
+    EMOTION_BATCH_WAIT_MS: float = 10.0
+    EMOTION_MAX_QUEUE: int = 256
+
+    # Inference worker pool: per-model concurrency and bounded queues
+    INFERENCE_MAX_WORKERS: int = 4
+    INFERENCE_CONCURRENCY: Dict[str, int] = {
+        "translation": 1,
+        "emotion": 1,
+        "essay": 1,
+        "tts": 1,
+        "chatbot": 1
+    }
+    INFERENCE_DEFAULT_CONCURRENCY: int = 1
+    INFERENCE_QUEUE_SIZE: int = 16
+    INFERENCE_RETRY_AFTER_SECONDS: int = 5
+
+    # Server-Timing stage header and the slow-request log threshold
+    SERVER_TIMING_HEADER: bool = True
+    SLOW_REQUEST_THRESHOLD_MS: int = 1000
+
+    # Accessibility preferences cached per worker for the response transform
+    ACCESSIBILITY_PREFS_TTL_SECONDS: int = 60
+
+    # Verified JWT payloads kept per worker; entries never outlive the token's exp
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Password hashing (bcrypt) threads; bcrypt releases the GIL, so each thread uses one core
+    HASHING_MAX_WORKERS: int = 2
+    HASHING_QUEUE_SIZE: int = 64
+
+    # Model registry: lazy loading, startup warmup and idle eviction
+    MODEL_WARMUP: List[str] = []
+    MODEL_MEMORY_BUDGET_MB: int = 4096
+    MODEL_IDLE_SECONDS: int = 300
+    MODEL_EVICTION_INTERVAL_SECONDS: int = 60
+
+    # Optional CPU inference optimization per model: "fp32", "int8" or "onnx"
+    # e.g. {"translation": "int8", "emotion": "onnx", "essay": "int8"}
+    INFERENCE_OPTIMIZATION: Dict[str, str] = {}
+    ONNX_EXPORT_DIR: str = "cache/onnx"
+
+    # Synthesized speech cache, served as immutable files under /audio
+    STATIC_DIR: str = "static"
+    TTS_AUDIO_DIR: str = "static/audio"
+    TTS_AUDIO_URL_PREFIX: str = "/audio"
+    TTS_AUDIO_CACHE_MAX_MB: int = 1024
+
+    # Translation cache: in-process LRU backed by a local SQLite file
+    TRANSLATION_CACHE_ENABLED: bool = True
+    TRANSLATION_CACHE_PATH: str = "cache/translations.sqlite3"
+    TRANSLATION_CACHE_MEMORY_ENTRIES: int = 10000
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 500000
+
+    # Batch translation: sentences per generate call and padded size budget
+    TRANSLATION_BATCH_SIZE: int = 16
+    TRANSLATION_BATCH_MAX_CHARS: int = 4000
+    TRANSLATION_BATCH_MAX_TEXTS: int = 256
+    TRANSLATION_MAX_INPUT_TOKENS: int = 256
+
+    # Handwritten essays: line segmentation and batched recognition
+    ESSAY_MAX_BATCH_LINES: int = 16
+    ESSAY_MIN_LINE_HEIGHT: int = 12
+    ESSAY_LINE_INK_RATIO: float = 0.01
+
+    # Content listing: keyset page sizes and NDJSON cursor batch size
+    CONTENT_PAGE_SIZE: int = 20
+    CONTENT_PAGE_MAX_SIZE: int = 100
+    CONTENT_STREAM_BATCH_SIZE: int = 200
+    # NDJSON import: records validated and inserted per chunk, row errors reported
+    CONTENT_IMPORT_CHUNK_SIZE: int = 1000
+    CONTENT_IMPORT_MAX_ERRORS: int = 1000
+
+    # Events per document in bucketed history collections
+    HISTORY_BUCKET_SIZE: int = 200
+
+    # Content metrics recompute: interactions loaded per pandas chunk
+    CONTENT_METRICS_CHUNK_SIZE: int = 50000
+
+    # Read-through caches for content, assessments and profiles; Redis tier is optional
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_MAX_ENTRIES: int = 2000
+    CACHE_POPULAR_KEYS: int = 1000
+    CACHE_WARMUP_ITEMS: int = 50
+
+    # Chatbot memory: users kept in memory and per-user token window
+    CHAT_MAX_CONVERSATIONS: int = 1000
+    CHAT_MAX_CONTEXT_TOKENS: int = 512
+    CHAT_MAX_NEW_TOKENS: int = 128
     
     class Config:
         case_sensitive = True
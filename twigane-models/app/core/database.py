@@ -1,27 +1,153 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from fastapi import HTTPException
 from app.core.config import settings
+from app.core.timing import command_timer
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Per-server connection pool counters fed by pymongo's pool events.
+
+    Motor runs each operation on a worker thread, and a checkout starts and
+    finishes on the same thread, so the start time is kept thread-local to
+    measure how long operations wait for a connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._servers: Dict[str, dict] = {}
+
+    def _server(self, address) -> dict:
+        key = "%s:%s" % address
+        server = self._servers.get(key)
+        if server is None:
+            server = self._servers.setdefault(key, {
+                "max_pool_size": None,
+                "open": 0,
+                "checked_out": 0,
+                "max_checked_out": 0,
+                "created": 0,
+                "closed": 0,
+                "cleared": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "wait_queue_timeouts": 0,
+                "wait_total_ms": 0.0,
+                "wait_max_ms": 0.0
+            })
+        return server
+
+    def _record_wait(self, server: dict):
+        started = getattr(self._local, "started", None)
+        if started is None:
+            return
+        self._local.started = None
+        wait_ms = (time.perf_counter() - started) * 1000
+        server["wait_total_ms"] += wait_ms
+        server["wait_max_ms"] = max(server["wait_max_ms"], wait_ms)
+
+    def pool_created(self, event):
+        with self._lock:
+            self._server(event.address)["max_pool_size"] = event.options.get("maxPoolSize")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._server(event.address)["cleared"] += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            server["created"] += 1
+            server["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            server["closed"] += 1
+            server["open"] -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            self._record_wait(server)
+            server["checkout_failures"] += 1
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                server["wait_queue_timeouts"] += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            server = self._server(event.address)
+            self._record_wait(server)
+            server["checkouts"] += 1
+            server["checked_out"] += 1
+            server["max_checked_out"] = max(server["max_checked_out"], server["checked_out"])
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._server(event.address)["checked_out"] -= 1
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            servers = {}
+            for address, server in self._servers.items():
+                stats = dict(server)
+                attempts = server["checkouts"] + server["checkout_failures"]
+                stats["wait_avg_ms"] = round(server["wait_total_ms"] / attempts, 3) if attempts else 0.0
+                stats["wait_total_ms"] = round(server["wait_total_ms"], 3)
+                stats["wait_max_ms"] = round(server["wait_max_ms"], 3)
+                servers[address] = stats
+            return servers
+
 class Database:
     client = None
     db = None
+    pool_stats = PoolStats()
 
     @classmethod
     async def connect_db(cls):
         try:
             if not settings.MONGODB_URL:
                 raise ValueError("MongoDB connection URL not found in environment variables")
-                
-            cls.client = AsyncIOMotorClient(
-                settings.MONGODB_URL,
-                serverSelectionTimeoutMS=5000
+
+            options = dict(
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                maxConnecting=settings.MONGO_MAX_CONNECTING,
+                waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                serverSelectionTimeoutMS=5000,
+                event_listeners=[cls.pool_stats, command_timer]
             )
+            if settings.MONGO_COMPRESSORS:
+                options["compressors"] = settings.MONGO_COMPRESSORS
+            cls.client = AsyncIOMotorClient(settings.MONGODB_URL, **options)
             cls.db = cls.client[settings.DATABASE_NAME]
             # Test connection
             await cls.client.admin.command('ping')
-            logger.info("Successfully connected to MongoDB Atlas")
+            logger.info(
+                f"Successfully connected to MongoDB Atlas "
+                f"(pool {settings.MONGO_MIN_POOL_SIZE}-{settings.MONGO_MAX_POOL_SIZE}, "
+                f"compressors: {settings.MONGO_COMPRESSORS or 'none'})"
+            )
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
@@ -37,4 +163,45 @@ class Database:
         if cls.client is not None:
             cls.client.close()
             cls.client = None
-            cls.db = None
\ No newline at end of file
+            cls.db = None
+
+    @classmethod
+    def get_pool_stats(cls) -> dict:
+        return {
+            "connected": cls.client is not None,
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+            "wait_queue_timeout_ms": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "compressors": settings.MONGO_COMPRESSORS,
+            "servers": cls.pool_stats.stats()
+        }
+
+async def get_database() -> AsyncIOMotorDatabase:
+    """FastAPI dependency for the connected database"""
+    try:
+        return await Database.get_db()
+    except Exception:
+        raise HTTPException(status_code=503, detail="Database connection failed")
+
+_transactions_supported: Dict[int, bool] = {}
+
+@asynccontextmanager
+async def transaction(db) -> AsyncIterator[Optional[object]]:
+    """Run the enclosed writes as one transaction.
+
+    Yields the session to pass as ``session=`` to each operation. Standalone
+    servers (such as a local development mongod) have no transactions; there
+    the session is None and the writes run one by one as before.
+    """
+    client = db.client
+    supported = _transactions_supported.get(id(client))
+    if supported is None:
+        hello = await client.admin.command("hello")
+        supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+        _transactions_supported[id(client)] = supported
+    if not supported:
+        yield None
+        return
+    async with await client.start_session() as session:
+        async with session.start_transaction():
+            yield session
@@ -0,0 +1,181 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.timing import timed
+
+logger = logging.getLogger(__name__)
+
+
+class ModelBusyError(HTTPException):
+    """Raised when a model's queue is full; surfaces as 503 + Retry-After."""
+
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=f"'{lane}' is busy, please retry shortly",
+            headers={"Retry-After": str(retry_after)}
+        )
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class _Lane:
+    def __init__(self, name: str, concurrency: int, queue_size: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_run_ms": self.busy_seconds / self.completed * 1000 if self.completed else 0.0,
+        }
+
+
+class WorkerPool:
+    """Shared thread pool that runs blocking work off the event loop.
+
+    Work is submitted to a named lane. Each lane has its own concurrency
+    limit and a bounded number of waiters; once that is exhausted further
+    submissions fail fast with ``ModelBusyError`` instead of piling up.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 1,
+        queue_size: int = 32,
+        retry_after: int = 5,
+        name: str = "worker",
+        timing_stage: str = "model"
+    ):
+        self.max_workers = max_workers
+        self.concurrency = concurrency or {}
+        self.default_concurrency = default_concurrency
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.name = name
+        # Server-Timing stage that the queue wait and run time count towards
+        self.timing_stage = timing_stage
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lanes: Dict[str, _Lane] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name
+            )
+        return self._executor
+
+    def lane(self, name: str) -> _Lane:
+        if name not in self._lanes:
+            self._lanes[name] = _Lane(
+                name,
+                self.concurrency.get(name, self.default_concurrency),
+                self.queue_size
+            )
+        return self._lanes[name]
+
+    async def run(self, lane_name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool under ``lane_name``'s limits."""
+        with timed(self.timing_stage):
+            return await self._run(lane_name, fn, *args, **kwargs)
+
+    async def _run(self, lane_name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        lane = self.lane(lane_name)
+        if lane.semaphore.locked() and lane.waiting >= lane.queue_size:
+            lane.rejected += 1
+            raise ModelBusyError(lane_name, self.retry_after)
+
+        lane.waiting += 1
+        try:
+            await lane.semaphore.acquire()
+        finally:
+            lane.waiting -= 1
+
+        lane.running += 1
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._finished(lane, started, None)
+            raise
+        # The lane slot is released when the thread is done, not when the
+        # caller stops waiting; a cancelled caller can't stop a running call
+        future.add_done_callback(
+            lambda done: self._call_soon(loop, self._finished, lane, started, done)
+        )
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop has already been closed at shutdown
+            pass
+
+    @staticmethod
+    def _finished(lane: _Lane, started: float, future: Optional[Future]):
+        lane.running -= 1
+        if future is None or future.cancelled() or future.exception() is not None:
+            lane.failed += 1
+        else:
+            lane.completed += 1
+            lane.busy_seconds += time.perf_counter() - started
+        lane.semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "lanes": {name: lane.stats() for name, lane in self._lanes.items()}
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+inference_pool = WorkerPool(
+    max_workers=settings.INFERENCE_MAX_WORKERS,
+    concurrency=settings.INFERENCE_CONCURRENCY,
+    default_concurrency=settings.INFERENCE_DEFAULT_CONCURRENCY,
+    queue_size=settings.INFERENCE_QUEUE_SIZE,
+    retry_after=settings.INFERENCE_RETRY_AFTER_SECONDS,
+    name="inference"
+)
+
+# bcrypt hashing and verification for register/login, kept apart from the
+# inference threads so a login rush neither blocks the event loop nor waits
+# behind model calls
+hashing_pool = WorkerPool(
+    max_workers=settings.HASHING_MAX_WORKERS,
+    default_concurrency=settings.HASHING_MAX_WORKERS,
+    queue_size=settings.HASHING_QUEUE_SIZE,
+    retry_after=1,
+    name="hashing",
+    timing_stage="hash"
+)
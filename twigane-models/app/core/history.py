@@ -0,0 +1,97 @@
+from app.core.config import settings
+from datetime import datetime
+from pymongo import UpdateOne
+from typing import Dict, List, Optional
+
+class HistoryBuckets:
+    """Append-only per-user history stored as fixed-size bucket documents.
+
+    Each bucket holds up to ``bucket_size`` events for one user together with
+    the time range they cover, so no document grows without bound and a
+    history query only touches the buckets overlapping the requested range:
+
+        {user_id, count, start, end, events: [{..., <time_field>: ...}]}
+    """
+
+    def __init__(self, collection: str, time_field: str, bucket_size: int = settings.HISTORY_BUCKET_SIZE):
+        self.collection = collection
+        self.time_field = time_field
+        self.bucket_size = bucket_size
+
+    def _append_update(self, user_id: str, events: List[dict]) -> dict:
+        times = [event[self.time_field] for event in events]
+        return {
+            "$push": {"events": {"$each": events}},
+            "$inc": {"count": len(events)},
+            "$min": {"start": min(times)},
+            "$max": {"end": max(times)},
+            "$setOnInsert": {"user_id": user_id}
+        }
+
+    def _open_bucket(self, user_id: str, events: int) -> dict:
+        # Only a bucket with room for all the events matches, so none exceeds bucket_size
+        return {"user_id": user_id, "count": {"$lt": self.bucket_size - events + 1}}
+
+    async def append(self, db, user_id: str, event: dict, session=None):
+        """Add one event to the user's open bucket, starting a new one when it is full"""
+        await db[self.collection].update_one(
+            self._open_bucket(user_id, 1),
+            self._append_update(user_id, [event]),
+            upsert=True,
+            session=session
+        )
+
+    async def append_grouped(self, db, events_by_user: Dict[str, List[dict]], session=None):
+        """Append events for many users with a single bulk_write"""
+        requests = []
+        for user_id, events in events_by_user.items():
+            for i in range(0, len(events), self.bucket_size):
+                chunk = events[i:i + self.bucket_size]
+                requests.append(UpdateOne(
+                    self._open_bucket(user_id, len(chunk)),
+                    self._append_update(user_id, chunk),
+                    upsert=True
+                ))
+        if requests:
+            await db[self.collection].bulk_write(requests, ordered=True, session=session)
+
+    async def append_many(self, db, user_id: str, events: List[dict]):
+        """Write events in full buckets; used when importing existing history"""
+        for i in range(0, len(events), self.bucket_size):
+            chunk = events[i:i + self.bucket_size]
+            await db[self.collection].insert_one({
+                "user_id": user_id,
+                "count": len(chunk),
+                "start": min(e[self.time_field] for e in chunk),
+                "end": max(e[self.time_field] for e in chunk),
+                "events": chunk
+            })
+
+    async def find(
+        self,
+        db,
+        user_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[dict]:
+        """Events in ``[start, end]``, newest first"""
+        bucket_match = {"user_id": user_id}
+        event_match = {}
+        if start is not None:
+            bucket_match["end"] = {"$gte": start}
+            event_match["$gte"] = start
+        if end is not None:
+            bucket_match["start"] = {"$lte": end}
+            event_match["$lte"] = end
+
+        pipeline = [
+            {"$match": bucket_match},
+            {"$sort": {"start": -1}},
+            {"$unwind": "$events"},
+            {"$replaceRoot": {"newRoot": "$events"}},
+        ]
+        if event_match:
+            pipeline.append({"$match": {self.time_field: event_match}})
+        pipeline += [{"$sort": {self.time_field: -1}}, {"$limit": limit}]
+        return await db[self.collection].aggregate(pipeline).to_list(length=limit)
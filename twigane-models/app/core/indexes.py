@@ -0,0 +1,144 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+from typing import Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Every query the services run should be served by one of these indexes;
+# scripts/audit_queries.py checks that with explain against a local mongod.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+    ],
+    "notifications": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_recent"),
+        IndexModel([("user_id", ASCENDING), ("read", ASCENDING), ("created_at", DESCENDING)], name="user_unread_recent"),
+        # MongoDB deletes each notification once its expires_at has passed
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "mobile_sessions": [
+        IndexModel([("device_id", ASCENDING)], name="device_id"),
+    ],
+    "exercises": [
+        IndexModel([("content_id", ASCENDING)], name="content_id"),
+    ],
+    "user_sessions": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_recent"),
+    ],
+    "user_progress": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "progress": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "assessment_results": [
+        IndexModel([("user_id", ASCENDING), ("completed_at", DESCENDING)], name="user_recent"),
+    ],
+    "emotion_analyses": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_recent"),
+    ],
+    "user_analytics": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "content_metrics": [
+        IndexModel([("content_id", ASCENDING)], name="content_id"),
+        # Cache warm-up loads the most viewed content
+        IndexModel([("total_views", DESCENDING)], name="total_views"),
+    ],
+    "content_interactions": [
+        IndexModel([("content_id", ASCENDING)], name="content_id"),
+        # Study time per user, optionally since a date
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_recent"),
+    ],
+    "accessibility_preferences": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "profiles": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "translations": [
+        IndexModel([("language", ASCENDING)], name="language"),
+    ],
+    # list_content filters on any combination of subject, grade and difficulty
+    # and pages in _id order. Each combination has an index whose equality
+    # fields are followed by _id, so the keyset range and the sort both come
+    # from the index; the unfiltered listing uses _id_. Content is written
+    # rarely (authoring and imports), so the extra indexes are cheap.
+    "learning_content": [
+        IndexModel(
+            [("subject", ASCENDING), ("grade_level", ASCENDING), ("difficulty_level", ASCENDING), ("_id", ASCENDING)],
+            name="subject_grade_difficulty_id"
+        ),
+        IndexModel([("subject", ASCENDING), ("grade_level", ASCENDING), ("_id", ASCENDING)], name="subject_grade_id"),
+        IndexModel(
+            [("subject", ASCENDING), ("difficulty_level", ASCENDING), ("_id", ASCENDING)],
+            name="subject_difficulty_id"
+        ),
+        IndexModel([("subject", ASCENDING), ("_id", ASCENDING)], name="subject_id"),
+        IndexModel(
+            [("grade_level", ASCENDING), ("difficulty_level", ASCENDING), ("_id", ASCENDING)],
+            name="grade_difficulty_id"
+        ),
+        IndexModel([("grade_level", ASCENDING), ("_id", ASCENDING)], name="grade_id"),
+        IndexModel([("difficulty_level", ASCENDING), ("_id", ASCENDING)], name="difficulty_id"),
+    ],
+    # One precomputed path per user, also the $merge key in AdaptiveService
+    "learning_paths": [
+        IndexModel([("user_id", ASCENDING)], unique=True, name="user_id_unique"),
+    ],
+    # Bucketed histories: the open bucket is found by (user_id, count) and
+    # range queries walk buckets by start time
+    "lesson_history": [
+        IndexModel([("user_id", ASCENDING), ("count", ASCENDING)], name="user_open_bucket"),
+        IndexModel([("user_id", ASCENDING), ("start", DESCENDING)], name="user_start"),
+    ],
+    "assessment_history": [
+        IndexModel([("user_id", ASCENDING), ("count", ASCENDING)], name="user_open_bucket"),
+        IndexModel([("user_id", ASCENDING), ("start", DESCENDING)], name="user_start"),
+    ],
+    "topics": [
+        IndexModel([("level", ASCENDING)], name="level"),
+    ],
+    "lessons": [
+        IndexModel([("level", ASCENDING), ("sequence", ASCENDING)], name="level_sequence"),
+    ],
+}
+
+# Indexes that an index in ``INDEXES`` has replaced, dropped by
+# ``ensure_indexes`` if a deployment still has them. Only these names are
+# ever dropped; indexes added by hand are left alone.
+REPLACED_INDEXES: Dict[str, List[str]] = {
+    # Superseded by the *_id indexes used for keyset pagination
+    "learning_content": ["subject_grade_difficulty", "grade_difficulty", "difficulty"],
+}
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Create any missing indexes and drop the ones listed in ``REPLACED_INDEXES``.
+
+    Only collections listed in ``INDEXES`` are touched. A collection whose
+    indexes cannot be built (for example duplicate values under a unique
+    index) is logged and skipped so the API still starts.
+    """
+    created = {}
+    for collection, models in INDEXES.items():
+        try:
+            created[collection] = await db[collection].create_indexes(models)
+            await drop_replaced_indexes(db, collection)
+        except PyMongoError as e:
+            logger.error(f"Failed to create indexes on {collection}: {e}")
+    logger.info(f"Ensured indexes on {len(created)} of {len(INDEXES)} collections")
+    return created
+
+async def drop_replaced_indexes(db, collection: str) -> List[str]:
+    """Drop the indexes on ``collection`` that a declared index has replaced"""
+    replaced = REPLACED_INDEXES.get(collection)
+    if not replaced:
+        return []
+    existing = await db[collection].index_information()
+    stale = [name for name in replaced if name in existing]
+    for name in stale:
+        await db[collection].drop_index(name)
+        logger.info(f"Dropped replaced index {collection}.{name}")
+    return stale
@@ -0,0 +1,225 @@
+import asyncio
+import gc
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.executor import inference_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _measure_mb(obj: Any) -> float:
+    """Best-effort size of the torch parameters reachable from a loaded model."""
+    if isinstance(obj, (tuple, list)):
+        return sum(_measure_mb(o) for o in obj)
+    if isinstance(obj, dict):
+        return sum(_measure_mb(o) for o in obj.values())
+    for candidate in (obj, getattr(obj, "model", None)):
+        parameters = getattr(candidate, "parameters", None)
+        if callable(parameters):
+            try:
+                return sum(p.numel() * p.element_size() for p in parameters()) / (1024 * 1024)
+            except Exception:
+                return 0.0
+    # TTS wraps its torch model inside a synthesizer
+    synthesizer = getattr(obj, "synthesizer", None)
+    if synthesizer is not None:
+        return _measure_mb(getattr(synthesizer, "tts_model", None)) + \
+            _measure_mb(getattr(synthesizer, "vocoder_model", None))
+    return 0.0
+
+
+class _Entry:
+    def __init__(self, name: str, loader: Callable[[], Any],
+                 warmup: Optional[Callable[[Any], Any]], memory_mb: float):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.estimated_mb = memory_mb
+        self.model = None
+        self.state = "unloaded"
+        self.error: Optional[str] = None
+        self.size_mb = 0.0
+        self.in_use = 0
+        self.last_used = 0.0
+        self.loaded_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self.warmed_up = False
+        self.loads = 0
+        self.evictions = 0
+        self.lock = asyncio.Lock()
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        return {
+            "name": self.name,
+            "state": self.state,
+            "ready": self.state == "ready",
+            "warmed_up": self.warmed_up,
+            "size_mb": round(self.size_mb or self.estimated_mb, 1),
+            "in_use": self.in_use,
+            "idle_seconds": round(now - self.last_used, 1) if self.model is not None else None,
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds else None,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "error": self.error
+        }
+
+
+class ModelRegistry:
+    """Loads models on first use, warms them up and evicts idle ones.
+
+    Services register a loader (and optionally a warmup function) at import
+    time; nothing is loaded until a request needs the model or it is warmed
+    up explicitly. When the loaded models exceed ``memory_budget_mb`` the
+    least recently used model that has been idle for ``idle_seconds`` is
+    unloaded.
+    """
+
+    def __init__(self, memory_budget_mb: float, idle_seconds: float, eviction_interval: float):
+        self.memory_budget_mb = memory_budget_mb
+        self.idle_seconds = idle_seconds
+        self.eviction_interval = eviction_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 warmup: Optional[Callable[[Any], Any]] = None, memory_mb: float = 0):
+        if name not in self._entries:
+            self._entries[name] = _Entry(name, loader, warmup, memory_mb)
+
+    def _entry(self, name: str) -> _Entry:
+        if name not in self._entries:
+            raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+        return self._entries[name]
+
+    async def get(self, name: str) -> Any:
+        """Return the loaded model, loading it first if necessary"""
+        entry = self._entry(name)
+        if entry.model is None:
+            async with entry.lock:
+                if entry.model is None:
+                    await self._load(entry)
+        entry.last_used = time.monotonic()
+        return entry.model
+
+    @asynccontextmanager
+    async def use(self, name: str):
+        """Hold a model for the duration of a call so it is not evicted mid-use"""
+        entry = self._entry(name)
+        entry.in_use += 1
+        try:
+            yield await self.get(name)
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+
+    async def _load(self, entry: _Entry):
+        self._make_room(entry.estimated_mb)
+        entry.state = "loading"
+        entry.error = None
+        started = time.perf_counter()
+        try:
+            model = await inference_pool.run(entry.name, entry.loader)
+        except Exception as e:
+            entry.state = "failed"
+            entry.error = str(e)
+            logger.error(f"Failed to load model '{entry.name}': {e}")
+            raise
+        entry.model = model
+        entry.state = "ready"
+        entry.loads += 1
+        entry.loaded_at = time.monotonic()
+        entry.last_used = entry.loaded_at
+        entry.load_seconds = time.perf_counter() - started
+        entry.size_mb = _measure_mb(model) or entry.estimated_mb
+        logger.info(f"Loaded model '{entry.name}' ({entry.size_mb:.0f} MB) in {entry.load_seconds:.1f}s")
+
+    async def warmup(self, name: str) -> dict:
+        """Load a model and run its synthetic warmup input"""
+        entry = self._entry(name)
+        async with self.use(name) as model:
+            if entry.warmup is not None and not entry.warmed_up:
+                await inference_pool.run(name, entry.warmup, model)
+                entry.warmed_up = True
+        return entry.status()
+
+    def unload(self, name: str) -> bool:
+        entry = self._entry(name)
+        if entry.model is None or entry.in_use:
+            return False
+        entry.model = None
+        entry.state = "unloaded"
+        entry.warmed_up = False
+        entry.size_mb = 0.0
+        entry.evictions += 1
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        logger.info(f"Unloaded model '{name}'")
+        return True
+
+    def loaded_mb(self) -> float:
+        return sum(e.size_mb for e in self._entries.values() if e.model is not None)
+
+    def _make_room(self, incoming_mb: float = 0, min_idle: float = 0):
+        """Unload least recently used idle models until we fit the budget"""
+        now = time.monotonic()
+        candidates = sorted(
+            (e for e in self._entries.values() if e.model is not None and not e.in_use),
+            key=lambda e: e.last_used
+        )
+        for entry in candidates:
+            if self.loaded_mb() + incoming_mb <= self.memory_budget_mb:
+                break
+            if now - entry.last_used >= min_idle:
+                self.unload(entry.name)
+
+    async def _eviction_loop(self):
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            try:
+                self._make_room(min_idle=self.idle_seconds)
+            except Exception as e:
+                logger.error(f"Model eviction failed: {e}")
+
+    async def _warmup_many(self, names: List[str]):
+        for name in names:
+            try:
+                await self.warmup(name)
+            except Exception as e:
+                logger.error(f"Warmup of model '{name}' failed: {e}")
+
+    async def start(self, warmup: Optional[List[str]] = None):
+        self._tasks.append(asyncio.create_task(self._eviction_loop()))
+        if warmup:
+            # Warm up in the background so cheap endpoints are served immediately
+            self._tasks.append(asyncio.create_task(self._warmup_many(warmup)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def status(self, name: Optional[str] = None) -> dict:
+        if name is not None:
+            return self._entry(name).status()
+        return {
+            "memory_budget_mb": self.memory_budget_mb,
+            "loaded_mb": round(self.loaded_mb(), 1),
+            "models": {n: e.status() for n, e in self._entries.items()}
+        }
+
+
+model_registry = ModelRegistry(
+    memory_budget_mb=settings.MODEL_MEMORY_BUDGET_MB,
+    idle_seconds=settings.MODEL_IDLE_SECONDS,
+    eviction_interval=settings.MODEL_EVICTION_INTERVAL_SECONDS
+)
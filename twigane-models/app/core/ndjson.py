@@ -0,0 +1,33 @@
+import json
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Union
+from bson import ObjectId
+
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode(doc: dict) -> str:
+    """One NDJSON line, newline included"""
+    return json.dumps(doc, default=json_default, ensure_ascii=False) + "\n"
+
+
+async def read_lines(chunks: AsyncIterable[Union[bytes, str]]) -> AsyncIterator[bytes]:
+    """Reassemble lines from arbitrarily split chunks, e.g. a request body stream.
+
+    Lines stay bytes so a badly encoded one fails in ``json.loads`` for that
+    row only.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
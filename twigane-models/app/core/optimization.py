@@ -0,0 +1,54 @@
+import logging
+import os
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_MODES = ("fp32", "int8", "onnx")
+
+
+def optimization_mode(model_name: str, mode: Optional[str] = None) -> str:
+    """Inference mode for a registered model, from ``INFERENCE_OPTIMIZATION``"""
+    mode = mode or settings.INFERENCE_OPTIMIZATION.get(model_name, "fp32")
+    if mode not in SUPPORTED_MODES:
+        raise ValueError(f"Unsupported inference mode '{mode}' for '{model_name}', expected one of {SUPPORTED_MODES}")
+    return mode
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of every Linear layer (CPU only)"""
+    import torch
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_onnx(ort_class_name: str, model_id: str):
+    """Load an ONNX Runtime model, exporting and caching the graph on first use"""
+    try:
+        import optimum.onnxruntime as ort
+    except ImportError:
+        raise RuntimeError("ONNX inference mode requires the optional `optimum[onnxruntime]` package")
+
+    ort_class = getattr(ort, ort_class_name)
+    export_dir = os.path.join(settings.ONNX_EXPORT_DIR, model_id.replace("/", "__"))
+    if os.path.isdir(export_dir):
+        return ort_class.from_pretrained(export_dir)
+
+    logger.info(f"Exporting {model_id} to ONNX in {export_dir}")
+    model = ort_class.from_pretrained(model_id, export=True)
+    model.save_pretrained(export_dir)
+    return model
+
+
+def load_model(model_name: str, model_id: str, torch_class, ort_class_name: str, mode: Optional[str] = None):
+    """Load ``model_id`` in the mode configured for ``model_name``"""
+    mode = optimization_mode(model_name, mode)
+    if mode == "onnx":
+        return load_onnx(ort_class_name, model_id)
+
+    model = torch_class.from_pretrained(model_id)
+    model.eval()
+    if mode == "int8":
+        model = quantize_int8(model)
+    return model
@@ -0,0 +1,11 @@
+from fastapi.staticfiles import StaticFiles
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose content never changes for a given URL"""
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
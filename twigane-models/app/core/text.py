@@ -0,0 +1,50 @@
+import re
+from typing import List, Tuple
+
+# Sentence-ending punctuation, optionally followed by closing quotes or
+# brackets, then whitespace before the next sentence.
+_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]]*\s+")
+_ENDS_SENTENCE = re.compile(_SENTENCE_END.pattern + "$")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a paragraph into sentences, dropping empty pieces"""
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(text):
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    sentences.append(text[start:].strip())
+    return [s for s in sentences if s]
+
+
+def split_complete_sentences(text: str) -> Tuple[List[str], str]:
+    """Split streamed text into finished sentences and the unfinished remainder"""
+    sentences = split_sentences(text)
+    if not sentences or _ENDS_SENTENCE.search(text):
+        return sentences, ""
+    return sentences[:-1], text[text.rindex(sentences[-1]):]
+
+
+def segment_document(text: str) -> List[Tuple[str, str]]:
+    """Split a document into ``(sentence, separator)`` pairs.
+
+    The separator is the whitespace that follows the sentence when the
+    document is put back together: a space inside a line, newlines between
+    lines (blank lines are kept).
+    """
+    segments: List[Tuple[str, str]] = []
+    lines = text.split("\n")
+    for line_index, line in enumerate(lines):
+        sentences = split_sentences(line)
+        for i, sentence in enumerate(sentences):
+            segments.append((sentence, " " if i < len(sentences) - 1 else ""))
+        if line_index < len(lines) - 1 and segments:
+            sentence, separator = segments[-1]
+            segments[-1] = (sentence, separator + "\n")
+    return segments
+
+
+def reassemble(segments: List[Tuple[str, str]], sentences: List[str]) -> str:
+    """Join replacement sentences using the separators from ``segment_document``"""
+    return "".join(s + separator for s, (_, separator) in zip(sentences, segments)).strip()
@@ -0,0 +1,77 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from pymongo import monitoring
+
+
+class RequestTimings:
+    """Milliseconds spent per stage while handling one request.
+
+    Stages are summed, so concurrent work (e.g. queries run with
+    ``asyncio.gather``) can add up to more than the request's wall time.
+    Motor reports queries from its worker threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, ms: float):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0.0, 0])
+            entry[0] += ms
+            entry[1] += 1
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: {"ms": round(ms, 1), "count": count} for stage, (ms, count) in self.stages.items()}
+
+    def server_timing(self, total_ms: float) -> str:
+        """``Server-Timing`` header value, one metric per stage plus ``total``"""
+        metrics = [
+            f'{stage};dur={stats["ms"]};desc="{stats["count"]}x"'
+            for stage, stats in self.summary().items()
+        ]
+        metrics.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(metrics)
+
+
+# Set by ServerTimingMiddleware for the duration of each HTTP request
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+def record(stage: str, ms: float):
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(stage, ms)
+
+
+@contextmanager
+def timed(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - started) * 1000)
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Adds the duration of every MongoDB command to the request's ``db`` stage.
+
+    Motor runs commands on its executor with a copy of the caller's context,
+    so the events see the request's timings.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record("db", event.duration_micros / 1000)
+
+    def failed(self, event):
+        record("db", event.duration_micros / 1000)
+
+
+command_timer = CommandTimer()
@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class TranslationCache:
+    """Two-tier translation cache.
+
+    Lookups hit an in-process LRU first and fall back to a SQLite file so
+    entries survive restarts. The SQLite tier is capped at ``max_entries``;
+    once exceeded the least recently read rows are deleted.
+
+    ``get_many`` and ``set_many`` are for the event loop: they read and write
+    the SQLite file on the cache's own thread, one query per batch of keys.
+    """
+
+    # Bound parameters per statement; SQLite builds before 3.32 allow 999
+    DISK_BATCH = 500
+
+    def __init__(self, path: str, memory_entries: int, max_entries: int):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_entries = 0
+        # _lock guards the in-memory LRU and is only held briefly, so the event
+        # loop never waits on SQLite; _disk_lock serializes the connection
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+    @staticmethod
+    def make_key(model: str, source_lang: str, target_lang: str, text: str, mode: str = "fp32") -> str:
+        # The inference mode is part of the key: int8 and ONNX outputs can
+        # differ from fp32, so they are not served for one another
+        raw = "\x1f".join([model, mode, source_lang, target_lang, TranslationCache.normalize(text)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_translations_last_access ON translations (last_access)"
+            )
+            self._disk_entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        return self._conn
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _from_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return value
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        with self._disk_lock:
+            try:
+                conn = self._connect()
+                for start in range(0, len(keys), self.DISK_BATCH):
+                    chunk = keys[start:start + self.DISK_BATCH]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, value FROM translations WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    if rows:
+                        hits = [key for key, _ in rows]
+                        conn.execute(
+                            f"UPDATE translations SET last_access = ? WHERE key IN ({','.join('?' * len(hits))})",
+                            [time.time(), *hits]
+                        )
+                    found.update(rows)
+            except sqlite3.Error as e:
+                logger.error(f"Translation cache read failed: {e}")
+        return found
+
+    def _write_disk(self, items: Dict[str, str]):
+        with self._disk_lock:
+            try:
+                conn = self._connect()
+                before = conn.total_changes
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR IGNORE INTO translations (key, value, last_access) VALUES (?, ?, ?)",
+                    [(key, value, now) for key, value in items.items()]
+                )
+                self._disk_entries += conn.total_changes - before
+                if self._disk_entries > self.max_entries:
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                logger.error(f"Translation cache write failed: {e}")
+
+    def _found_on_disk(self, keys: Iterable[str], found: Dict[str, str]):
+        for key in keys:
+            if key in found:
+                self.disk_hits += 1
+                self._remember(key, found[key])
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._from_memory(key)
+        if value is not None:
+            return value
+        found = self._read_disk([key])
+        self._found_on_disk([key], found)
+        return found.get(key)
+
+    def set(self, key: str, value: str):
+        self._remember(key, value)
+        self._write_disk({key: value})
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="translation-cache")
+        return self._executor
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Cached values for ``keys``, reading the ones not in memory in one disk pass"""
+        found: Dict[str, str] = {}
+        on_disk: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self._from_memory(key)
+            if value is not None:
+                found[key] = value
+            else:
+                on_disk.append(key)
+
+        if on_disk:
+            loop = asyncio.get_running_loop()
+            from_disk = await loop.run_in_executor(self.executor, self._read_disk, on_disk)
+            self._found_on_disk(on_disk, from_disk)
+            found.update(from_disk)
+        return found
+
+    async def set_many(self, items: Dict[str, str]):
+        for key, value in items.items():
+            self._remember(key, value)
+        if items:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, self._write_disk, dict(items))
+
+    def _evict(self, conn: sqlite3.Connection):
+        # Trim to 90% of the cap so we don't evict on every insert
+        excess = self._disk_entries - int(self.max_entries * 0.9)
+        conn.execute(
+            "DELETE FROM translations WHERE key IN "
+            "(SELECT key FROM translations ORDER BY last_access LIMIT ?)",
+            (excess,)
+        )
+        self._disk_entries -= excess
+        self.evictions += excess
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            self._connect().execute("DELETE FROM translations")
+            self._disk_entries = 0
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_capacity": self.memory_entries,
+            "disk_entries": self._disk_entries,
+            "disk_capacity": self.max_entries,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+translation_cache = TranslationCache(
+    path=settings.TRANSLATION_CACHE_PATH,
+    memory_entries=settings.TRANSLATION_CACHE_MEMORY_ENTRIES,
+    max_entries=settings.TRANSLATION_CACHE_MAX_ENTRIES
+)
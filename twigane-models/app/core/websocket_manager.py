@@ -13,11 +13,26 @@ class WebSocketManager:
         self.active_connections[client_id].add(websocket)
 
     async def disconnect(self, websocket: WebSocket, client_id: str):
-        self.active_connections[client_id].remove(websocket)
-        if not self.active_connections[client_id]:
+        connections = self.active_connections.get(client_id)
+        if connections is None:
+            return
+        connections.discard(websocket)
+        if not connections:
             del self.active_connections[client_id]
 
+    def is_connected(self, client_id: str) -> bool:
+        return client_id in self.active_connections
+
     async def send_personal_message(self, message: dict, client_id: str):
-        if client_id in self.active_connections:
-            for connection in self.active_connections[client_id]:
-                await connection.send_json(message)
\ No newline at end of file
+        # Copy so connections that fail can be dropped while iterating
+        for connection in list(self.active_connections.get(client_id, ())):
+            try:
+                await connection.send_json(message)
+            except Exception:
+                await self.disconnect(connection, client_id)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self.active_connections),
+            "connections": sum(len(c) for c in self.active_connections.values())
+        }
@@ -4,18 +4,34 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.routes import router
 from app.core.error_handler import ErrorHandler
-from app.middleware.auth import AuthMiddleware
+from app.middleware.auth import RequireAuthMiddleware
+from app.middleware.timing import ServerTimingMiddleware
 from fastapi.exceptions import RequestValidationError
 from app.core.docs import custom_openapi
-from app.middleware.accessibility import AccessibilityMiddleware
+from app.middleware.accessibility import AccessibilityMiddleware, AccessibleJSONResponse
 from app.core.database import Database
+from app.core.indexes import ensure_indexes
+from app.core.executor import inference_pool, hashing_pool
+from app.core.model_registry import model_registry
+from app.core.translation_cache import translation_cache
+from app.core.audio_cache import audio_cache
+from app.core.cache import close_redis
+from app.services.content_service import ContentService
+from app.services.assessment_service import AssessmentService
+from app.services.profile_service import ProfileService
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Twigane Learning API",
     description="API for Twigane Learning Platform",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    # Applies accessibility and language preferences while responses are serialized
+    default_response_class=AccessibleJSONResponse
 )
 
 # Add CORS middleware first
@@ -27,6 +43,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added before the auth middleware so it runs inside it and sees request.state.user
+app.add_middleware(AccessibilityMiddleware)
+
 # Include router
 app.include_router(router, prefix="/api")
 
@@ -38,10 +57,41 @@ app.add_exception_handler(Exception, ErrorHandler.http_exception_handler)
 @app.on_event("startup")
 async def startup_db_client():
     await Database.connect_db()  # Add await here
+    if settings.MONGO_ENSURE_INDEXES:
+        await ensure_indexes(Database.db)
+
+@app.on_event("startup")
+async def warm_caches():
+    # A failed warm-up only means a few more cache misses, so it never blocks startup
+    if not settings.CACHE_WARMUP_ITEMS:
+        return
+    limit = settings.CACHE_WARMUP_ITEMS
+    results = await asyncio.gather(
+        ContentService(Database.db).warm_cache(limit),
+        AssessmentService(Database.db).warm_cache(limit),
+        ProfileService(Database.db).warm_cache(limit),
+        return_exceptions=True
+    )
+    for name, result in zip(["content", "assessment", "profile"], results):
+        if isinstance(result, Exception):
+            logger.warning(f"Warming the {name} cache failed: {result}")
+        else:
+            logger.info(f"Warmed {result} {name} cache entries")
+
+@app.on_event("startup")
+async def startup_model_registry():
+    # Models load on first use; only the configured ones are warmed up eagerly
+    await model_registry.start(warmup=settings.MODEL_WARMUP)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
     await Database.close_db()    # Add await here if it's also async
+    await model_registry.stop()
+    inference_pool.shutdown()
+    hashing_pool.shutdown()
+    translation_cache.close()
+    audio_cache.close()
+    await close_redis()
 
 # Custom OpenAPI schema
 app.openapi = custom_openapi
@@ -52,37 +102,36 @@ async def setup_openapi():
     app.openapi_schema = custom_openapi(app)
     app.openapi = lambda: app.openapi_schema
 
-# Authentication middleware
-@app.middleware("http")
-async def auth_middleware(request: Request, call_next):
-    # Allow access to auth routes and docs
-    public_paths = [
+# Authentication runs inside the timing middleware so its cost shows up as the auth stage
+app.add_middleware(
+    RequireAuthMiddleware,
+    public_paths=[
         "/api/auth/login",
         "/api/auth/register",
         "/api/docs",
         "/api/redoc",
-        "/openapi.json"
+        "/openapi.json",
+        "/api/models/status",
+        settings.TTS_AUDIO_URL_PREFIX
     ]
-    
-    if any(request.url.path.startswith(path) for path in public_paths):
-        return await call_next(request)
-    
-    # Authenticate other routes
-    auth = AuthMiddleware()
-    await auth(request)
-    return await call_next(request)
-
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    try:
-        response = await call_next(request)
-        return response
-    except Exception as e:
-        return await ErrorHandler.http_exception_handler(request, e)
+)
+
+# Outermost: Server-Timing header, slow-request log and JSON errors
+app.add_middleware(
+    ServerTimingMiddleware,
+    slow_threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    header=settings.SERVER_TIMING_HEADER
+)
+
 # Add after existing imports
 from fastapi.staticfiles import StaticFiles
+from app.core.static_files import ImmutableStaticFiles
 from pathlib import Path
 
 # Add after app initialization
-static_dir = Path("/Users/mac/Downloads/main/twigane-backend/static")
+static_dir = Path(settings.STATIC_DIR)
+audio_dir = Path(settings.TTS_AUDIO_DIR)
+audio_dir.mkdir(parents=True, exist_ok=True)
+# Cached speech is content-addressed, so clients may cache it forever
+app.mount(settings.TTS_AUDIO_URL_PREFIX, ImmutableStaticFiles(directory=str(audio_dir)), name="audio")
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
\ No newline at end of file
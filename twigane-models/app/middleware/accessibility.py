@@ -1,52 +1,72 @@
-from fastapi import Request
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from app.services.i18n_service import I18nService
-from typing import Callable
-import json
+from app.core.database import Database
+from app.core.timing import timed
+from contextvars import ContextVar
+from typing import Any, NamedTuple, Optional
+
+class ResponseTransform(NamedTuple):
+    simplify: bool
+    lang: Optional[str]
+
+# Set per request by AccessibilityMiddleware and applied when the response is rendered
+response_transform: ContextVar[Optional[ResponseTransform]] = ContextVar("response_transform", default=None)
+
+class AccessibleJSONResponse(JSONResponse):
+    """JSON response that applies the request's accessibility transform while rendering.
+
+    The content is walked once, between FastAPI's encoding of the response
+    model and ``json.dumps``, so the body is never parsed and serialized a
+    second time.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialize"):
+            transform = response_transform.get()
+            if transform is not None:
+                content = I18nService.localize(content, transform.lang, transform.simplify)
+            return super().render(content)
+
+def preferred_language(headers: Headers) -> str:
+    lang = headers.get("Accept-Language", I18nService.default_language).split(",")[0]
+    lang = lang.split(";")[0].split("-")[0].strip().lower()
+    return lang if lang in I18nService.supported_languages else I18nService.default_language
 
 class AccessibilityMiddleware:
-    def __init__(self):
-        self.i18n_service = I18nService()
-
-    async def __call__(self, request: Request, call_next: Callable):
-        # Get user preferences from header or token
-        user_id = request.state.user.get("sub") if hasattr(request.state, "user") else None
-        
-        if user_id:
-            # Get user's accessibility preferences
-            preferences = await self.i18n_service.get_user_preferences(user_id)
-            request.state.accessibility = preferences
-            
-            # Get user's language preference
-            lang = request.headers.get("Accept-Language", "rw").split(",")[0]
-            request.state.lang = lang if lang in ["rw", "en"] else "rw"
-            
-            response = await call_next(request)
-            
-            # If response is JSON, apply accessibility transformations
-            if response.headers.get("content-type") == "application/json":
-                body = json.loads(response.body)
-                transformed_body = self._transform_response(body, preferences, lang)
-                response.body = json.dumps(transformed_body).encode()
-                
-            return response
-        
-        return await call_next(request)
-
-    def _transform_response(
-        self, data: dict, preferences: dict, lang: str
-    ) -> dict:
-        if preferences.get("simplified_ui"):
-            data = self._simplify_content(data)
-            
-        if lang != "rw":
-            data = self.i18n_service.translate_content(data, lang)
-            
-        return data
-
-    def _simplify_content(self, data: dict) -> dict:
-        # Implement content simplification logic
-        # Remove non-essential information for simplified UI
-        if isinstance(data, dict):
-            return {k: self._simplify_content(v) for k, v in data.items() 
-                   if not k.startswith("_")}
-        return data
\ No newline at end of file
+    """Pure ASGI middleware that decides the response transform for a request.
+
+    It must run inside the authentication middleware, which puts the
+    principal on ``request.state.user``. Preferences come from the cache in
+    ``I18nService.get_user_preferences``, so most requests don't touch the
+    database.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # Bound on first request, once the database is connected
+        self.i18n_service = None
+
+    async def __call__(self, scope, receive, send):
+        user = scope.get("state", {}).get("user") if scope["type"] == "http" else None
+        if not user:
+            await self.app(scope, receive, send)
+            return
+
+        transform = await self._transform(user["sub"], Headers(scope=scope))
+        token = response_transform.set(transform)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_transform.reset(token)
+
+    async def _transform(self, user_id: str, headers: Headers) -> Optional[ResponseTransform]:
+        if self.i18n_service is None:
+            self.i18n_service = I18nService(await Database.get_db())
+        preferences = await self.i18n_service.get_user_preferences(user_id)
+        lang = preferred_language(headers)
+
+        translate = lang != I18nService.default_language
+        if not preferences.simplified_ui and not translate:
+            return None
+        return ResponseTransform(simplify=preferences.simplified_ui, lang=lang if translate else None)
@@ -1,22 +1,162 @@
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, WebSocket, status
 from app.core.config import settings
+from app.core.error_handler import ErrorHandler
+from app.core.timing import timed
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+import hashlib
+import time
 import jwt
 
+class TokenCache:
+    """Bounded LRU of verified JWT payloads keyed by the token's sha256.
+
+    An entry is dropped once the token's ``exp`` passes (or after ``ttl``
+    seconds for tokens without one), so a cached token never outlives its
+    signature check.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, payload = entry
+        if expires <= time.time():
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: dict):
+        expires = time.time() + self.ttl
+        if "exp" in payload:
+            expires = min(expires, float(payload["exp"]))
+        self._entries[self.key(token)] = (expires, payload)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL_SECONDS)
+
+def verify_token(token: str) -> dict:
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except jwt.PyJWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        token_cache.set(token, payload)
+    # Callers get their own copy, so a handler can't change the cached principal
+    return dict(payload)
+
 class AuthMiddleware:
-    async def __call__(self, request: Request):
+    """Authenticates a request once and returns the principal.
+
+    The app-wide middleware calls ``authenticate`` and stores the principal
+    on ``request.state.user``; as a route dependency the instance returns
+    that principal instead of decoding the token again.
+    """
+
+    async def authenticate(self, request: Request) -> dict:
         try:
             auth_header = request.headers.get('Authorization')
             if not auth_header or not auth_header.startswith('Bearer '):
                 raise HTTPException(status_code=401, detail="No valid token provided")
-            
+
             token = auth_header.split(' ')[1]
-            try:
-                payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-                request.state.user = payload
-            except jwt.PyJWTError:
-                raise HTTPException(status_code=401, detail="Invalid token")
-                
+            request.state.user = verify_token(token)
+            return request.state.user
+
         except HTTPException as he:
             raise he
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def __call__(self, request: Request) -> dict:
+        user = getattr(request.state, "user", None)
+        if user is not None:
+            return user
+        return await self.authenticate(request)
+
+    async def authenticate_websocket(self, websocket: WebSocket) -> Optional[dict]:
+        """Principal for a WebSocket handshake, or None once it has been refused.
+
+        ``RequireAuthMiddleware`` only covers HTTP requests. Browsers can't
+        set headers on a WebSocket, so the token may also come as the
+        ``token`` query parameter.
+        """
+        auth_header = websocket.headers.get("Authorization", "")
+        token = auth_header[len("Bearer "):] if auth_header.startswith("Bearer ") else websocket.query_params.get("token")
+        try:
+            if not token:
+                raise HTTPException(status_code=401, detail="No valid token provided")
+            websocket.state.user = verify_token(token)
+            return websocket.state.user
+        except HTTPException:
+            # Closing before accept refuses the handshake
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return None
+
+class RequireAuthMiddleware:
+    """Pure ASGI middleware that authenticates every non-public HTTP request.
+
+    Paths starting with one of ``public_paths`` and model readiness probes
+    pass through; other requests need a valid bearer token, and the
+    principal is left on ``request.state.user`` for the route dependencies.
+    """
+
+    def __init__(self, app, public_paths: Iterable[str]):
+        self.app = app
+        self.public_paths = tuple(public_paths)
+        self.auth = AuthMiddleware()
+
+    def is_public(self, path: str) -> bool:
+        # Readiness probes are polled without credentials
+        if path.startswith("/api/models/") and path.endswith("/ready"):
+            return True
+        return path.startswith(self.public_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.is_public(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        try:
+            with timed("auth"):
+                await self.auth.authenticate(request)
+        except HTTPException as e:
+            response = await ErrorHandler.http_exception_handler(request, e)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
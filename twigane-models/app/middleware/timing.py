@@ -0,0 +1,61 @@
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from app.core.config import settings
+from app.core.error_handler import ErrorHandler
+from app.core.timing import RequestTimings, current_timings
+import logging
+import time
+
+# A separate logger so slow requests can be routed on their own
+slow_logger = logging.getLogger(f"{__name__}.slow")
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware that reports where each request's time went.
+
+    Stage timings (auth, db, model, hash, serialize) collected during the
+    request are sent in a ``Server-Timing`` header when the response starts.
+    Requests slower than ``slow_threshold_ms`` are logged with their stages.
+    Unhandled errors become JSON responses through ``ErrorHandler``.
+    """
+
+    def __init__(self, app, slow_threshold_ms: float = settings.SLOW_REQUEST_THRESHOLD_MS, header: bool = True):
+        self.app = app
+        self.slow_threshold_ms = slow_threshold_ms
+        self.header = header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+        response_started = False
+
+        async def send_with_timing(message):
+            nonlocal status, response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                status = message["status"]
+                if self.header:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing(total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception as e:
+            if response_started:
+                raise
+            response = await ErrorHandler.http_exception_handler(Request(scope), e)
+            await response(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            total_ms = (time.perf_counter() - started) * 1000
+            if total_ms >= self.slow_threshold_ms:
+                slow_logger.warning(
+                    f"Slow request {scope['method']} {scope['path']} -> {status} "
+                    f"in {total_ms:.0f}ms: {timings.summary()}"
+                )
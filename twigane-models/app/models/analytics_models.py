@@ -20,6 +20,7 @@ class LearningMetrics(BaseModel):
     success_rate: float
     emotional_responses: Dict[str, int]
     accessibility_score: float
+    computed_at: Optional[datetime] = None
 
 class ProgressReport(BaseModel):
     user_id: str
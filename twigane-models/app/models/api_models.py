@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from app.core.config import settings
 from typing import List, Optional
 
 class EmotionResponse(BaseModel):
@@ -22,4 +23,13 @@ class ChatResponse(BaseModel):
 
 class AudioResponse(BaseModel):
     audio_data: str
-    content_type: str
\ No newline at end of file
+    content_type: str
+
+class BatchTranslationRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=settings.TRANSLATION_BATCH_MAX_TEXTS)
+    source_lang: str = "eng"
+    target_lang: str = "kin"
+    stream: bool = False
+
+class BatchTranslationResponse(BaseModel):
+    translations: List[str]
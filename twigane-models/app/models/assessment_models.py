@@ -19,9 +19,26 @@ class AssessmentResult(BaseModel):
     user_id: str
     assessment_id: str
     score: float
+    # Against the assessment's own passing_score
+    passed: bool
     time_taken: int  # in seconds
     answers: List[dict]
     completed_at: datetime
-    feedback_rw: Optional[str]
-    feedback_en: Optional[str]
-    mastery_level: str
\ No newline at end of file
+    feedback_rw: Optional[str] = None
+    feedback_en: Optional[str] = None
+    mastery_level: str
+
+class AssessmentSubmission(BaseModel):
+    assessment_id: str
+    answers: List[dict]
+    time_taken: int  # in seconds
+    # Set when a teacher syncs another learner's attempts; defaults to the caller
+    user_id: Optional[str] = None
+    # When the attempt was taken offline; defaults to the time it is received
+    completed_at: Optional[datetime] = None
+
+class BulkSubmissionResult(BaseModel):
+    submitted: int
+    results: List[AssessmentResult]
+    # Submissions that could not be graded, by position in the request
+    errors: List[dict] = []
@@ -22,6 +22,18 @@ class LearningContent(BaseModel):
         "has_simplified_version": False
     }
 
+class ContentPage(BaseModel):
+    items: List[dict]
+    # Pass back as ``cursor`` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+    limit: int
+
+class ImportReport(BaseModel):
+    inserted: int
+    failed: int
+    # {"line", "detail"} for the first CONTENT_IMPORT_MAX_ERRORS failed rows
+    errors: List[dict] = []
+
 class Exercise(BaseModel):
     content_id: str
     question_rw: str
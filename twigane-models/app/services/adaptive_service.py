@@ -1,84 +1,139 @@
-from app.core.database import Database
+from app.core.history import HistoryBuckets
 from datetime import datetime
 from fastapi import HTTPException
+from typing import List, Optional
+from bson import ObjectId
+
+lesson_history = HistoryBuckets("lesson_history", "completed_at")
+
+NEXT_LESSONS = 3
 
 class AdaptiveService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def _user_key(user_id: str):
+        """Users are keyed by ObjectId; token subjects carry it as a string"""
+        return ObjectId(user_id) if ObjectId.is_valid(user_id) else user_id
 
     async def get_learning_path(self, user_id: str):
         """Get personalized learning path for user"""
-        user = await self.db.users.find_one({"_id": user_id})
-        if not user:
+        path = await self.db.learning_paths.find_one({"user_id": user_id}, {"_id": 0, "user_id": 0})
+        if path is None:
+            # First request for this user: build and store the path
+            path = await self.refresh_learning_path(user_id)
+        return path
+
+    async def refresh_learning_path(self, user_id: str) -> dict:
+        """Recompute one user's learning path and store it in ``learning_paths``.
+
+        A single aggregation reads the user's level and completed lessons and
+        picks the topics and lessons that remain, so the path costs one round
+        trip to build and one indexed read to serve. Use it when the user's
+        level or the topic and lesson catalog changes; a completed lesson only
+        needs ``_advance_learning_path``. The ``$lookup`` stages combine
+        ``localField`` with ``pipeline``, which requires MongoDB 5.0 or later.
+        """
+        not_completed = {"$expr": {"$not": {"$in": ["$_id", "$$completed"]}}}
+        pipeline = [
+            {"$match": {"_id": self._user_key(user_id)}},
+            {"$project": {"_id": 0, "level": {"$ifNull": ["$level", "beginner"]}}},
+            {"$lookup": {
+                "from": "progress",
+                "pipeline": [
+                    {"$match": {"user_id": user_id}},
+                    {"$project": {"_id": 0, "completed": "$completed_lesson_ids"}}
+                ],
+                "as": "progress"
+            }},
+            {"$set": {"completed": {"$ifNull": [{"$first": "$progress.completed"}, []]}}},
+            {"$lookup": {
+                "from": "topics",
+                "localField": "level",
+                "foreignField": "level",
+                "let": {"completed": "$completed"},
+                "pipeline": [{"$match": not_completed}, {"$limit": 5}],
+                "as": "recommended_topics"
+            }},
+            {"$lookup": {
+                "from": "lessons",
+                "localField": "level",
+                "foreignField": "level",
+                "let": {"completed": "$completed"},
+                "pipeline": [{"$match": not_completed}, {"$sort": {"sequence": 1}}, {"$limit": NEXT_LESSONS}],
+                "as": "next_lessons"
+            }},
+            {"$project": {
+                "user_id": {"$literal": user_id},
+                "current_level": "$level",
+                "recommended_topics": 1,
+                "next_lessons": 1,
+                "updated_at": "$$NOW"
+            }},
+            {"$merge": {"into": "learning_paths", "on": "user_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ]
+        await self.db.users.aggregate(pipeline).to_list(length=None)
+
+        path = await self.db.learning_paths.find_one({"user_id": user_id}, {"_id": 0, "user_id": 0})
+        if path is None:
             raise HTTPException(status_code=404, detail="User not found")
-            
-        return {
-            "current_level": user.get("level", "beginner"),
-            "recommended_topics": await self._get_recommended_topics(user),
-            "next_lessons": await self._get_next_lessons(user)
-        }
+        return path
 
     async def update_progress(self, user_id: str, lesson_id: str, performance: dict):
         """Update user's progress and adapt learning path"""
+        now = datetime.utcnow()
+        entry = {"lesson_id": lesson_id, "performance": performance, "completed_at": now}
+        # The summary stays small; the full record goes to the history buckets
         result = await self.db.progress.update_one(
             {"user_id": user_id},
             {
-                "$push": {
-                    "completed_lessons": {
-                        "lesson_id": lesson_id,
-                        "performance": performance,
-                        "completed_at": datetime.utcnow()
-                    }
-                }
+                "$addToSet": {"completed_lesson_ids": lesson_id},
+                "$inc": {"lessons_completed": 1},
+                "$set": {"last_lesson": entry, "updated_at": now}
             },
             upsert=True
         )
+        await lesson_history.append(self.db, user_id, entry)
         
-        await self._adjust_difficulty(user_id, performance)
+        level = await self._adjust_difficulty(user_id, performance)
+        await self._advance_learning_path(user_id, lesson_id, level)
         return {"status": "success", "updated": result.modified_count > 0}
 
-    async def _get_recommended_topics(self, user: dict):
-        """Get personalized topic recommendations"""
-        level = user.get("level", "beginner")
-        progress = await self.db.progress.find_one({"user_id": str(user["_id"])})
-        
-        completed_topics = set()
-        if progress and "completed_lessons" in progress:
-            completed_topics = {
-                lesson["lesson_id"] 
-                for lesson in progress["completed_lessons"]
-            }
-        
-        pipeline = [
-            {"$match": {"level": level}},
-            {"$match": {"_id": {"$nin": list(completed_topics)}}},
-            {"$limit": 5}
-        ]
-        
-        cursor = self.db.topics.aggregate(pipeline)
-        return await cursor.to_list(length=5)
+    async def _advance_learning_path(self, user_id: str, lesson_id: str, level: str):
+        """Remove a completed lesson from the stored path and top up ``next_lessons``.
 
-    async def _get_next_lessons(self, user: dict):
-        """Get next lessons based on user's progress"""
-        level = user.get("level", "beginner")
-        progress = await self.db.progress.find_one({"user_id": str(user["_id"])})
-        
-        completed_lessons = set()
-        if progress and "completed_lessons" in progress:
-            completed_lessons = {
-                lesson["lesson_id"] 
-                for lesson in progress["completed_lessons"]
+        Only a level change alters which topics and lessons apply, so that
+        (or a missing path) falls back to ``refresh_learning_path``.
+        """
+        path = await self.db.learning_paths.find_one(
+            {"user_id": user_id}, {"_id": 0, "current_level": 1, "next_lessons": 1}
+        )
+        if path is None or path.get("current_level") != level:
+            await self.refresh_learning_path(user_id)
+            return
+
+        next_lessons = [lesson for lesson in path.get("next_lessons", []) if lesson["_id"] != lesson_id]
+        if len(next_lessons) < NEXT_LESSONS:
+            progress = await self.db.progress.find_one({"user_id": user_id}, {"_id": 0, "completed_lesson_ids": 1})
+            skip = (progress or {}).get("completed_lesson_ids", []) + [lesson["_id"] for lesson in next_lessons]
+            next_lessons += await self.db.lessons.find(
+                {"level": level, "_id": {"$nin": skip}}
+            ).sort("sequence", 1).limit(NEXT_LESSONS - len(next_lessons)).to_list(length=None)
+
+        await self.db.learning_paths.update_one(
+            {"user_id": user_id},
+            {
+                "$set": {"next_lessons": next_lessons, "updated_at": datetime.utcnow()},
+                "$pull": {"recommended_topics": {"_id": lesson_id}}
             }
-        
-        pipeline = [
-            {"$match": {"level": level}},
-            {"$match": {"_id": {"$nin": list(completed_lessons)}}},
-            {"$sort": {"sequence": 1}},
-            {"$limit": 3}
-        ]
-        
-        cursor = self.db.lessons.aggregate(pipeline)
-        return await cursor.to_list(length=3)
+        )
+
+    async def get_lesson_history(
+        self, user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None, limit: int = 100
+    ) -> List[dict]:
+        """Completed lessons in a time range, newest first"""
+        return await lesson_history.find(self.db, user_id, start, end, limit)
 
     async def _adjust_difficulty(self, user_id: str, performance: dict):
         """Adjust difficulty based on user performance"""
@@ -92,6 +147,7 @@ class AdaptiveService:
             new_level = "beginner"
             
         await self.db.users.update_one(
-            {"_id": user_id},
+            {"_id": self._user_key(user_id)},
             {"$set": {"level": new_level}}
-        )
\ No newline at end of file
+        )
+        return new_level
\ No newline at end of file
@@ -1,29 +1,113 @@
 from app.models.analytics_models import UserAnalytics, LearningMetrics, ProgressReport
-from app.core.database import Database
 from fastapi import HTTPException
 from datetime import datetime, timedelta
+import asyncio
+import logging
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Optional
+from pymongo import UpdateOne
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Results graded before ``passed`` was stored on them count as passed from
+# this score (the "developing" mastery level)
+LEGACY_PASS_SCORE = 60
+
+# content_interactions documents:
+#   {content_id, user_id, time_spent (seconds), completed, difficulty_rating,
+#    accessibility_rating, dominant_emotion, created_at}
+INTERACTION_FIELDS = {
+    "_id": 0,
+    "content_id": 1,
+    "time_spent": 1,
+    "completed": 1,
+    "difficulty_rating": 1,
+    "accessibility_rating": 1,
+    "dominant_emotion": 1
+}
+RATED_FIELDS = ["time_spent", "difficulty_rating", "accessibility_rating"]
+EMOTION_PREFIX = "emotion:"
+
+def summarise_interactions(docs: List[dict]) -> pd.DataFrame:
+    """Per-content sums and counts for one chunk of interactions.
+
+    Sums rather than means are kept so chunks can be combined with ``add``.
+    """
+    frame = pd.DataFrame.from_records(docs, columns=[f for f in INTERACTION_FIELDS if f != "_id"])
+    frame["completed"] = frame["completed"].eq(True)
+    for field in RATED_FIELDS:
+        frame[field] = pd.to_numeric(frame[field], errors="coerce")
+
+    grouped = frame.groupby("content_id")
+    summary = pd.DataFrame({"views": grouped.size(), "completed": grouped["completed"].sum()})
+    for field in RATED_FIELDS:
+        summary[f"{field}_sum"] = grouped[field].sum()
+        summary[f"{field}_count"] = grouped[field].count()
+
+    emotions = pd.crosstab(frame["content_id"], frame["dominant_emotion"]).add_prefix(EMOTION_PREFIX)
+    return summary.join(emotions).fillna(0)
+
+def add_interactions(totals: Optional[pd.DataFrame], docs: List[dict]) -> pd.DataFrame:
+    """``totals`` with one more chunk of interactions added in"""
+    partial = summarise_interactions(docs)
+    return partial if totals is None else totals.add(partial, fill_value=0)
+
+def metrics_documents(totals: pd.DataFrame, computed_at: datetime) -> List[dict]:
+    """Turn combined sums into content_metrics documents"""
+    # Cells absent from every chunk that was added together are NaN
+    totals = totals.fillna(0)
+    def mean(field):
+        counts = totals[f"{field}_count"].to_numpy(dtype=float)
+        sums = totals[f"{field}_sum"].to_numpy(dtype=float)
+        return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+    views = totals["views"].to_numpy(dtype=np.int64)
+    success = totals["completed"].to_numpy(dtype=float) / np.maximum(views, 1)
+    completion_time = mean("time_spent")
+    difficulty = mean("difficulty_rating")
+    accessibility = mean("accessibility_rating")
+
+    emotion_columns = [c for c in totals.columns if c.startswith(EMOTION_PREFIX)]
+    emotion_names = [c[len(EMOTION_PREFIX):] for c in emotion_columns]
+    emotion_counts = totals[emotion_columns].to_numpy(dtype=np.int64)
+
+    return [
+        {
+            "content_id": str(content_id),
+            "total_views": int(views[i]),
+            "average_completion_time": float(completion_time[i]),
+            "difficulty_rating": float(difficulty[i]),
+            "success_rate": float(success[i]),
+            "emotional_responses": {
+                name: int(count) for name, count in zip(emotion_names, emotion_counts[i]) if count
+            },
+            "accessibility_score": float(accessibility[i]),
+            "computed_at": computed_at
+        }
+        for i, content_id in enumerate(totals.index)
+    ]
+
+# The full recompute started from the API; one runs at a time per process
+_recompute_task: Optional[asyncio.Task] = None
 
 class AnalyticsService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
 
     async def generate_user_analytics(self, user_id: str) -> UserAnalytics:
-        # Gather user activity data
-        sessions = await self._get_user_sessions(user_id)
-        assessments = await self._get_user_assessments(user_id)
-        emotions = await self._get_emotional_data(user_id)
+        # Every figure is aggregated in MongoDB over the full history
+        summary = await self._activity_summary(user_id)
         
         analytics = {
             "user_id": user_id,
-            "total_study_time": self._calculate_total_study_time(sessions),
-            "completion_rate": self._calculate_completion_rate(sessions),
-            "average_score": self._calculate_average_score(assessments),
-            "engagement_level": self._determine_engagement_level(sessions),
-            "learning_pace": self._determine_learning_pace(sessions, assessments),
-            "emotional_states": self._analyze_emotional_states(emotions),
+            "total_study_time": int(summary["study_minutes"]),
+            "completion_rate": summary["pass_rate"],
+            "average_score": summary["average_score"],
+            "engagement_level": self._determine_engagement_level(summary),
+            "learning_pace": self._determine_learning_pace(summary),
+            "emotional_states": summary["emotions"],
             "last_updated": datetime.utcnow()
         }
         
@@ -35,44 +119,96 @@ class AnalyticsService:
         
         return UserAnalytics(**analytics)
 
-    async def generate_content_metrics(self, content_id: str) -> LearningMetrics:
-        interactions = await self._get_content_interactions(content_id)
-        
-        metrics = {
-            "content_id": content_id,
-            "total_views": len(interactions),
-            "average_completion_time": self._calculate_avg_completion_time(interactions),
-            "difficulty_rating": self._calculate_difficulty_rating(interactions),
-            "success_rate": self._calculate_success_rate(interactions),
-            "emotional_responses": self._analyze_emotional_responses(interactions),
-            "accessibility_score": self._calculate_accessibility_score(interactions)
-        }
-        
-        await self.db.content_metrics.update_one(
-            {"content_id": content_id},
-            {"$set": metrics},
-            upsert=True
-        )
-        
+    async def get_content_metrics(self, content_id: str) -> LearningMetrics:
+        """Precomputed metrics, computed on the spot only if the content has none yet"""
+        metrics = await self.db.content_metrics.find_one({"content_id": content_id}, {"_id": 0})
+        if not metrics:
+            await self.recompute_content_metrics({"content_id": content_id})
+            metrics = await self.db.content_metrics.find_one({"content_id": content_id}, {"_id": 0})
+        if not metrics:
+            raise HTTPException(status_code=404, detail="No interactions recorded for this content")
         return LearningMetrics(**metrics)
 
+    async def get_many_content_metrics(self, content_ids: List[str]) -> List[LearningMetrics]:
+        cursor = self.db.content_metrics.find({"content_id": {"$in": content_ids}}, {"_id": 0})
+        return [LearningMetrics(**m) async for m in cursor]
+
+    async def recompute_content_metrics(
+        self, query: Optional[dict] = None, chunk_size: int = settings.CONTENT_METRICS_CHUNK_SIZE
+    ) -> int:
+        """Recompute LearningMetrics for every content item with interactions.
+
+        Interactions are read in chunks of ``chunk_size``; each chunk is reduced
+        to per-content sums with pandas and the sums are added together, so
+        memory depends on the number of content items rather than interactions.
+        The pandas work runs in the default executor so the event loop keeps
+        serving requests. Returns the number of content_metrics documents written.
+        """
+        loop = asyncio.get_running_loop()
+        cursor = self.db.content_interactions.find(query or {}, INTERACTION_FIELDS).batch_size(chunk_size)
+        totals = None
+        while True:
+            docs = await cursor.to_list(length=chunk_size)
+            if not docs:
+                break
+            totals = await loop.run_in_executor(None, add_interactions, totals, docs)
+
+        if totals is None:
+            return 0
+
+        written = 0
+        documents = await loop.run_in_executor(None, metrics_documents, totals, datetime.utcnow())
+        for i in range(0, len(documents), chunk_size):
+            requests = [
+                UpdateOne({"content_id": doc["content_id"]}, {"$set": doc}, upsert=True)
+                for doc in documents[i:i + chunk_size]
+            ]
+            result = await self.db.content_metrics.bulk_write(requests, ordered=False)
+            written += result.upserted_count + result.matched_count
+        return written
+
+    def start_content_metrics_recompute(self) -> bool:
+        """Recompute all content metrics in the background.
+
+        Returns False without starting anything if a recompute is already
+        running in this process.
+        """
+        global _recompute_task
+        if _recompute_task is not None and not _recompute_task.done():
+            return False
+        _recompute_task = asyncio.create_task(self.recompute_content_metrics())
+        _recompute_task.add_done_callback(self._log_recompute)
+        return True
+
+    @staticmethod
+    def _log_recompute(task: asyncio.Task):
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.error(f"Content metrics recompute failed: {task.exception()}")
+        else:
+            logger.info(f"Content metrics recompute wrote {task.result()} documents")
+
     async def generate_progress_report(
         self, user_id: str, period: str = "weekly"
     ) -> ProgressReport:
         start_date = self._get_period_start_date(period)
         
-        # Gather data for the period
-        activities = await self._get_period_activities(user_id, start_date)
+        # The period and the full history are summarised side by side
+        current, overall = await asyncio.gather(
+            self._activity_summary(user_id, since=start_date),
+            self._activity_summary(user_id)
+        )
         
         report = {
             "user_id": user_id,
             "period": period,
             "start_date": start_date,
             "end_date": datetime.utcnow(),
-            "metrics": self._calculate_period_metrics(activities),
-            "improvements": self._identify_improvements(activities),
-            "challenges": self._identify_challenges(activities),
-            "recommendations": await self._generate_recommendations(activities)
+            "metrics": self._calculate_period_metrics(current),
+            "improvements": self._identify_improvements(current, overall),
+            "challenges": self._identify_challenges(current, overall),
+            "recommendations": self._generate_recommendations(current)
         }
         
         return ProgressReport(**report)
@@ -87,12 +223,134 @@ class AnalyticsService:
             return now - timedelta(days=90)
         return now - timedelta(days=7)  # Default to weekly
 
-    async def _get_user_sessions(self, user_id: str) -> List[dict]:
-        return await self.db.user_sessions.find(
-            {"user_id": user_id}
-        ).sort("created_at", -1).to_list(length=100)
+    async def _activity_summary(self, user_id: str, since: Optional[datetime] = None) -> dict:
+        """Study, assessment and emotion totals for a user, optionally since a date.
+
+        Three aggregations run concurrently and each returns a single summary
+        document, so the cost does not grow with the amount of data sent back.
+        Study time is the ``time_spent`` recorded on each content interaction.
+        """
+        sessions, assessments, emotions = await asyncio.gather(
+            self.db.content_interactions.aggregate(self._study_pipeline(user_id, since)).to_list(length=1),
+            self.db.assessment_results.aggregate(self._assessments_pipeline(user_id, since)).to_list(length=1),
+            self.db.emotion_analyses.aggregate(self._emotions_pipeline(user_id, since)).to_list(length=None)
+        )
+
+        facets = sessions[0] if sessions else {}
+        totals = facets.get("totals") or [{}]
+        days = facets.get("active_days") or [{}]
+        scores = assessments[0] if assessments else {}
+        attempts = scores.get("attempts", 0)
+        return {
+            "sessions": totals[0].get("sessions", 0),
+            "study_minutes": totals[0].get("minutes", 0.0),
+            "first_session": totals[0].get("first"),
+            "active_days": days[0].get("days", 0),
+            "attempts": attempts,
+            "average_score": scores.get("average_score") or 0.0,
+            "pass_rate": scores.get("passed", 0) / attempts if attempts else 0.0,
+            "first_attempt": scores.get("first"),
+            "emotions": {e["_id"]: e["count"] for e in emotions if e["_id"]}
+        }
+
+    @staticmethod
+    def _match(user_id: str, time_field: str, since: Optional[datetime]) -> dict:
+        match = {"user_id": user_id}
+        if since is not None:
+            match[time_field] = {"$gte": since}
+        return {"$match": match}
+
+    def _study_pipeline(self, user_id: str, since: Optional[datetime]) -> list:
+        return [
+            self._match(user_id, "created_at", since),
+            {"$facet": {
+                "totals": [{"$group": {
+                    "_id": None,
+                    "sessions": {"$sum": 1},
+                    "minutes": {"$sum": {"$divide": [{"$max": [0, {"$ifNull": ["$time_spent", 0]}]}, 60]}},
+                    "first": {"$min": "$created_at"}
+                }}],
+                "active_days": [
+                    {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}}},
+                    {"$count": "days"}
+                ]
+            }}
+        ]
+
+    def _assessments_pipeline(self, user_id: str, since: Optional[datetime]) -> list:
+        return [
+            self._match(user_id, "completed_at", since),
+            {"$group": {
+                "_id": None,
+                "attempts": {"$sum": 1},
+                "average_score": {"$avg": "$score"},
+                "passed": {"$sum": {"$cond": [
+                    {"$ifNull": ["$passed", {"$gte": ["$score", LEGACY_PASS_SCORE]}]}, 1, 0
+                ]}},
+                "first": {"$min": "$completed_at"}
+            }}
+        ]
+
+    def _emotions_pipeline(self, user_id: str, since: Optional[datetime]) -> list:
+        return [
+            self._match(user_id, "created_at", since),
+            {"$group": {"_id": "$dominant_emotion", "count": {"$sum": 1}}}
+        ]
+
+    @staticmethod
+    def _weeks_since(start: Optional[datetime]) -> float:
+        if start is None:
+            return 1.0
+        return max((datetime.utcnow() - start).days / 7, 1.0)
+
+    def _determine_engagement_level(self, summary: dict) -> str:
+        days_per_week = summary["active_days"] / self._weeks_since(summary["first_session"])
+        if days_per_week >= 4:
+            return "high"
+        if days_per_week >= 2:
+            return "medium"
+        return "low"
+
+    def _determine_learning_pace(self, summary: dict) -> str:
+        attempts_per_week = summary["attempts"] / self._weeks_since(summary["first_attempt"])
+        if attempts_per_week >= 3:
+            return "fast"
+        if attempts_per_week >= 1:
+            return "steady"
+        return "slow"
+
+    def _calculate_period_metrics(self, summary: dict) -> Dict[str, float]:
+        return {
+            "study_minutes": round(summary["study_minutes"], 1),
+            "sessions": summary["sessions"],
+            "active_days": summary["active_days"],
+            "assessments": summary["attempts"],
+            "average_score": round(summary["average_score"], 1),
+            "pass_rate": round(summary["pass_rate"], 3)
+        }
+
+    def _identify_improvements(self, current: dict, overall: dict) -> List[str]:
+        improvements = []
+        if current["attempts"] and current["average_score"] > overall["average_score"]:
+            improvements.append("Average assessment score is above your overall average")
+        if current["pass_rate"] > overall["pass_rate"]:
+            improvements.append("More assessments passed than usual")
+        return improvements
+
+    def _identify_challenges(self, current: dict, overall: dict) -> List[str]:
+        challenges = []
+        if current["attempts"] and current["average_score"] < overall["average_score"]:
+            challenges.append("Average assessment score is below your overall average")
+        if current["sessions"] == 0:
+            challenges.append("No study sessions in this period")
+        return challenges
 
-    async def _get_emotional_data(self, user_id: str) -> List[dict]:
-        return await self.db.emotion_analyses.find(
-            {"user_id": user_id}
-        ).sort("created_at", -1).to_list(length=100)
\ No newline at end of file
+    def _generate_recommendations(self, current: dict) -> List[str]:
+        recommendations = []
+        if current["active_days"] < 3:
+            recommendations.append("Study on at least three days each week")
+        if current["attempts"] == 0:
+            recommendations.append("Take an assessment to check your progress")
+        elif current["pass_rate"] < 0.5:
+            recommendations.append("Review the lessons for assessments you did not pass")
+        return recommendations
@@ -1,13 +1,21 @@
-from app.models.assessment_models import Assessment, AssessmentResult
-from app.core.database import Database
+from app.models.assessment_models import Assessment, AssessmentResult, AssessmentSubmission, BulkSubmissionResult
+from app.core.history import HistoryBuckets
+from app.core.cache import ReadThroughCache
+from app.core.database import transaction
 from fastapi import HTTPException
+from collections import defaultdict
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+
+assessment_history = HistoryBuckets("assessment_history", "completed_at")
+assessment_cache = ReadThroughCache("assessment")
 
 class AssessmentService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
 
     async def create_assessment(self, assessment_data: dict) -> Assessment:
         assessment_data["created_at"] = datetime.utcnow()
@@ -18,33 +26,114 @@ class AssessmentService:
         return Assessment(**assessment_data)
 
     async def get_assessment(self, assessment_id: str) -> Assessment:
-        assessment = await self.db.assessments.find_one({"_id": ObjectId(assessment_id)})
+        async def load():
+            assessment = await self.db.assessments.find_one({"_id": ObjectId(assessment_id)})
+            return Assessment(**assessment).model_dump(mode="json") if assessment else None
+
+        assessment = await assessment_cache.get_or_load(assessment_id, load)
         if not assessment:
             raise HTTPException(status_code=404, detail="Assessment not found")
-        assessment["id"] = str(assessment["_id"])
         return Assessment(**assessment)
 
+    async def warm_cache(self, limit: int) -> int:
+        """Load the most-read assessments recorded in Redis into the cache"""
+        ids = await assessment_cache.popular_keys(limit)
+        object_ids = [ObjectId(i) for i in ids if ObjectId.is_valid(i)]
+
+        warmed = 0
+        async for assessment in self.db.assessments.find({"_id": {"$in": object_ids}}):
+            await assessment_cache.set(str(assessment["_id"]), Assessment(**assessment).model_dump(mode="json"))
+            warmed += 1
+        return warmed
+
     async def submit_assessment(self, user_id: str, assessment_id: str, submission: dict) -> AssessmentResult:
         assessment = await self.get_assessment(assessment_id)
-        score = await self._calculate_score(assessment, submission["answers"])
+        result_data = await self._grade(
+            user_id, assessment_id, assessment, submission["answers"], submission["time_taken"], datetime.utcnow()
+        )
         
-        result_data = {
+        # The result and the progress it earns are recorded together
+        async with transaction(self.db) as session:
+            result = await self.db.assessment_results.insert_one(result_data, session=session)
+            await self.db.user_progress.update_one(
+                {"user_id": user_id}, self._progress_update(assessment, result_data), session=session
+            )
+            await assessment_history.append(self.db, user_id, self._history_entry(result_data), session=session)
+        result_data["id"] = str(result.inserted_id)
+        
+        return AssessmentResult(**result_data)
+
+    async def submit_many(self, submissions: List[AssessmentSubmission]) -> BulkSubmissionResult:
+        """Grade and record many submissions, e.g. a classroom synced after working offline.
+
+        Each distinct assessment is loaded once, then all results, progress
+        updates and history entries are written with one bulk call per
+        collection inside a single transaction. Submissions for unknown
+        assessments are reported in ``errors`` and the rest are recorded.
+        """
+        assessments = {}
+        for assessment_id in {s.assessment_id for s in submissions}:
+            try:
+                assessments[assessment_id] = await self.get_assessment(assessment_id)
+            except (HTTPException, InvalidId):
+                pass
+
+        now = datetime.utcnow()
+        graded, errors = [], []
+        for index, submission in enumerate(submissions):
+            assessment = assessments.get(submission.assessment_id)
+            if assessment is None:
+                errors.append({"index": index, "detail": "Assessment not found"})
+                continue
+            graded.append((assessment, await self._grade(
+                submission.user_id, submission.assessment_id, assessment,
+                submission.answers, submission.time_taken, submission.completed_at or now
+            )))
+        if not graded:
+            return BulkSubmissionResult(submitted=0, results=[], errors=errors)
+
+        # Oldest first, so each learner's last_assessment ends up as their latest attempt
+        graded.sort(key=lambda g: g[1]["completed_at"])
+        results = [result for _, result in graded]
+        history = defaultdict(list)
+        for result in results:
+            history[result["user_id"]].append(self._history_entry(result))
+
+        async with transaction(self.db) as session:
+            inserted = await self.db.assessment_results.insert_many(results, session=session)
+            await self.db.user_progress.bulk_write(
+                [
+                    UpdateOne({"user_id": result["user_id"]}, self._progress_update(assessment, result))
+                    for assessment, result in graded
+                ],
+                ordered=True,
+                session=session
+            )
+            await assessment_history.append_grouped(self.db, history, session=session)
+
+        for result, inserted_id in zip(results, inserted.inserted_ids):
+            result["id"] = str(inserted_id)
+        return BulkSubmissionResult(
+            submitted=len(results),
+            results=[AssessmentResult(**result) for result in results],
+            errors=errors
+        )
+
+    async def _grade(
+        self, user_id: str, assessment_id: str, assessment: Assessment,
+        answers: List[dict], time_taken: int, completed_at: datetime
+    ) -> dict:
+        score = await self._calculate_score(assessment, answers)
+        return {
             "user_id": user_id,
             "assessment_id": assessment_id,
             "score": score,
-            "time_taken": submission["time_taken"],
-            "answers": submission["answers"],
-            "completed_at": datetime.utcnow(),
+            "passed": score >= assessment.passing_score,
+            "time_taken": time_taken,
+            "answers": answers,
+            "completed_at": completed_at,
             "mastery_level": self._determine_mastery_level(score)
         }
-        
-        result = await self.db.assessment_results.insert_one(result_data)
-        result_data["id"] = str(result.inserted_id)
-        
-        # Update user progress
-        await self._update_user_progress(user_id, assessment_id, score)
-        
-        return AssessmentResult(**result_data)
 
     async def _calculate_score(self, assessment: Assessment, answers: List[dict]) -> float:
         total_questions = len(assessment.questions)
@@ -66,28 +155,28 @@ class AssessmentService:
         else:
             return "beginner"
 
-    async def _update_user_progress(self, user_id: str, assessment_id: str, score: float):
+    def _progress_update(self, assessment: Assessment, result: dict) -> dict:
         # Update user's progress and unlock new content if necessary
-        assessment = await self.get_assessment(assessment_id)
-        update_data = {
-            "last_assessment": {
-                "id": assessment_id,
-                "score": score,
-                "completed_at": datetime.utcnow()
-            }
+        update = {
+            "$set": {"last_assessment": {
+                "id": result["assessment_id"], "score": result["score"], "completed_at": result["completed_at"]
+            }},
+            "$inc": {"assessments_taken": 1, "assessment_score_total": result["score"]}
         }
-        
-        if score >= assessment.passing_score:
-            update_data["completed_assessments"] = assessment_id
-        
-        await self.db.user_progress.update_one(
-            {"user_id": user_id},
-            {
-                "$set": update_data,
-                "$push": {"assessment_history": {
-                    "assessment_id": assessment_id,
-                    "score": score,
-                    "completed_at": datetime.utcnow()
-                }}
-            }
-        )
\ No newline at end of file
+        if result["passed"]:
+            update["$addToSet"] = {"completed_assessments": result["assessment_id"]}
+        return update
+
+    @staticmethod
+    def _history_entry(result: dict) -> dict:
+        return {
+            "assessment_id": result["assessment_id"],
+            "score": result["score"],
+            "completed_at": result["completed_at"]
+        }
+
+    async def get_assessment_history(
+        self, user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None, limit: int = 100
+    ) -> List[dict]:
+        """Assessment attempts in a time range, newest first"""
+        return await assessment_history.find(self.db, user_id, start, end, limit)
@@ -1,50 +1,43 @@
 from app.models.user import UserCreate, UserLogin, UserInDB
-from app.core.database import Database
 from passlib.context import CryptContext
 import jwt
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.executor import hashing_pool
 from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
 import logging
 
 logger = logging.getLogger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class AuthService:
-    def __init__(self):
-        self.db = None
-        self.users_collection = None
-
-    async def init_db(self):
-        try:
-            if self.db is None:  # Changed from 'if not self.db'
-                self.db = await Database.get_db()
-                self.users_collection = self.db.users
-        except Exception as e:
-            logger.error(f"Database initialization failed: {e}")
-            raise HTTPException(status_code=500, detail="Database connection failed")
+    def __init__(self, db):
+        self.db = db
+        self.users_collection = db.users
 
     async def register_user(self, user_data: UserCreate):
         try:
-            await self.init_db()
-            
-            # Check if user exists
-            existing_email = await self.users_collection.find_one({"email": user_data.email})
-            if existing_email:
-                raise HTTPException(status_code=400, detail="Email already registered")
-                
-            existing_username = await self.users_collection.find_one({"username": user_data.username})
-            if existing_username:
-                raise HTTPException(status_code=400, detail="Username already taken")
+            # Check email and username in one query, before spending time on the hash
+            existing = await self.users_collection.find_one(
+                {"$or": [{"email": user_data.email}, {"username": user_data.username}]},
+                {"email": 1, "username": 1}
+            )
+            if existing:
+                self._raise_duplicate("email" if existing.get("email") == user_data.email else "username")
 
             # Create user document
             user_dict = user_data.dict()
-            user_dict["hashed_password"] = self.get_password_hash(user_dict.pop("password"))
+            user_dict["hashed_password"] = await self.get_password_hash(user_dict.pop("password"))
             user_dict["created_at"] = datetime.utcnow()
             user_dict["is_active"] = True
             
-            # Insert into database
-            result = await self.users_collection.insert_one(user_dict)
+            # Insert into database; the unique indexes catch a concurrent registration
+            try:
+                result = await self.users_collection.insert_one(user_dict)
+            except DuplicateKeyError as e:
+                key = (e.details or {}).get("keyPattern", {})
+                self._raise_duplicate("email" if "email" in key else "username")
             
             # Create access token
             access_token = self.create_access_token({"sub": str(result.inserted_id)})
@@ -60,23 +53,29 @@ class AuthService:
             logger.error(f"Registration failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    @staticmethod
+    def _raise_duplicate(field: str):
+        if field == "email":
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise HTTPException(status_code=400, detail="Username already taken")
+
+    async def get_password_hash(self, password: str) -> str:
+        return await hashing_pool.run("bcrypt", pwd_context.hash, password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await hashing_pool.run("bcrypt", pwd_context.verify, plain_password, hashed_password)
 
     async def login_user(self, user_data: UserLogin):
         try:
-            await self.init_db()
-            
             # Find user by email
-            user = await self.users_collection.find_one({"email": user_data.email})
+            user = await self.users_collection.find_one(
+                {"email": user_data.email}, {"_id": 1, "hashed_password": 1}
+            )
             if not user:
                 raise HTTPException(status_code=400, detail="Email not registered")
                 
             # Verify password
-            if not self.verify_password(user_data.password, user["hashed_password"]):
+            if not await self.verify_password(user_data.password, user["hashed_password"]):
                 raise HTTPException(status_code=400, detail="Incorrect password")
                 
             # Create access token
@@ -1,75 +1,193 @@
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, StoppingCriteria, StoppingCriteriaList, TextStreamer
+import asyncio
+import contextlib
 import torch
+from fastapi import HTTPException
+from typing import AsyncIterator, List, Optional
+from app.core.config import settings
+from app.core.executor import inference_pool
+from app.core.text import split_complete_sentences
 from app.services.translation_service import TranslationService
+from app.services.emotion_service import EmotionService
+from app.services.conversation_store import conversation_store
+from app.core.model_registry import model_registry
+
+CHAT_MODEL_NAME = "microsoft/DialoGPT-medium"
+
+def _load_chat_model():
+    tokenizer = AutoTokenizer.from_pretrained(CHAT_MODEL_NAME)
+    model = AutoModelForCausalLM.from_pretrained(CHAT_MODEL_NAME)
+    return tokenizer, model
+
+def _warmup_chat_model(loaded):
+    tokenizer, model = loaded
+    input_ids = tokenizer.encode("Hello" + tokenizer.eos_token, return_tensors="pt")
+    model.generate(input_ids, max_new_tokens=8, pad_token_id=tokenizer.eos_token_id)
+
+model_registry.register(
+    "chatbot",
+    _load_chat_model,
+    warmup=_warmup_chat_model,
+    memory_mb=1400
+)
+
+class _QueueStreamer(TextStreamer):
+    """Hands decoded text from the generation thread to an asyncio queue"""
+
+    def __init__(self, tokenizer, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self.loop = loop
+        self.queue = queue
+        self.cancelled = False
+
+    def on_finalized_text(self, text: str, stream_end: bool = False):
+        if text:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, text)
+
+class _StopWhenCancelled(StoppingCriteria):
+    """Ends generation early once the client has gone away"""
+
+    def __init__(self, streamer: _QueueStreamer):
+        self.streamer = streamer
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.streamer.cancelled
 
 class ChatbotService:
     def __init__(self):
         self.translation_service = TranslationService()
-        self.tokenizer = AutoTokenizer.from_pretrained("microsoft/DialoGPT-medium")
-        self.model = AutoModelForCausalLM.from_pretrained("microsoft/DialoGPT-medium")
-        self.conversation_history = {}
-        
-    async def get_response(self, user_id: str, message: str) -> str:
+        self.emotion_service = EmotionService()
+        self.conversation_store = conversation_store
+
+    async def get_response(self, user_id: str, message: str) -> dict:
         try:
-            # Add basic response logic here
+            # Translate user message to English
+            english_message = await self.translation_service.translate(
+                message, source_lang="kin", target_lang="eng"
+            )
+
+            history = await self.conversation_store.get(user_id)
+            async with model_registry.use("chatbot") as (tokenizer, model):
+                response, context_ids = await inference_pool.run(
+                    "chatbot", self._generate, tokenizer, model, history, english_message
+                )
+                await self.conversation_store.save(user_id, context_ids, tokenizer.eos_token_id)
+
+            # Translate response to Kinyarwanda
+            kinyarwanda_response = await self.translation_service.translate(
+                response, source_lang="eng", target_lang="kin"
+            )
+
             return {
-                "response": f"Echo: {message}",
                 "original_message": message,
-                "processed": True
+                "response": kinyarwanda_response,
+                "emotion_context": await self.emotion_service.analyze_emotion(response)
             }
+        except HTTPException:
+            # Busy models (503 + Retry-After) and bad language pairs keep their status
+            raise
         except Exception as e:
             raise Exception(f"Failed to process chat message: {str(e)}")
-        # Translate user message to English
-        english_message = await self.translation_service.translate_text(
-            message, source_lang="kin_Latn", target_lang="eng_Latn"
-        )
-        
-        # Get or initialize conversation history
-        if user_id not in self.conversation_history:
-            self.conversation_history[user_id] = []
-            
-        # Encode the input and add to history
-        new_input_ids = self.tokenizer.encode(
-            english_message + self.tokenizer.eos_token, 
-            return_tensors='pt'
-        )
-        
-        # Append to history and maintain context window
-        bot_input_ids = torch.cat([self.conversation_history[user_id], new_input_ids], dim=-1) \
-            if len(self.conversation_history[user_id]) > 0 else new_input_ids
-            
-        # Generate response
-        chat_response_ids = self.model.generate(
-            bot_input_ids,
-            max_length=1000,
-            pad_token_id=self.tokenizer.eos_token_id,
-            no_repeat_ngram_size=3,
-            do_sample=True,
-            top_k=100,
-            top_p=0.7,
-            temperature=0.8
-        )
-        
-        # Decode and get response
-        response = self.tokenizer.decode(
-            chat_response_ids[:, bot_input_ids.shape[-1]:][0],
-            skip_special_tokens=True
-        )
-        
-        # Translate response to Kinyarwanda
-        kinyarwanda_response = await self.translation_service.translate_text(
-            response, source_lang="eng_Latn", target_lang="kin_Latn"
+
+    async def stream_response(self, user_id: str, message: str) -> AsyncIterator[dict]:
+        """Yield chat events while the reply is generated.
+
+        ``token`` events carry English text as DialoGPT produces it;
+        ``sentence`` events carry each finished sentence translated to
+        Kinyarwanda, translated while generation continues; a final ``done``
+        event has the full response and its emotion context.
+        """
+        english_message = await self.translation_service.translate(
+            message, source_lang="kin", target_lang="eng"
         )
-        
-        # Update conversation history
-        self.conversation_history[user_id] = chat_response_ids
-        
-        return {
+        history = await self.conversation_store.get(user_id)
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        translated: List[str] = []
+
+        async def translate_sentence(sentence: str) -> dict:
+            text = await self.translation_service.translate(sentence, source_lang="eng", target_lang="kin")
+            translated.append(text)
+            return {"type": "sentence", "text": text, "source": sentence}
+
+        # The tokenizer is attached once the model is loaded, before any text arrives
+        streamer = _QueueStreamer(None, loop, queue)
+
+        async def generate():
+            # The model is held while it generates, not while a slow client reads the events
+            async with model_registry.use("chatbot") as (tokenizer, model):
+                streamer.tokenizer = tokenizer
+                reply = await inference_pool.run(
+                    "chatbot", self._generate, tokenizer, model, history, english_message, streamer
+                )
+                return reply, tokenizer.eos_token_id
+
+        generation = asyncio.ensure_future(generate())
+        # Runs after every queued chunk, since both are scheduled from the worker thread in order
+        generation.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            pending = ""
+            while True:
+                text = await queue.get()
+                if text is None:
+                    break
+                yield {"type": "token", "text": text}
+
+                sentences, pending = split_complete_sentences(pending + text)
+                for sentence in sentences:
+                    yield await translate_sentence(sentence)
+
+            (response, context_ids), eos_token_id = generation.result()
+            await self.conversation_store.save(user_id, context_ids, eos_token_id)
+        finally:
+            if not generation.done():
+                streamer.cancelled = True
+                with contextlib.suppress(Exception):
+                    await generation
+
+        if pending.strip():
+            yield await translate_sentence(pending.strip())
+
+        yield {
+            "type": "done",
             "original_message": message,
-            "response": kinyarwanda_response,
-            "emotion_context": await self._analyze_response_emotion(response)
+            "response": " ".join(translated),
+            "emotion_context": await self.emotion_service.analyze_emotion(response)
         }
-        
-    async def _analyze_response_emotion(self, response: str) -> dict:
-        emotion_service = EmotionService()
-        return await emotion_service.analyze_emotion(response)
\ No newline at end of file
+
+    def _generate(self, tokenizer, model, history: List[int], message: str, streamer: Optional[_QueueStreamer] = None):
+        """Run one turn; returns the reply and the token ids to keep as context"""
+        new_input_ids = tokenizer.encode(message + tokenizer.eos_token)
+
+        # Leave room for the reply inside the context window
+        budget = settings.CHAT_MAX_CONTEXT_TOKENS - settings.CHAT_MAX_NEW_TOKENS
+        context = self.conversation_store.trim(history + new_input_ids, tokenizer.eos_token_id, budget)
+        bot_input_ids = torch.tensor([context])
+
+        with torch.inference_mode():
+            chat_response_ids = model.generate(
+                bot_input_ids,
+                attention_mask=torch.ones_like(bot_input_ids),
+                max_new_tokens=settings.CHAT_MAX_NEW_TOKENS,
+                pad_token_id=tokenizer.eos_token_id,
+                no_repeat_ngram_size=3,
+                do_sample=True,
+                top_k=100,
+                top_p=0.7,
+                temperature=0.8,
+                streamer=streamer,
+                stopping_criteria=StoppingCriteriaList([_StopWhenCancelled(streamer)]) if streamer else None
+            )
+
+        reply_ids = chat_response_ids[0, bot_input_ids.shape[-1]:].tolist()
+        response = tokenizer.decode(reply_ids, skip_special_tokens=True)
+        if not reply_ids or reply_ids[-1] != tokenizer.eos_token_id:
+            reply_ids.append(tokenizer.eos_token_id)
+        return response, context + reply_ids
+
+    async def reset_conversation(self, user_id: str):
+        await self.conversation_store.clear(user_id)
+
+    def get_memory_stats(self) -> dict:
+        return self.conversation_store.stats()
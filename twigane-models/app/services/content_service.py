@@ -1,13 +1,26 @@
-from app.models.content_models import LearningContent, Exercise
-from app.core.database import Database
+from app.models.content_models import LearningContent, Exercise, ContentPage, ImportReport
+from app.core.config import settings
+from app.core.cache import ReadThroughCache
 from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
 from datetime import datetime
-from typing import List
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
 from bson import ObjectId
+from bson.errors import InvalidId
+import json
+
+content_cache = ReadThroughCache("content")
+
+# Collections that can be bulk imported and exported, with the model each record must match
+BULK_KINDS = {
+    "content": ("learning_content", LearningContent),
+    "exercises": ("exercises", Exercise)
+}
 
 class ContentService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
 
     async def create_content(self, content_data: dict, creator_id: str) -> LearningContent:
         content_data["created_by"] = creator_id
@@ -19,10 +32,13 @@ class ContentService:
         return LearningContent(**content_data)
 
     async def get_content(self, content_id: str) -> LearningContent:
-        content = await self.db.learning_content.find_one({"_id": ObjectId(content_id)})
+        async def load():
+            content = await self.db.learning_content.find_one({"_id": ObjectId(content_id)})
+            return LearningContent(**content).model_dump(mode="json") if content else None
+
+        content = await content_cache.get_or_load(content_id, load)
         if not content:
             raise HTTPException(status_code=404, detail="Content not found")
-        content["id"] = str(content["_id"])
         return LearningContent(**content)
 
     async def update_content(self, content_id: str, update_data: dict) -> LearningContent:
@@ -33,16 +49,165 @@ class ContentService:
         )
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="Content not found")
+        await content_cache.invalidate(content_id)
         return await self.get_content(content_id)
 
-    async def list_content(self, filters: dict = None) -> List[LearningContent]:
-        query = filters or {}
-        cursor = self.db.learning_content.find(query)
-        contents = []
-        async for content in cursor:
-            content["id"] = str(content["_id"])
-            contents.append(LearningContent(**content))
-        return contents
+    async def warm_cache(self, limit: int) -> int:
+        """Load the most-read content into the cache, most viewed first when Redis has no counts yet"""
+        ids = await content_cache.popular_keys(limit)
+        if len(ids) < limit:
+            cursor = self.db.content_metrics.find({}, {"content_id": 1}).sort("total_views", -1).limit(limit)
+            ids += [m["content_id"] async for m in cursor if m["content_id"] not in ids]
+        object_ids = [ObjectId(i) for i in ids[:limit] if ObjectId.is_valid(i)]
+
+        warmed = 0
+        async for content in self.db.learning_content.find({"_id": {"$in": object_ids}}):
+            await content_cache.set(str(content["_id"]), LearningContent(**content).model_dump(mode="json"))
+            warmed += 1
+        return warmed
+
+    def _listing_query(
+        self, filters: Optional[dict], cursor: Optional[str], fields: Optional[List[str]]
+    ) -> Tuple[dict, Optional[dict]]:
+        query = dict(filters or {})
+        if cursor:
+            try:
+                query["_id"] = {"$gt": ObjectId(cursor)}
+            except (InvalidId, TypeError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        projection = None
+        if fields:
+            unknown = [f for f in fields if f not in LearningContent.model_fields]
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+            projection = {f: 1 for f in fields}
+        return query, projection
+
+    @staticmethod
+    def _to_item(doc: dict) -> dict:
+        doc["id"] = str(doc.pop("_id"))
+        return doc
+
+    async def list_content(
+        self,
+        filters: dict = None,
+        limit: int = settings.CONTENT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> ContentPage:
+        """One page of content in ``_id`` order, starting after ``cursor``"""
+        query, projection = self._listing_query(filters, cursor, fields)
+        # Fetch one extra document to know whether another page follows
+        docs = await self.db.learning_content.find(query, projection).sort("_id", 1).limit(limit + 1).to_list(length=limit + 1)
+
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = str(docs[-1]["_id"])
+        return ContentPage(items=[self._to_item(doc) for doc in docs], next_cursor=next_cursor, limit=limit)
+
+    def stream_content(
+        self,
+        filters: dict = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[dict]:
+        """Every matching document as it comes off the Motor cursor.
+
+        The arguments are checked here rather than on first iteration so a bad
+        cursor or field still gets a 400 before any output is sent.
+        """
+        query, projection = self._listing_query(filters, cursor, fields)
+        documents = self.db.learning_content.find(query, projection).sort("_id", 1)
+        return self._iterate(documents.batch_size(settings.CONTENT_STREAM_BATCH_SIZE))
+
+    async def _iterate(self, documents) -> AsyncIterator[dict]:
+        async for doc in documents:
+            yield self._to_item(doc)
+
+    @staticmethod
+    def _bulk_kind(kind: str) -> Tuple[str, type]:
+        if kind not in BULK_KINDS:
+            raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(BULK_KINDS)}")
+        return BULK_KINDS[kind]
+
+    def export_records(self, kind: str) -> AsyncIterator[dict]:
+        """Every document of ``kind`` in ``_id`` order, in the format import_records reads"""
+        collection, _ = self._bulk_kind(kind)
+        documents = self.db[collection].find({}).sort("_id", 1)
+        return self._iterate(documents.batch_size(settings.CONTENT_STREAM_BATCH_SIZE))
+
+    async def import_records(
+        self,
+        kind: str,
+        lines: AsyncIterable[bytes],
+        creator_id: str,
+        chunk_size: int = settings.CONTENT_IMPORT_CHUNK_SIZE
+    ) -> ImportReport:
+        """Validate NDJSON records and insert them in unordered chunks.
+
+        A row that is not valid JSON, fails validation or is rejected by
+        MongoDB (e.g. a duplicate ``id``) is reported by line number; the
+        other rows are still inserted. Records keep their ``id`` when they
+        have one, so an export can be imported into another environment with
+        exercises still pointing at their content.
+        """
+        collection, model = self._bulk_kind(kind)
+        report = ImportReport(inserted=0, failed=0)
+        chunk: List[Tuple[int, dict]] = []
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                chunk.append((line_number, self._import_document(model, json.loads(line), creator_id)))
+            except ValidationError as e:
+                self._import_error(report, line_number, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ))
+            except ValueError as e:
+                self._import_error(report, line_number, str(e))
+            if len(chunk) >= chunk_size:
+                await self._insert_chunk(collection, chunk, report)
+                chunk = []
+        if chunk:
+            await self._insert_chunk(collection, chunk, report)
+        return report
+
+    @staticmethod
+    def _import_document(model: type, record, creator_id: str) -> dict:
+        if not isinstance(record, dict):
+            raise ValueError("Each line must be a JSON object")
+        record_id = record.pop("id", None)
+        if model is LearningContent:
+            now = datetime.utcnow()
+            record.setdefault("created_by", creator_id)
+            record.setdefault("created_at", now)
+            record.setdefault("updated_at", now)
+
+        doc = model.model_validate(record).model_dump()
+        if record_id is not None:
+            if not ObjectId.is_valid(record_id):
+                raise ValueError(f"Invalid id: {record_id}")
+            doc["_id"] = ObjectId(record_id)
+        return doc
+
+    @staticmethod
+    def _import_error(report: ImportReport, line: int, detail: str):
+        report.failed += 1
+        if len(report.errors) < settings.CONTENT_IMPORT_MAX_ERRORS:
+            report.errors.append({"line": line, "detail": detail})
+
+    async def _insert_chunk(self, collection: str, chunk: List[Tuple[int, dict]], report: ImportReport):
+        try:
+            result = await self.db[collection].insert_many([doc for _, doc in chunk], ordered=False)
+            report.inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            report.inserted += e.details["nInserted"]
+            for error in e.details["writeErrors"]:
+                self._import_error(report, chunk[error["index"]][0], error["errmsg"])
 
     async def create_exercise(self, exercise_data: dict) -> Exercise:
         result = await self.db.exercises.insert_one(exercise_data)
@@ -0,0 +1,104 @@
+from app.core.database import Database
+from app.core.config import settings
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ConversationStore:
+    """Bounded per-user chat context for the chatbot.
+
+    Each user's context is a list of token ids capped at ``max_tokens``;
+    older turns are dropped whole. At most ``max_users`` contexts are kept
+    in memory (least recently used are evicted) and every update is written
+    to the ``user_sessions`` collection so context survives restarts.
+    """
+
+    def __init__(self, max_users: int, max_tokens: int):
+        self.max_users = max_users
+        self.max_tokens = max_tokens
+        self._windows: "OrderedDict[str, List[int]]" = OrderedDict()
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    async def _sessions(self):
+        db = await Database.get_db()
+        return db.user_sessions
+
+    def _remember(self, user_id: str, window: List[int]):
+        self._windows[user_id] = window
+        self._windows.move_to_end(user_id)
+        while len(self._windows) > self.max_users:
+            self._windows.popitem(last=False)
+            self.evictions += 1
+
+    def trim(
+        self, token_ids: List[int], eos_token_id: Optional[int] = None, max_tokens: Optional[int] = None
+    ) -> List[int]:
+        """Keep the newest ``max_tokens`` ids, starting on a turn boundary"""
+        max_tokens = max_tokens or self.max_tokens
+        if len(token_ids) <= max_tokens:
+            return list(token_ids)
+        window = token_ids[-max_tokens:]
+        starts_turn = token_ids[-max_tokens - 1] == eos_token_id
+        if eos_token_id is not None and not starts_turn and eos_token_id in window[:-1]:
+            window = window[window.index(eos_token_id) + 1:]
+        return window
+
+    async def get(self, user_id: str) -> List[int]:
+        if user_id in self._windows:
+            self._windows.move_to_end(user_id)
+            self.hits += 1
+            return self._windows[user_id]
+
+        window: List[int] = []
+        try:
+            sessions = await self._sessions()
+            session = await sessions.find_one({"user_id": user_id}, {"chat_context_ids": 1})
+            if session:
+                window = session.get("chat_context_ids") or []
+        except Exception as e:
+            logger.error(f"Failed to load chat context for {user_id}: {e}")
+        self.loads += 1
+        self._remember(user_id, window)
+        return window
+
+    async def save(self, user_id: str, token_ids: List[int], eos_token_id: Optional[int] = None) -> List[int]:
+        window = self.trim(token_ids, eos_token_id)
+        self._remember(user_id, window)
+        try:
+            sessions = await self._sessions()
+            await sessions.update_one(
+                {"user_id": user_id},
+                {
+                    "$set": {"chat_context_ids": window, "updated_at": datetime.utcnow()},
+                    "$setOnInsert": {"created_at": datetime.utcnow()}
+                },
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to persist chat context for {user_id}: {e}")
+        return window
+
+    async def clear(self, user_id: str):
+        self._windows.pop(user_id, None)
+        sessions = await self._sessions()
+        await sessions.update_one({"user_id": user_id}, {"$unset": {"chat_context_ids": ""}})
+
+    def stats(self) -> dict:
+        return {
+            "users_in_memory": len(self._windows),
+            "max_users": self.max_users,
+            "max_tokens": self.max_tokens,
+            "hits": self.hits,
+            "loads": self.loads,
+            "evictions": self.evictions
+        }
+
+conversation_store = ConversationStore(
+    max_users=settings.CHAT_MAX_CONVERSATIONS,
+    max_tokens=settings.CHAT_MAX_CONTEXT_TOKENS
+)
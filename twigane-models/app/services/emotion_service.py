@@ -1,30 +1,71 @@
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
 from app.services.translation_service import TranslationService
+from app.core.batching import MicroBatcher
+from app.core.config import settings
+from app.core.executor import inference_pool
+from app.core.model_registry import model_registry
+from app.core.optimization import load_model
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Use a public model that doesn't require authentication
+EMOTION_MODEL_NAME = "bhadresh-savani/distilbert-base-uncased-emotion"
+
+def _load_emotion_classifier(mode: Optional[str] = None):
+    model = load_model(
+        "emotion",
+        EMOTION_MODEL_NAME,
+        AutoModelForSequenceClassification,
+        "ORTModelForSequenceClassification",
+        mode
+    )
+    return pipeline(
+        "text-classification",
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(EMOTION_MODEL_NAME),
+        return_all_scores=True
+    )
+
+def _warmup_emotion_classifier(classifier):
+    classifier(["I am happy to be learning today", "This lesson is hard"], batch_size=2)
+
+model_registry.register(
+    "emotion",
+    _load_emotion_classifier,
+    warmup=_warmup_emotion_classifier,
+    memory_mb=260
+)
+
 class EmotionService:
     def __init__(self):
-        try:
-            # Use a public model that doesn't require authentication
-            model_name = "bhadresh-savani/distilbert-base-uncased-emotion"
-            self.emotion_classifier = pipeline(
-                "text-classification",
-                model=model_name,
-                tokenizer=model_name,
-                return_all_scores=True
+        self.translation_service = TranslationService()
+        # Concurrent requests are gathered into one padded batch
+        self.batcher = MicroBatcher(
+            self._classify_batch,
+            max_batch_size=settings.EMOTION_BATCH_SIZE,
+            max_wait_ms=settings.EMOTION_BATCH_WAIT_MS,
+            name="emotion",
+            max_queue_size=settings.EMOTION_MAX_QUEUE,
+            retry_after=settings.INFERENCE_RETRY_AFTER_SECONDS
+        )
+
+    async def _classify_batch(self, texts: List[str]) -> List[list]:
+        """Run the classifier once over a whole batch of texts"""
+        async with model_registry.use("emotion") as emotion_classifier:
+            return await inference_pool.run(
+                "emotion",
+                emotion_classifier,
+                texts,
+                batch_size=len(texts),
+                truncation=True
             )
-            self.translation_service = TranslationService()
-            logger.info("Emotion service initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize emotion service: {e}")
-            raise
 
     async def analyze_emotion(self, text: str) -> dict:
         try:
             # Get emotion predictions
-            emotions = self.emotion_classifier(text)[0]
+            emotions = await self.batcher.submit(text)
             
             # Format results
             emotion_scores = {
@@ -43,4 +84,7 @@ class EmotionService:
             }
         except Exception as e:
             logger.error(f"Emotion analysis failed: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def get_batch_stats(self) -> dict:
+        return self.batcher.stats()
@@ -1,28 +1,99 @@
 from transformers import TrOCRProcessor, VisionEncoderDecoderModel
+from app.core.config import settings
+from app.core.executor import inference_pool
+from app.core.model_registry import model_registry
+from app.core.optimization import load_model
+from fastapi import HTTPException
 from PIL import Image
+from typing import List, Optional, Tuple
+import numpy as np
+import cv2
 import io
 
-class EssayService:
-    def __init__(self):
-        self.processor = TrOCRProcessor.from_pretrained("microsoft/trocr-base-handwritten")
-        self.model = VisionEncoderDecoderModel.from_pretrained("microsoft/trocr-base-handwritten")
+OCR_MODEL_NAME = "microsoft/trocr-base-handwritten"
+
+def _load_ocr_model(mode: Optional[str] = None):
+    processor = TrOCRProcessor.from_pretrained(OCR_MODEL_NAME)
+    model = load_model(
+        "essay",
+        OCR_MODEL_NAME,
+        VisionEncoderDecoderModel,
+        "ORTModelForVision2Seq",
+        mode
+    )
+    return processor, model
+
+def _warmup_ocr_model(loaded):
+    processor, model = loaded
+    blank_line = Image.new("RGB", (384, 64), "white")
+    pixel_values = processor(blank_line, return_tensors="pt").pixel_values
+    model.generate(pixel_values, max_new_tokens=8)
+
+model_registry.register(
+    "essay",
+    _load_ocr_model,
+    warmup=_warmup_ocr_model,
+    memory_mb=1300
+)
+
+def _ink_runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Start/end indices of consecutive True runs in a 1-D mask"""
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2], edges[1::2]))
+
+def segment_lines(image: Image.Image) -> List[Image.Image]:
+    """Crop a page image into text lines, top to bottom.
+
+    TrOCR only reads a single line, so the page is binarized, smeared
+    horizontally so the words on a line merge, and cut where the horizontal
+    ink profile drops to zero. Returns the whole image if no lines are found.
+    """
+    rgb = np.array(image.convert("RGB"))
+    height, width = rgb.shape[:2]
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(15, width // 30), 1))
+    smeared = cv2.dilate(binary, kernel, iterations=1)
+    profile = (smeared > 0).sum(axis=1)
+    bands = _ink_runs(profile > width * settings.ESSAY_LINE_INK_RATIO)
+    if not bands:
+        return [image]
 
+    # Join bands split by tiny gaps (e.g. dots on i/j) and drop specks
+    median_height = float(np.median([end - start for start, end in bands]))
+    merged: List[List[int]] = []
+    for start, end in bands:
+        if merged and start - merged[-1][1] < median_height * 0.25:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    min_height = max(settings.ESSAY_MIN_LINE_HEIGHT, median_height * 0.3)
+    merged = [band for band in merged if band[1] - band[0] >= min_height]
+    if not merged:
+        return [image]
+
+    lines = []
+    for start, end in merged:
+        pad = max(4, (end - start) // 5)
+        top, bottom = max(0, start - pad), min(height, end + pad)
+        columns = _ink_runs(binary[top:bottom].any(axis=0))
+        left, right = (columns[0][0], columns[-1][1]) if columns else (0, width)
+        left, right = max(0, left - pad), min(width, right + pad)
+        lines.append(image.crop((left, top, right, bottom)))
+    return lines
+
+class EssayService:
     async def process_handwritten_essay(self, image_bytes):
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # Preprocess the image
-            pixel_values = self.processor(image, return_tensors="pt").pixel_values
-            
-            # Generate text
-            generated_ids = self.model.generate(pixel_values)
-            
-            # Decode the generated ids
-            transcribed_text = self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            async with model_registry.use("essay") as loaded:
+                lines = await inference_pool.run("essay", self._transcribe, loaded, image_bytes)
             
             return {
-                "original_text": transcribed_text,
+                "original_text": "\n".join(lines),
+                "lines": lines,
                 "analysis": {
                     "pros": ["Text successfully extracted"],
                     "cons": [],
@@ -30,5 +101,24 @@ class EssayService:
                 }
             }
 
+        except HTTPException:
+            raise
         except Exception as e:
-            raise Exception(f"Essay processing failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Essay processing failed: {str(e)}")
+
+    def _transcribe(self, loaded, image_bytes) -> List[str]:
+        processor, model = loaded
+
+        # Convert bytes to PIL Image and cut it into lines in reading order
+        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        line_images = segment_lines(image)
+        
+        # Recognize all lines together, one generate call per batch
+        lines = []
+        batch_size = settings.ESSAY_MAX_BATCH_LINES
+        for i in range(0, len(line_images), batch_size):
+            pixel_values = processor(images=line_images[i:i + batch_size], return_tensors="pt").pixel_values
+            generated_ids = model.generate(pixel_values)
+            lines.extend(processor.batch_decode(generated_ids, skip_special_tokens=True))
+        
+        return [line.strip() for line in lines if line.strip()]
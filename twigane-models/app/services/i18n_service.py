@@ -1,14 +1,30 @@
 from app.models.i18n_models import LocaleString, AccessibilityPreferences
-from app.core.database import Database
+from app.core.cache import ReadThroughCache
+from app.core.config import settings
 from fastapi import HTTPException
 import json
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
+
+# Read on every authenticated request by the accessibility middleware
+preferences_cache = ReadThroughCache("accessibility_preferences", ttl=settings.ACCESSIBILITY_PREFS_TTL_SECONDS)
 
 class I18nService:
-    def __init__(self):
-        self.db = Database.get_db()
-        self.translations = self._load_translations()
+    # Language codes of LocaleString; content is authored in the default
+    supported_languages = ["rw", "en"]
+    default_language = "rw"
+
+    # Shared by every instance; services are created per request
+    _translations: Optional[Dict] = None
+
+    def __init__(self, db):
+        self.db = db
+
+    async def load_translations(self, refresh: bool = False) -> Dict:
+        """Translations by language, read from the database once and then cached"""
+        if I18nService._translations is None or refresh:
+            I18nService._translations = await self._load_translations()
+        return I18nService._translations
 
     async def _load_translations(self) -> Dict:
         """Load translations from database"""
@@ -27,15 +43,16 @@ class I18nService:
 
     async def get_translation(self, key: str, language: str = "kin") -> str:
         """Get translation for a specific key in given language"""
-        if language not in self.translations:
+        translations = await self.load_translations()
+        if language not in translations:
             raise HTTPException(
                 status_code=404, 
                 detail=f"Language {language} not found"
             )
         
-        return self.translations[language].get(
+        return translations[language].get(
             key, 
-            self.translations["eng"].get(key, key)
+            translations.get("eng", {}).get(key, key)
         )
 
     async def add_translation(
@@ -53,7 +70,7 @@ class I18nService:
             )
             
             # Refresh translations cache
-            self.translations = await self._load_translations()
+            await self.load_translations(refresh=True)
             
             return {
                 "status": "success",
@@ -68,10 +85,12 @@ class I18nService:
             )
 
     async def get_user_preferences(self, user_id: str) -> AccessibilityPreferences:
-        prefs = await self.db.accessibility_preferences.find_one({"user_id": user_id})
-        if not prefs:
-            return AccessibilityPreferences()
-        return AccessibilityPreferences(**prefs)
+        async def load():
+            prefs = await self.db.accessibility_preferences.find_one({"user_id": user_id})
+            # Defaults are cached too, so users without preferences don't hit the database
+            return (AccessibilityPreferences(**prefs) if prefs else AccessibilityPreferences()).model_dump()
+
+        return AccessibilityPreferences(**await preferences_cache.get_or_load(user_id, load))
 
     async def update_user_preferences(
         self, user_id: str, preferences: AccessibilityPreferences
@@ -81,14 +100,31 @@ class I18nService:
             {"$set": preferences.dict()},
             upsert=True
         )
+        await preferences_cache.invalidate(user_id)
         return preferences
 
+    @classmethod
+    def localize(cls, data, target_lang: Optional[str] = None, simplify: bool = False):
+        """Project JSON-ready data in a single pass.
+
+        With ``target_lang`` every locale dict (one key per supported
+        language) is replaced by its text in that language, falling back to
+        the default language. With ``simplify`` keys starting with ``_`` are
+        dropped.
+        """
+        if isinstance(data, dict):
+            if target_lang and all(k in data for k in cls.supported_languages):
+                return data.get(target_lang) or data[cls.default_language]
+            return {
+                key: cls.localize(value, target_lang, simplify)
+                for key, value in data.items()
+                if not (simplify and key.startswith("_"))
+            }
+        if isinstance(data, list):
+            return [cls.localize(item, target_lang, simplify) for item in data]
+        return data
+
     def translate_content(self, content: dict, target_lang: str) -> dict:
         if target_lang not in self.supported_languages:
             return content
-            
-        translated = content.copy()
-        for key, value in content.items():
-            if isinstance(value, dict) and all(k in value for k in self.supported_languages):
-                translated[key] = value[target_lang]
-        return translated
\ No newline at end of file
+        return self.localize(content, target_lang)
\ No newline at end of file
@@ -1,12 +1,11 @@
 from app.models.mobile_models import MobileConfig, MobileSession
-from app.core.database import Database
 from fastapi import HTTPException
 from datetime import datetime
 import json
 
 class MobileService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
         self.config = self._load_mobile_config()
 
     def _load_mobile_config(self) -> MobileConfig:
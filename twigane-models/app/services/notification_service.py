@@ -1,27 +1,23 @@
 from app.models.notification_models import Notification, WebSocketMessage
-from app.core.database import Database
+from app.core.websocket_manager import WebSocketManager
 from fastapi import WebSocket
-from datetime import datetime, timedelta
-from typing import Dict, List, Set
-import json
-import asyncio
+from fastapi.encoders import jsonable_encoder
+from datetime import datetime
+from typing import List, Union
+
+# Open notification sockets outlive any one request, so they are shared
+notification_connections = WebSocketManager()
 
 class NotificationService:
-    def __init__(self):
-        self.db = Database.get_db()
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        self.background_tasks = set()
+    def __init__(self, db, connections: WebSocketManager = notification_connections):
+        self.db = db
+        self.connections = connections
 
     async def connect(self, websocket: WebSocket, user_id: str):
-        await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
+        await self.connections.connect(websocket, user_id)
 
     async def disconnect(self, websocket: WebSocket, user_id: str):
-        self.active_connections[user_id].remove(websocket)
-        if not self.active_connections[user_id]:
-            del self.active_connections[user_id]
+        await self.connections.disconnect(websocket, user_id)
 
     async def create_notification(self, notification_data: dict) -> Notification:
         notification = Notification(
@@ -31,7 +27,7 @@ class NotificationService:
         await self.db.notifications.insert_one(notification.dict())
         
         # Send real-time notification if user is connected
-        if notification.user_id in self.active_connections:
+        if self.connections.is_connected(notification.user_id):
             await self.broadcast_to_user(
                 notification.user_id,
                 WebSocketMessage(
@@ -62,22 +58,5 @@ class NotificationService:
         )
         return result.modified_count > 0
 
-    async def broadcast_to_user(self, user_id: str, message: WebSocketMessage):
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message.dict())
-                except:
-                    await self.disconnect(connection, user_id)
-
-    async def start_background_tasks(self):
-        task = asyncio.create_task(self._cleanup_expired_notifications())
-        self.background_tasks.add(task)
-        task.add_done_callback(self.background_tasks.discard)
-
-    async def _cleanup_expired_notifications(self):
-        while True:
-            await self.db.notifications.delete_many({
-                "expires_at": {"$lt": datetime.utcnow()}
-            })
-            await asyncio.sleep(3600)  # Run every hour
\ No newline at end of file
+    async def broadcast_to_user(self, user_id: str, message: Union[WebSocketMessage, dict]):
+        await self.connections.send_personal_message(jsonable_encoder(message), user_id)
@@ -1,11 +1,13 @@
 from app.models.profile_models import UserProfile, UserRole
-from app.core.database import Database
 from fastapi import HTTPException
+from app.core.cache import ReadThroughCache
 from datetime import datetime
 
+profile_cache = ReadThroughCache("profile")
+
 class ProfileService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
         self.roles = {
             "student": UserRole(
                 name="student",
@@ -41,14 +43,38 @@ class ProfileService:
         )
         if result.modified_count == 0:
             raise HTTPException(status_code=404, detail="Profile not found")
+        await profile_cache.invalidate(user_id)
         return await self.get_profile(user_id)
 
     async def get_profile(self, user_id: str) -> UserProfile:
-        profile = await self.db.profiles.find_one({"user_id": user_id})
+        async def load():
+            profile = await self.db.profiles.find_one({"user_id": user_id})
+            return UserProfile(**profile).model_dump(mode="json") if profile else None
+
+        profile = await profile_cache.get_or_load(user_id, load)
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         return UserProfile(**profile)
 
+    async def get_role(self, user_id: str) -> str:
+        """The user's role; users who have not created a profile are students"""
+        try:
+            return (await self.get_profile(user_id)).role
+        except HTTPException as e:
+            if e.status_code != 404:
+                raise
+            return "student"
+
+    async def warm_cache(self, limit: int) -> int:
+        """Load the most-read profiles recorded in Redis into the cache"""
+        user_ids = await profile_cache.popular_keys(limit)
+
+        warmed = 0
+        async for profile in self.db.profiles.find({"user_id": {"$in": user_ids}}):
+            await profile_cache.set(profile["user_id"], UserProfile(**profile).model_dump(mode="json"))
+            warmed += 1
+        return warmed
+
     def check_permission(self, role: str, required_permission: str) -> bool:
         if role not in self.roles:
             return False
@@ -1,34 +1,177 @@
 from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 from app.core.config import settings
+from app.core.executor import inference_pool
+from app.core.model_registry import model_registry
+from app.core.translation_cache import translation_cache
+from app.core.text import segment_document, reassemble
+from app.core.optimization import load_model, optimization_mode
 from fastapi import HTTPException
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import threading
+
+# NLLB language codes. The tokenizer is told the source language and
+# generation is forced to start with the target language token, so the same
+# checkpoint serves both directions.
+NLLB_LANGUAGE_CODES = {"eng": "eng_Latn", "kin": "kin_Latn"}
+
+def _load_translation_model(mode: Optional[str] = None):
+    tokenizer = AutoTokenizer.from_pretrained(settings.TRANSLATION_MODEL)
+    model = load_model(
+        "translation",
+        settings.TRANSLATION_MODEL,
+        AutoModelForSeq2SeqLM,
+        "ORTModelForSeq2SeqLM",
+        mode
+    )
+    return tokenizer, model
+
+def _warmup_translation_model(loaded):
+    TranslationService()._translate_sync(loaded, ["Welcome to today's lesson."], "eng", "kin")
+
+model_registry.register(
+    "translation",
+    _load_translation_model,
+    warmup=_warmup_translation_model,
+    memory_mb=2400
+)
 
 class TranslationService:
     _instance = None
-    _model = None
-    _tokenizer = None
+    # src_lang is tokenizer state, so setting it and tokenizing happen together
+    _tokenizer_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    @property
-    def model(self):
-        if self._model is None:
-            self._model = AutoModelForSeq2SeqLM.from_pretrained(settings.TRANSLATION_MODEL)
-        return self._model
+    async def translate(self, text: str, source_lang: str = "eng", target_lang: str = "kin") -> str:
+        translations = await self.translate_batch([text], source_lang, target_lang)
+        return translations[0]
 
-    @property
-    def tokenizer(self):
-        if self._tokenizer is None:
-            self._tokenizer = AutoTokenizer.from_pretrained(settings.TRANSLATION_MODEL)
-        return self._tokenizer
+    async def translate_batch(
+        self, texts: List[str], source_lang: str = "eng", target_lang: str = "kin"
+    ) -> List[str]:
+        """Translate many documents at once, preserving input order"""
+        results = [""] * len(texts)
+        async for index, translated in self.translate_batch_stream(texts, source_lang, target_lang):
+            results[index] = translated
+        return results
+
+    async def translate_batch_stream(
+        self, texts: List[str], source_lang: str = "eng", target_lang: str = "kin"
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Yield ``(index, translation)`` for each document as soon as it is complete.
+
+        Documents are split into sentences; sentences already in the cache are
+        reused and the rest are deduplicated, sorted by length and translated
+        one length bucket per ``generate`` call.
+        """
+        self.check_languages(source_lang, target_lang)
+
+        documents = [segment_document(text) for text in texts]
+        document_keys = [
+            [self._cache_key(sentence, source_lang, target_lang) for sentence, _ in segments]
+            for segments in documents
+        ]
+
+        translated: Dict[str, str] = {}
+        if settings.TRANSLATION_CACHE_ENABLED:
+            translated = await translation_cache.get_many(k for keys in document_keys for k in keys)
+        missing: Dict[str, str] = {}
+        for segments, keys in zip(documents, document_keys):
+            for (sentence, _), key in zip(segments, keys):
+                if key not in translated and key not in missing:
+                    missing[key] = translation_cache.normalize(sentence)
+
+        pending = set(range(len(documents)))
+
+        def completed():
+            done = [i for i in sorted(pending) if all(k in translated for k in document_keys[i])]
+            for i in done:
+                pending.discard(i)
+                yield i, reassemble(documents[i], [translated[k] for k in document_keys[i]])
+
+        for item in completed():
+            yield item
+        if not missing:
+            return
 
-    async def translate(self, text: str, source_lang: str = "eng", target_lang: str = "kin") -> str:
         try:
-            inputs = self.tokenizer(text, return_tensors="pt", padding=True)
-            outputs = self.model.generate(**inputs)
-            translated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            return translated_text
+            for bucket in self._length_buckets(list(missing.items())):
+                # Held per call, so a slow reader of the stream doesn't pin the model
+                async with model_registry.use("translation") as loaded:
+                    outputs = await inference_pool.run(
+                        "translation",
+                        self._translate_sync,
+                        loaded,
+                        [sentence for _, sentence in bucket],
+                        source_lang,
+                        target_lang
+                    )
+                results = {key: output for (key, _), output in zip(bucket, outputs)}
+                translated.update(results)
+                if settings.TRANSLATION_CACHE_ENABLED:
+                    await translation_cache.set_many(results)
+                for item in completed():
+                    yield item
+        except HTTPException:
+            raise
         except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+    @staticmethod
+    def check_languages(*languages: str):
+        """Raise a 400 for any language the model has no NLLB code for"""
+        for lang in languages:
+            if lang not in NLLB_LANGUAGE_CODES:
+                raise HTTPException(status_code=400, detail=f"Unsupported language '{lang}'")
+
+    def _cache_key(self, sentence: str, source_lang: str, target_lang: str) -> str:
+        return translation_cache.make_key(
+            settings.TRANSLATION_MODEL,
+            source_lang,
+            target_lang,
+            sentence,
+            optimization_mode("translation")
+        )
+
+    def _length_buckets(self, sentences: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Group sentences of similar length so each batch carries little padding"""
+        buckets: List[List[Tuple[str, str]]] = []
+        current: List[Tuple[str, str]] = []
+        for item in sorted(sentences, key=lambda item: len(item[1])):
+            # Sorted ascending, so the newest sentence is the longest in the bucket
+            padded_chars = (len(current) + 1) * len(item[1])
+            if current and (
+                len(current) >= settings.TRANSLATION_BATCH_SIZE
+                or padded_chars > settings.TRANSLATION_BATCH_MAX_CHARS
+            ):
+                buckets.append(current)
+                current = []
+            current.append(item)
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def get_cache_stats(self) -> dict:
+        return translation_cache.stats()
+
+    def _translate_sync(
+        self, loaded, sentences: List[str], source_lang: str = "eng", target_lang: str = "kin"
+    ) -> List[str]:
+        tokenizer, model = loaded
+        with self._tokenizer_lock:
+            tokenizer.src_lang = NLLB_LANGUAGE_CODES[source_lang]
+            inputs = tokenizer(
+                sentences,
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=settings.TRANSLATION_MAX_INPUT_TOKENS
+            )
+        outputs = model.generate(
+            **inputs,
+            forced_bos_token_id=tokenizer.convert_tokens_to_ids(NLLB_LANGUAGE_CODES[target_lang])
+        )
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)
@@ -1,25 +1,110 @@
 from TTS.api import TTS
-from fastapi.responses import FileResponse
-import os
+from fastapi import HTTPException
+from app.core.audio_cache import audio_cache
+from app.core.executor import inference_pool
+from app.core.model_registry import model_registry
+from app.core.text import segment_document
+from typing import AsyncIterator, Tuple
+import asyncio
+import struct
+import wave
+
+TTS_MODEL_NAME = "tts_models/en/ljspeech/tacotron2-DDC"
+
+def _load_tts_model():
+    return TTS(model_name=TTS_MODEL_NAME)
+
+def _warmup_tts_model(model):
+    model.tts(text="Hello.")
+
+model_registry.register(
+    "tts",
+    _load_tts_model,
+    warmup=_warmup_tts_model,
+    memory_mb=400
+)
+
+def _streaming_wav_header(channels: int, sample_width: int, sample_rate: int) -> bytes:
+    """RIFF header for a WAV stream whose total length is not known yet"""
+    unknown_size = 0xFFFFFFFF
+    return b"".join([
+        b"RIFF", struct.pack("<I", unknown_size), b"WAVE",
+        b"fmt ", struct.pack(
+            "<IHHIIHH", 16, 1, channels, sample_rate,
+            sample_rate * channels * sample_width, channels * sample_width, sample_width * 8
+        ),
+        b"data", struct.pack("<I", unknown_size)
+    ])
+
+def _read_wav(path: str) -> Tuple[Tuple[int, int, int], bytes]:
+    """``((channels, sample_width, sample_rate), frames)`` of a WAV file"""
+    with wave.open(path, "rb") as wav:
+        params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        return params, wav.readframes(wav.getnframes())
 
 class TTSService:
-    def __init__(self):
-        self.model = TTS(model_name="tts_models/en/ljspeech/tacotron2-DDC")
-        
-    async def generate_speech(self, text, *args):
+    async def generate_speech(self, text, language: str = "en"):
         try:
-            # Generate speech from text
-            audio_path = "temp_audio.wav"
-            self.model.tts_to_file(text=text, file_path=audio_path)
+            # Identical text is synthesized once and then served from the cache
+            key = audio_cache.key(TTS_MODEL_NAME, language, text)
+            await audio_cache.get_or_create(key, lambda path: self._synthesize(text, path))
             
             # Return the audio file path
             return {
-                "audio_url": f"/audio/{os.path.basename(audio_path)}"
+                "audio_url": audio_cache.url_for(key)
             }
             
+        except HTTPException:
+            raise
         except Exception as e:
             raise Exception(f"Speech synthesis failed: {str(e)}")
+
+    async def stream_speech(self, text: str, language: str = "en") -> AsyncIterator[bytes]:
+        """Yield one WAV stream, a sentence at a time.
+
+        The first chunk carries the WAV header and the first sentence's audio.
+        While a sentence is being sent the next one is already synthesizing,
+        and each sentence goes through the audio cache on its own.
+        """
+        sentences = [sentence for sentence, _ in segment_document(text)]
+        if not sentences:
+            return
+
+        next_audio = asyncio.ensure_future(self._sentence_frames(sentences[0], language))
+        try:
+            for index in range(len(sentences)):
+                params, frames = await next_audio
+                if index + 1 < len(sentences):
+                    next_audio = asyncio.ensure_future(self._sentence_frames(sentences[index + 1], language))
+
+                if index == 0:
+                    yield _streaming_wav_header(*params) + frames
+                else:
+                    yield frames
         finally:
-            # Clean up the temporary file after sending
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
\ No newline at end of file
+            # Client went away: don't start the rest of the lesson. A sentence
+            # already synthesizing still finishes into the cache.
+            if not next_audio.done():
+                next_audio.cancel()
+
+    async def _sentence_frames(self, sentence: str, language: str) -> Tuple[Tuple[int, int, int], bytes]:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            path = await self._sentence_audio(sentence, language)
+            try:
+                return await loop.run_in_executor(None, _read_wav, path)
+            except FileNotFoundError:
+                # Evicted between the cache hit and the read; synthesize it again
+                if attempt:
+                    raise
+
+    async def _sentence_audio(self, sentence: str, language: str) -> str:
+        key = audio_cache.key(TTS_MODEL_NAME, language, sentence)
+        return await audio_cache.get_or_create(key, lambda path: self._synthesize(sentence, path))
+
+    async def _synthesize(self, text: str, file_path: str):
+        async with model_registry.use("tts") as model:
+            await inference_pool.run("tts", model.tts_to_file, text=text, file_path=file_path)
+
+    def get_cache_stats(self) -> dict:
+        return audio_cache.stats()
@@ -1,12 +1,11 @@
 from datetime import datetime
 from fastapi import HTTPException
-from app.core.database import Database
 from app.models.db_models import UserProgress, UserSession
 from bson import ObjectId
 
 class UserService:
-    def __init__(self):
-        self.db = Database.get_db()
+    def __init__(self, db):
+        self.db = db
 
     async def create_user_progress(self, user_id: str) -> UserProgress:
         user_progress = UserProgress(user_id=user_id)
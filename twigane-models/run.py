@@ -2,8 +2,7 @@ import uvicorn
 import logging
 import asyncio
 from app.main import app
-from app.services.translation_service import TranslationService
-from app.services.emotion_service import EmotionService
+from app.core.model_registry import model_registry
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -13,9 +12,9 @@ async def init_models():
     """Initialize ML models before server startup"""
     logger.info("Initializing ML models...")
     try:
-        # Initialize models in background
-        translation_service = TranslationService()
-        emotion_service = EmotionService()
+        # Load and warm up models through the registry
+        await model_registry.warmup("translation")
+        await model_registry.warmup("emotion")
         logger.info("ML models initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize models: {str(e)}")
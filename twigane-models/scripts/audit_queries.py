@@ -0,0 +1,192 @@
+"""Explain every service query against a local mongod and flag collection scans.
+
+The indexes from ``app/core/indexes.py`` are created in a scratch database,
+then each access path below is explained with the query planner. Any winning
+plan containing ``COLLSCAN`` is reported and the command exits with status 1,
+so it can gate CI. In-memory ``SORT`` stages are reported as warnings.
+
+When a service gains a new query, add its shape to ``QUERIES``.
+
+Usage (from the twigane-models directory):
+
+    python -m scripts.audit_queries
+    python -m scripts.audit_queries --url mongodb://localhost:27017 --db twigane_audit --keep
+"""
+import argparse
+import sys
+from typing import Dict, List, Set
+
+from bson import ObjectId
+from pymongo import MongoClient
+
+from app.core.indexes import INDEXES
+
+# Each entry mirrors one service query as a find, update or aggregate shape.
+# Collection scans are expected only where ``allow_collscan`` is set.
+QUERIES: List[Dict] = [
+    {"name": "AuthService.register uniqueness check", "collection": "users",
+     "find": {"filter": {"$or": [{"email": "learner@example.com"}, {"username": "learner"}]},
+              "projection": {"email": 1, "username": 1}, "limit": 1}},
+    {"name": "AuthService.login", "collection": "users",
+     "find": {"filter": {"email": "learner@example.com"}, "limit": 1}},
+    {"name": "NotificationService.get_user_notifications", "collection": "notifications",
+     "find": {"filter": {"user_id": "u1"}, "sort": {"created_at": -1}, "limit": 50}},
+    {"name": "NotificationService.get_user_notifications unread", "collection": "notifications",
+     "find": {"filter": {"user_id": "u1", "read": False}, "sort": {"created_at": -1}, "limit": 50}},
+    {"name": "NotificationService.mark_as_read", "collection": "notifications",
+     "update": {"q": {"_id": "n1", "user_id": "u1"}, "u": {"$set": {"read": True}}}},
+    {"name": "MobileService.get_offline_data", "collection": "mobile_sessions",
+     "find": {"filter": {"device_id": "d1"}, "limit": 1}},
+    {"name": "MobileService.update_push_token", "collection": "mobile_sessions",
+     "update": {"q": {"device_id": "d1"}, "u": {"$set": {"push_token": "t"}}}},
+    {"name": "ContentService.get_content_exercises", "collection": "exercises",
+     "find": {"filter": {"content_id": "c1"}}},
+    {"name": "ContentService.list_content subject", "collection": "learning_content",
+     "find": {"filter": {"subject": "math"}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content subject+grade", "collection": "learning_content",
+     "find": {"filter": {"subject": "math", "grade_level": "P4"}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content subject+difficulty", "collection": "learning_content",
+     "find": {"filter": {"subject": "math", "difficulty_level": "easy"}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content subject+grade+difficulty page 2", "collection": "learning_content",
+     "find": {"filter": {"subject": "math", "grade_level": "P4", "difficulty_level": "easy",
+                         "_id": {"$gt": ObjectId()}}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content grade", "collection": "learning_content",
+     "find": {"filter": {"grade_level": "P4"}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content grade+difficulty", "collection": "learning_content",
+     "find": {"filter": {"grade_level": "P4", "difficulty_level": "easy"}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content difficulty", "collection": "learning_content",
+     "find": {"filter": {"difficulty_level": "easy"}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.list_content unfiltered page 2", "collection": "learning_content",
+     "find": {"filter": {"_id": {"$gt": ObjectId()}}, "sort": {"_id": 1}, "limit": 21}},
+    {"name": "ContentService.stream_content", "collection": "learning_content",
+     "find": {"filter": {"grade_level": "P4"}, "sort": {"_id": 1}, "batchSize": 200}},
+    {"name": "UserService.get_session", "collection": "user_sessions",
+     "find": {"filter": {"user_id": "u1"}, "limit": 1}},
+    {"name": "ConversationStore.save", "collection": "user_sessions",
+     "update": {"q": {"user_id": "u1"}, "u": {"$set": {"chat_context_ids": []}}, "upsert": True}},
+    {"name": "AnalyticsService._study_pipeline", "collection": "content_interactions",
+     "aggregate": [{"$match": {"user_id": "u1", "created_at": {"$gte": ObjectId().generation_time}}},
+                   {"$group": {"_id": None, "sessions": {"$sum": 1}}}]},
+    {"name": "AnalyticsService._assessments_pipeline", "collection": "assessment_results",
+     "aggregate": [{"$match": {"user_id": "u1", "completed_at": {"$gte": ObjectId().generation_time}}},
+                   {"$group": {"_id": None, "average_score": {"$avg": "$score"}}}]},
+    {"name": "AnalyticsService._emotions_pipeline", "collection": "emotion_analyses",
+     "aggregate": [{"$match": {"user_id": "u1"}},
+                   {"$group": {"_id": "$dominant_emotion", "count": {"$sum": 1}}}]},
+    {"name": "AnalyticsService.generate_user_analytics", "collection": "user_analytics",
+     "update": {"q": {"user_id": "u1"}, "u": {"$set": {"learning_pace": "steady"}}, "upsert": True}},
+    {"name": "AnalyticsService.get_content_metrics", "collection": "content_metrics",
+     "find": {"filter": {"content_id": "c1"}, "limit": 1}},
+    {"name": "AnalyticsService.get_many_content_metrics", "collection": "content_metrics",
+     "find": {"filter": {"content_id": {"$in": ["c1", "c2"]}}}},
+    {"name": "ContentService.warm_cache", "collection": "content_metrics",
+     "find": {"filter": {}, "projection": {"content_id": 1}, "sort": {"total_views": -1}, "limit": 50}},
+    {"name": "AnalyticsService.recompute_content_metrics write", "collection": "content_metrics",
+     "update": {"q": {"content_id": "c1"}, "u": {"$set": {"total_views": 0}}, "upsert": True}},
+    {"name": "AnalyticsService.recompute_content_metrics one item", "collection": "content_interactions",
+     "find": {"filter": {"content_id": "c1"}}},
+    # The batch job reads every interaction once
+    {"name": "AnalyticsService.recompute_content_metrics all", "collection": "content_interactions",
+     "find": {"filter": {}}, "allow_collscan": True},
+    {"name": "UserService.get_progress", "collection": "user_progress",
+     "find": {"filter": {"user_id": "u1"}, "limit": 1}},
+    {"name": "AssessmentService.submit_assessment progress", "collection": "user_progress",
+     "update": {"q": {"user_id": "u1"}, "u": {"$inc": {"assessments_taken": 1}}}},
+    {"name": "AdaptiveService.update_progress", "collection": "progress",
+     "update": {"q": {"user_id": "u1"}, "u": {"$addToSet": {"completed_lesson_ids": "l1"}}, "upsert": True}},
+    {"name": "HistoryBuckets.append lessons", "collection": "lesson_history",
+     "update": {"q": {"user_id": "u1", "count": {"$lt": 200}}, "u": {"$inc": {"count": 1}}, "upsert": True}},
+    {"name": "HistoryBuckets.find lessons", "collection": "lesson_history",
+     "aggregate": [{"$match": {"user_id": "u1", "end": {"$gte": ObjectId().generation_time}}},
+                   {"$sort": {"start": -1}}, {"$unwind": "$events"}]},
+    {"name": "HistoryBuckets.append assessments", "collection": "assessment_history",
+     "update": {"q": {"user_id": "u1", "count": {"$lt": 200}}, "u": {"$inc": {"count": 1}}, "upsert": True}},
+    {"name": "HistoryBuckets.find assessments", "collection": "assessment_history",
+     "aggregate": [{"$match": {"user_id": "u1"}}, {"$sort": {"start": -1}}, {"$unwind": "$events"}]},
+    {"name": "AdaptiveService.get_learning_path", "collection": "learning_paths",
+     "find": {"filter": {"user_id": "u1"}, "limit": 1}},
+    {"name": "AdaptiveService._advance_learning_path", "collection": "lessons",
+     "find": {"filter": {"level": "beginner", "_id": {"$nin": ["l1"]}}, "sort": {"sequence": 1}, "limit": 3}},
+    {"name": "AdaptiveService.refresh_learning_path", "collection": "users",
+     "aggregate": [{"$match": {"_id": ObjectId()}},
+                   {"$merge": {"into": "learning_paths", "on": "user_id"}}]},
+    {"name": "I18nService.get_user_preferences", "collection": "accessibility_preferences",
+     "find": {"filter": {"user_id": "u1"}, "limit": 1}},
+    {"name": "I18nService.add_translation", "collection": "translations",
+     "update": {"q": {"language": "rw"}, "u": {"$set": {"translations.hello": "muraho"}}, "upsert": True}},
+    {"name": "I18nService._load_translations", "collection": "translations",
+     "find": {"filter": {}}, "allow_collscan": True},
+    {"name": "ProfileService.get_profile", "collection": "profiles",
+     "find": {"filter": {"user_id": "u1"}, "limit": 1}},
+]
+
+
+def explain_command(query: Dict) -> Dict:
+    collection = query["collection"]
+    if "find" in query:
+        return {"find": collection, **query["find"]}
+    if "update" in query:
+        return {"update": collection, "updates": [query["update"]]}
+    if "aggregate" in query:
+        return {"aggregate": collection, "pipeline": query["aggregate"], "cursor": {}}
+    raise ValueError(f"Query '{query['name']}' has no find, update or aggregate")
+
+
+def plan_stages(node, stages: Set[str]) -> Set[str]:
+    """Collect the stage names of every winning plan in an explain document"""
+    if isinstance(node, dict):
+        if isinstance(node.get("stage"), str):
+            stages.add(node["stage"])
+        for key, value in node.items():
+            if key != "rejectedPlans":
+                plan_stages(value, stages)
+    elif isinstance(node, list):
+        for item in node:
+            plan_stages(item, stages)
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="twigane_audit", help="Scratch database, dropped afterwards")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database")
+    args = parser.parse_args()
+
+    client = MongoClient(args.url, serverSelectionTimeoutMS=5000)
+    db = client[args.db]
+    try:
+        existing = set(db.list_collection_names())
+        for collection, models in INDEXES.items():
+            if collection not in existing:
+                db.create_collection(collection)
+            db[collection].create_indexes(models)
+
+        failures = 0
+        for query in QUERIES:
+            if query["collection"] not in INDEXES and query["collection"] not in existing:
+                db.create_collection(query["collection"])
+                existing.add(query["collection"])
+            plan = db.command("explain", explain_command(query), verbosity="queryPlanner")
+            stages = plan_stages(plan, set())
+
+            if "COLLSCAN" in stages and not query.get("allow_collscan"):
+                status = "COLLSCAN"
+                failures += 1
+            elif "SORT" in stages:
+                status = "warn: in-memory SORT"
+            else:
+                status = "ok"
+            print(f"{status:<22} {query['collection']:<26} {query['name']}  [{', '.join(sorted(stages))}]")
+
+        print(f"\n{len(QUERIES)} queries audited, {failures} collection scan(s)")
+    finally:
+        if not args.keep:
+            client.drop_database(args.db)
+        client.close()
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
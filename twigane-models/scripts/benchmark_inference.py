@@ -0,0 +1,203 @@
+"""Compare optimized CPU inference modes against the fp32 baseline.
+
+For each service the fp32 model and every requested optimized mode are
+loaded in turn and run over the same inputs. The report gives per-call
+latency, batched throughput, the memory added by loading the model and how
+often the optimized batched outputs agree with fp32. Memory is the RSS
+growth while loading, so modes measured later in the same process can read
+low.
+
+For the essay service a call is one segmented text line and the batch is
+the whole page through ``EssayService._transcribe``, which segments it and
+recognizes every line in batched ``generate`` calls; agreement compares the
+page's joined text.
+
+Usage (from the twigane-models directory):
+
+    python -m scripts.benchmark_inference --services translation emotion essay --modes int8 onnx
+    python -m scripts.benchmark_inference --services essay --image samples/essay_page.png --json report.json
+"""
+import argparse
+import difflib
+import gc
+import io
+import json
+import os
+import statistics
+import time
+from typing import Dict, List
+
+SENTENCES = [
+    "Welcome to today's lesson.",
+    "Please open your exercise book to page twelve.",
+    "The sun rises in the east and sets in the west.",
+    "Read the story and answer the questions that follow.",
+    "Water boils at one hundred degrees Celsius.",
+    "I am very happy because I passed my test.",
+    "This homework is too difficult and I feel frustrated.",
+    "Rwanda is a country in East Africa with many hills.",
+]
+
+
+def rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def image_bytes(image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def sample_page_bytes(path: str = None) -> bytes:
+    """A handwritten page from ``path``, or a synthetic page with one sentence per line"""
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    from PIL import Image, ImageDraw, ImageFont
+    font = ImageFont.load_default(size=28)
+    line_height = 64
+    image = Image.new("RGB", (1100, line_height * len(SENTENCES) + 40), "white")
+    draw = ImageDraw.Draw(image)
+    for i, sentence in enumerate(SENTENCES):
+        draw.text((20, 20 + i * line_height), sentence, fill="black", font=font)
+    return image_bytes(image)
+
+
+def build_service(name: str, mode: str, image_path: str = None):
+    """Return (single_call, batch_call, inputs) for a service loaded in ``mode``
+
+    ``batch_call(inputs)`` returns the outputs compared across modes.
+    """
+    if name == "translation":
+        from app.services.translation_service import TranslationService, _load_translation_model
+        loaded = _load_translation_model(mode)
+        service = TranslationService()
+        return (
+            lambda text: service._translate_sync(loaded, [text])[0],
+            lambda texts: service._translate_sync(loaded, texts),
+            SENTENCES,
+        )
+    if name == "emotion":
+        from app.services.emotion_service import _load_emotion_classifier
+        classifier = _load_emotion_classifier(mode)
+        top = lambda scores: max(scores, key=lambda s: s["score"])
+        return (
+            lambda text: top(classifier([text])[0]),
+            lambda texts: [top(s) for s in classifier(texts, batch_size=len(texts))],
+            SENTENCES,
+        )
+    if name == "essay":
+        from PIL import Image
+        from app.services.essay_service import EssayService, _load_ocr_model, segment_lines
+        loaded = _load_ocr_model(mode)
+        service = EssayService()
+        page = sample_page_bytes(image_path)
+        lines = [image_bytes(line) for line in segment_lines(Image.open(io.BytesIO(page)).convert("RGB"))]
+        return (
+            lambda line: " ".join(service._transcribe(loaded, line)),
+            lambda _: ["\n".join(service._transcribe(loaded, page))],
+            lines,
+        )
+    raise ValueError(f"Unknown service '{name}'")
+
+
+def agreement(name: str, baseline: List, outputs: List) -> Dict[str, float]:
+    if name == "emotion":
+        labels = sum(b["label"] == o["label"] for b, o in zip(baseline, outputs)) / len(baseline)
+        score_diff = statistics.mean(abs(b["score"] - o["score"]) for b, o in zip(baseline, outputs))
+        return {"label_agreement": labels, "mean_score_diff": score_diff}
+    exact = sum(b == o for b, o in zip(baseline, outputs)) / len(baseline)
+    similar = statistics.mean(similarity(b, o) for b, o in zip(baseline, outputs))
+    return {"exact_match": exact, "mean_similarity": similar}
+
+
+def run_mode(name: str, mode: str, runs: int, image_path: str = None) -> dict:
+    gc.collect()
+    before = rss_mb()
+    started = time.perf_counter()
+    single, batch, inputs = build_service(name, mode, image_path)
+    load_seconds = time.perf_counter() - started
+    memory = rss_mb() - before
+
+    for item in inputs:  # warmup
+        single(item)
+    latencies = []
+    for i in range(runs):
+        item = inputs[i % len(inputs)]
+        t0 = time.perf_counter()
+        single(item)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    outputs = batch(inputs)
+    batch_seconds = time.perf_counter() - t0
+
+    del single, batch
+    gc.collect()
+    return {
+        "mode": mode,
+        "load_seconds": round(load_seconds, 2),
+        "memory_mb": round(memory, 1),
+        "latency_p50_ms": round(percentile(latencies, 50), 1),
+        "latency_p95_ms": round(percentile(latencies, 95), 1),
+        "throughput_per_s": round(len(inputs) / batch_seconds, 2),
+        "outputs": outputs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", nargs="+", default=["translation", "emotion", "essay"])
+    parser.add_argument("--modes", nargs="+", default=["int8", "onnx"])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--image", help="Handwritten page image for the essay service")
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.services:
+        results = [run_mode(name, "fp32", args.runs, args.image)]
+        for mode in args.modes:
+            try:
+                results.append(run_mode(name, mode, args.runs, args.image))
+            except Exception as e:
+                results.append({"mode": mode, "error": str(e)})
+
+        baseline = results[0]["outputs"]
+        for result in results:
+            if "outputs" in result:
+                result["agreement"] = agreement(name, baseline, result.pop("outputs"))
+        report[name] = results
+
+        print(f"\n== {name}")
+        print(f"{'mode':<6} {'load s':>7} {'mem MB':>8} {'p50 ms':>8} {'p95 ms':>8} {'items/s':>8}  agreement")
+        for r in results:
+            if "error" in r:
+                print(f"{r['mode']:<6} failed: {r['error']}")
+                continue
+            agree = ", ".join(f"{k}={v:.3f}" for k, v in r["agreement"].items())
+            print(f"{r['mode']:<6} {r['load_seconds']:>7} {r['memory_mb']:>8} {r['latency_p50_ms']:>8} "
+                  f"{r['latency_p95_ms']:>8} {r['throughput_per_s']:>8}  {agree}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
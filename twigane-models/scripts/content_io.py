@@ -0,0 +1,69 @@
+"""Bulk import and export learning content and exercises as NDJSON.
+
+Export writes one JSON object per line, including its ``id``; import reads
+the same format, validates each record and inserts in unordered chunks, so
+an export from one environment can be imported into another. Failed rows
+are printed with their line numbers and the rest are still inserted.
+
+Usage (from the twigane-models directory):
+
+    python -m scripts.content_io export content lessons.ndjson
+    python -m scripts.content_io export exercises exercises.ndjson
+    python -m scripts.content_io import content lessons.ndjson --created-by <user id>
+    python -m scripts.content_io import exercises exercises.ndjson
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.core.database import Database
+from app.core.ndjson import encode
+from app.services.content_service import BULK_KINDS, ContentService
+
+
+async def file_lines(path: str):
+    with open(path, "rb") as f:
+        for line in f:
+            yield line
+
+
+async def export(service: ContentService, kind: str, path: str) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        async for doc in service.export_records(kind):
+            f.write(encode(doc))
+            count += 1
+    print(f"Exported {count} {kind} records to {path}")
+    return 0
+
+
+async def import_(service: ContentService, kind: str, path: str, created_by: str, chunk_size: int) -> int:
+    report = await service.import_records(kind, file_lines(path), created_by, chunk_size)
+    for error in report.errors:
+        print(f"line {error['line']}: {error['detail']}", file=sys.stderr)
+    print(f"Imported {report.inserted} {kind} records, {report.failed} failed")
+    return 1 if report.failed else 0
+
+
+async def main(args) -> int:
+    db = await Database.get_db()
+    try:
+        service = ContentService(db)
+        if args.command == "export":
+            return await export(service, args.kind, args.path)
+        return await import_(service, args.kind, args.path, args.created_by, args.chunk_size)
+    finally:
+        await Database.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("kind", choices=list(BULK_KINDS))
+    parser.add_argument("path", help="NDJSON file to read or write")
+    parser.add_argument("--created-by", default="import", help="created_by for content records without one")
+    parser.add_argument("--chunk-size", type=int, default=settings.CONTENT_IMPORT_CHUNK_SIZE,
+                        help="Records validated and inserted per chunk")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,131 @@
+"""Measure how a burst of logins affects unrelated requests.
+
+Against a running server, an unrelated endpoint is probed on its own for a
+baseline, then again while many concurrent logins are in flight. The report
+gives the probe's p50/p95/p99 latency for both phases together with login
+latency and throughput. When bcrypt runs on the event loop, the probe's p99
+during the storm grows to several times the bcrypt cost; with hashing on
+``hashing_pool`` it should stay close to the baseline.
+
+A throwaway account is registered unless ``--email``/``--password`` are given.
+
+Usage (from the twigane-models directory, with the API running):
+
+    python -m scripts.login_storm --url http://localhost:8000 --logins 300 --concurrency 60
+    python -m scripts.login_storm --probe /api/system/db/pool --json storm.json
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+from scripts.benchmark_inference import percentile
+
+
+def summarize(latencies_ms: List[float]) -> Dict[str, float]:
+    if not latencies_ms:
+        return {"count": 0}
+    return {
+        "count": len(latencies_ms),
+        "p50_ms": round(percentile(latencies_ms, 50), 1),
+        "p95_ms": round(percentile(latencies_ms, 95), 1),
+        "p99_ms": round(percentile(latencies_ms, 99), 1),
+        "max_ms": round(max(latencies_ms), 1),
+    }
+
+
+async def timed(client: httpx.AsyncClient, method: str, path: str, **kwargs):
+    started = time.perf_counter()
+    response = await client.request(method, path, **kwargs)
+    return (time.perf_counter() - started) * 1000, response
+
+
+async def probe(client: httpx.AsyncClient, path: str, interval: float, stop: asyncio.Event) -> List[float]:
+    latencies = []
+    while not stop.is_set():
+        elapsed, _ = await timed(client, "GET", path)
+        latencies.append(elapsed)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def ensure_account(client: httpx.AsyncClient, email: str, password: str):
+    if email:
+        return email, password
+    suffix = uuid.uuid4().hex[:10]
+    email, password = f"storm-{suffix}@example.com", f"storm-{suffix}"
+    response = await client.post("/api/auth/register", json={
+        "email": email, "username": f"storm-{suffix}", "password": password, "full_name": "Login Storm"
+    })
+    response.raise_for_status()
+    return email, password
+
+
+async def storm(client: httpx.AsyncClient, credentials: dict, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def login():
+        async with semaphore:
+            elapsed, response = await timed(client, "POST", "/api/auth/login", json=credentials)
+            latencies.append(elapsed)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def main(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        email, password = await ensure_account(client, args.email, args.password)
+        credentials = {"email": email, "password": password}
+
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, args.probe, args.probe_interval, stop))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        storm_probe = asyncio.create_task(probe(client, args.probe, args.probe_interval, stop))
+        login_latencies, statuses, duration = await storm(client, credentials, args.logins, args.concurrency)
+        stop.set()
+        during = await storm_probe
+
+    return {
+        "probe": args.probe,
+        "baseline": summarize(baseline),
+        "during_logins": summarize(during),
+        "logins": {
+            **summarize(login_latencies),
+            "concurrency": args.concurrency,
+            "per_second": round(len(login_latencies) / duration, 1),
+            "statuses": statuses,
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=200, help="Total login requests")
+    parser.add_argument("--concurrency", type=int, default=50, help="Logins in flight at once")
+    parser.add_argument("--probe", default="/api/system/db/pool", help="Unrelated endpoint to time")
+    parser.add_argument("--probe-interval", type=float, default=0.02, help="Seconds between probe requests")
+    parser.add_argument("--baseline-seconds", type=float, default=5)
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,76 @@
+"""Move embedded history arrays into the bucketed history collections.
+
+``progress.completed_lessons`` and ``user_progress.assessment_history`` used
+to grow without bound. For each document that still has one of them, the
+entries are written to ``lesson_history`` / ``assessment_history`` buckets,
+the summary fields are filled in and the array is removed. Documents are
+migrated one at a time, so the command can be stopped and re-run; a document
+interrupted between the two writes would have its entries copied twice.
+
+Usage (from the twigane-models directory):
+
+    python -m scripts.migrate_history
+    python -m scripts.migrate_history --dry-run
+"""
+import argparse
+import asyncio
+
+from app.core.database import Database
+from app.services.adaptive_service import lesson_history
+from app.services.assessment_service import assessment_history
+
+
+async def migrate_lessons(db, dry_run: bool) -> int:
+    migrated = 0
+    async for doc in db.progress.find({"completed_lessons": {"$exists": True}}):
+        lessons = sorted(doc["completed_lessons"], key=lambda e: e["completed_at"])
+        if not dry_run:
+            await lesson_history.append_many(db, doc["user_id"], lessons)
+            update = {"$unset": {"completed_lessons": ""}}
+            if lessons:
+                update["$set"] = {"last_lesson": lessons[-1]}
+                update["$addToSet"] = {"completed_lesson_ids": {"$each": list({e["lesson_id"] for e in lessons})}}
+                update["$inc"] = {"lessons_completed": len(lessons)}
+            await db.progress.update_one({"_id": doc["_id"]}, update)
+        migrated += 1
+    return migrated
+
+
+async def migrate_assessments(db, dry_run: bool) -> int:
+    migrated = 0
+    async for doc in db.user_progress.find({"assessment_history": {"$exists": True}}):
+        attempts = sorted(doc["assessment_history"], key=lambda e: e["completed_at"])
+        if not dry_run:
+            await assessment_history.append_many(db, doc["user_id"], attempts)
+            update = {
+                "$unset": {"assessment_history": ""},
+                "$inc": {
+                    "assessments_taken": len(attempts),
+                    "assessment_score_total": sum(e["score"] for e in attempts)
+                }
+            }
+            # completed_assessments used to be overwritten with a single id
+            completed = doc.get("completed_assessments")
+            if isinstance(completed, str):
+                update["$set"] = {"completed_assessments": [completed]}
+            await db.user_progress.update_one({"_id": doc["_id"]}, update)
+        migrated += 1
+    return migrated
+
+
+async def main(dry_run: bool):
+    db = await Database.get_db()
+    try:
+        lessons = await migrate_lessons(db, dry_run)
+        assessments = await migrate_assessments(db, dry_run)
+        action = "Would migrate" if dry_run else "Migrated"
+        print(f"{action} {lessons} progress and {assessments} user_progress documents")
+    finally:
+        await Database.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Count documents without changing them")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,35 @@
+"""Recompute content_metrics for every content item from content_interactions.
+
+Run it on a schedule (for example nightly from cron); the API serves the
+stored metrics, and each document's ``computed_at`` says how fresh it is.
+
+Usage (from the twigane-models directory):
+
+    python -m scripts.recompute_content_metrics
+    python -m scripts.recompute_content_metrics --chunk-size 20000
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.database import Database
+from app.services.analytics_service import AnalyticsService
+
+
+async def main(chunk_size: int):
+    db = await Database.get_db()
+    try:
+        started = time.perf_counter()
+        written = await AnalyticsService(db).recompute_content_metrics(chunk_size=chunk_size)
+        print(f"Wrote metrics for {written} content items in {time.perf_counter() - started:.1f}s")
+    finally:
+        await Database.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=settings.CONTENT_METRICS_CHUNK_SIZE,
+                        help="Interactions loaded per chunk")
+    args = parser.parse_args()
+    asyncio.run(main(args.chunk_size))
@@ -0,0 +1,228 @@
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.core import database
+from app.core.cache import ReadThroughCache
+
+OPERATORS = {
+    "$gt": lambda value, arg: value is not None and value > arg,
+    "$gte": lambda value, arg: value is not None and value >= arg,
+    "$lt": lambda value, arg: value is not None and value < arg,
+    "$lte": lambda value, arg: value is not None and value <= arg,
+    "$in": lambda value, arg: value in arg,
+    "$nin": lambda value, arg: value not in arg,
+    "$ne": lambda value, arg: value != arg,
+}
+
+def matches(doc: dict, query: dict) -> bool:
+    """The subset of MongoDB query syntax the services use"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(op in OPERATORS for op in condition):
+            if not all(OPERATORS[op](doc.get(key), arg) for op, arg in condition.items()):
+                return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+def project(doc: dict, projection) -> dict:
+    if not projection:
+        return dict(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    if any(projection.get(field) for field in projection if field != "_id"):
+        fields = {field for field, keep in projection.items() if keep} | {"_id"}
+        if projection.get("_id") == 0:
+            fields.discard("_id")
+        return {k: v for k, v in doc.items() if k in fields}
+    return {k: v for k, v in doc.items() if projection.get(k, 1)}
+
+class Result:
+    def __init__(self, ids=(), matched=1):
+        self.inserted_ids = list(ids)
+        self.inserted_id = self.inserted_ids[0] if self.inserted_ids else None
+        self.modified_count = 1
+        self.matched_count = matched
+        self.upserted_count = 0
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=1):
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def batch_size(self, n):
+        return self
+
+    async def to_list(self, length=None):
+        """Like Motor, each call returns the next ``length`` documents"""
+        batch = self.docs[:length] if length else list(self.docs)
+        self.docs = self.docs[len(batch):]
+        return batch
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+class FakeCollection:
+    """In-memory stand-in for a Motor collection.
+
+    Queries run against ``docs``; ``aggregate`` returns ``aggregate_result``.
+    Every call is recorded in ``calls``, the size and ``ordered`` flag of
+    each ``insert_many`` and ``bulk_write`` in ``batches`` and ``ordered``,
+    and the ``session`` of each write in ``sessions``.
+    """
+
+    def __init__(self, docs=None, aggregate_result=None):
+        self.docs = list(docs or [])
+        self.aggregate_result = aggregate_result or []
+        self.calls = []
+        self.batches = []
+        self.ordered = []
+        self.sessions = []
+        self.pipelines = []
+        self.updates = []
+
+    def find(self, query=None, projection=None):
+        self.calls.append("find")
+        return FakeCursor([project(doc, projection) for doc in self.docs if matches(doc, query or {})])
+
+    async def find_one(self, query=None, projection=None, session=None):
+        self.calls.append("find_one")
+        for doc in self.docs:
+            if matches(doc, query or {}):
+                return project(doc, projection)
+        return None
+
+    def aggregate(self, pipeline):
+        self.calls.append("aggregate")
+        self.pipelines.append(pipeline)
+        return FakeCursor(list(self.aggregate_result))
+
+    async def insert_one(self, doc, session=None):
+        self.calls.append("insert_one")
+        self.sessions.append(session)
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(doc)
+        return Result([doc["_id"]])
+
+    async def insert_many(self, docs, ordered=True, session=None):
+        """Inserts ``docs``; duplicate ids fail like an unordered bulk insert"""
+        self.calls.append("insert_many")
+        self.batches.append(len(docs))
+        self.ordered.append(ordered)
+        self.sessions.append(session)
+        existing = {doc["_id"] for doc in self.docs}
+        errors = []
+        for index, doc in enumerate(docs):
+            doc.setdefault("_id", ObjectId())
+            if doc["_id"] in existing:
+                errors.append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key"})
+                continue
+            existing.add(doc["_id"])
+            self.docs.append(doc)
+        if errors:
+            raise BulkWriteError({"nInserted": len(docs) - len(errors), "writeErrors": errors})
+        return Result([doc["_id"] for doc in docs])
+
+    async def update_one(self, query, update, upsert=False, session=None):
+        self.calls.append("update_one")
+        self.sessions.append(session)
+        self.updates.append((query, update))
+        return Result()
+
+    async def bulk_write(self, requests, ordered=True, session=None):
+        self.calls.append("bulk_write")
+        self.batches.append(len(requests))
+        self.ordered.append(ordered)
+        self.sessions.append(session)
+        return Result(matched=len(requests))
+
+class FakeAdmin:
+    def __init__(self, replica_set: bool):
+        self.replica_set = replica_set
+
+    async def command(self, name):
+        hello = {"isWritablePrimary": True}
+        if self.replica_set:
+            hello["setName"] = "rs0"
+        return hello
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def start_transaction(self):
+        return FakeTransaction(self)
+
+class FakeTransaction:
+    def __init__(self, session: FakeSession):
+        self.session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *exc):
+        self.session.committed = exc_type is None
+        return False
+
+class FakeClient:
+    def __init__(self, replica_set: bool = False):
+        self.admin = FakeAdmin(replica_set)
+        self.sessions = []
+
+    async def start_session(self):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+class FakeDb:
+    """Database whose collections are created on first access, as in Motor"""
+
+    def __init__(self, replica_set: bool = False):
+        self.client = FakeClient(replica_set)
+        self._collections = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name):
+        if name not in self._collections:
+            self._collections[name] = FakeCollection()
+        return self._collections[name]
+
+@pytest.fixture
+def fake_db():
+    return FakeDb()
+
+@pytest.fixture
+def replica_set_db():
+    """A database on a replica set, where ``transaction()`` opens a session"""
+    return FakeDb(replica_set=True)
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Module-level caches would otherwise carry documents between tests"""
+    for cache in ReadThroughCache.registry.values():
+        cache.clear()
+    database._transactions_supported.clear()
+    yield
@@ -0,0 +1,41 @@
+import json
+import pytest
+from starlette.datastructures import Headers
+from app.middleware.accessibility import (
+    AccessibleJSONResponse, ResponseTransform, preferred_language, response_transform
+)
+from app.services.i18n_service import I18nService
+
+BODY = {"title": {"rw": "Isomo", "en": "Lesson"}, "_meta": {"v": 1}, "items": [{"hint": {"rw": "a", "en": None}}]}
+
+def test_response_is_transformed_while_rendering():
+    token = response_transform.set(ResponseTransform(simplify=True, lang="en"))
+    try:
+        body = json.loads(AccessibleJSONResponse(BODY).body)
+    finally:
+        response_transform.reset(token)
+    assert body == {"title": "Lesson", "items": [{"hint": "a"}]}
+
+    # Without a transform for the request the content is rendered as is
+    assert json.loads(AccessibleJSONResponse(BODY).body) == BODY
+
+def test_preferred_language_falls_back_to_kinyarwanda():
+    assert preferred_language(Headers({"Accept-Language": "en-GB,en;q=0.8"})) == "en"
+    assert preferred_language(Headers({"Accept-Language": "fr"})) == "rw"
+    assert preferred_language(Headers({})) == "rw"
+
+@pytest.mark.asyncio
+async def test_preferences_are_cached_until_updated(fake_db):
+    fake_db.accessibility_preferences.docs = [{"user_id": "u1", "simplified_ui": True}]
+    service = I18nService(fake_db)
+    reads = lambda: fake_db.accessibility_preferences.calls.count("find_one")
+
+    assert (await service.get_user_preferences("u1")).simplified_ui
+    await service.get_user_preferences("u1")
+    assert reads() == 1
+
+    preferences = await service.get_user_preferences("u1")
+    preferences.simplified_ui = False
+    await service.update_user_preferences("u1", preferences)
+    await service.get_user_preferences("u1")
+    assert reads() == 2
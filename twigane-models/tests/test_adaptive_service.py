@@ -0,0 +1,47 @@
+import pytest
+from fastapi import HTTPException
+from app.services.adaptive_service import AdaptiveService
+
+@pytest.mark.asyncio
+async def test_materialized_path_is_a_single_read(fake_db):
+    path = {"current_level": "beginner", "recommended_topics": [], "next_lessons": []}
+    fake_db.learning_paths.docs = [{"user_id": "u1", **path}]
+    assert await AdaptiveService(fake_db).get_learning_path("u1") == path
+    assert fake_db.learning_paths.calls == ["find_one"]
+    assert fake_db.users.pipelines == []
+
+@pytest.mark.asyncio
+async def test_missing_path_is_computed_into_learning_paths(fake_db):
+    with pytest.raises(HTTPException) as error:
+        await AdaptiveService(fake_db).get_learning_path("unknown")
+    assert error.value.status_code == 404
+    assert fake_db.users.pipelines[0][-1]["$merge"]["into"] == "learning_paths"
+
+def lesson(lesson_id, sequence):
+    return {"_id": lesson_id, "level": "beginner", "sequence": sequence}
+
+@pytest.mark.asyncio
+async def test_completed_lesson_is_replaced_without_rebuilding_the_path(fake_db):
+    fake_db.learning_paths.docs = [{
+        "user_id": "u1", "current_level": "beginner",
+        "recommended_topics": [], "next_lessons": [lesson("l1", 1), lesson("l2", 2), lesson("l3", 3)]
+    }]
+    fake_db.progress.docs = [{"user_id": "u1", "completed_lesson_ids": ["l0", "l1"]}]
+    fake_db.lessons.docs = [lesson(f"l{i}", i) for i in range(6)]
+
+    await AdaptiveService(fake_db).update_progress("u1", "l1", {"quiz": 0.3})
+
+    assert fake_db.users.pipelines == []
+    query, update = fake_db.learning_paths.updates[0]
+    assert query == {"user_id": "u1"}
+    assert [l["_id"] for l in update["$set"]["next_lessons"]] == ["l2", "l3", "l4"]
+    assert update["$pull"] == {"recommended_topics": {"_id": "l1"}}
+
+@pytest.mark.asyncio
+async def test_level_change_rebuilds_the_path(fake_db):
+    fake_db.learning_paths.docs = [{"user_id": "u1", "current_level": "beginner", "next_lessons": []}]
+
+    await AdaptiveService(fake_db).update_progress("u1", "l1", {"quiz": 0.9})
+
+    assert fake_db.users.pipelines[0][-1]["$merge"]["into"] == "learning_paths"
+    assert fake_db.learning_paths.updates == []
@@ -0,0 +1,83 @@
+import pytest
+from datetime import datetime, timedelta
+from app.services import analytics_service
+from app.services.analytics_service import AnalyticsService, metrics_documents, summarise_interactions
+
+@pytest.fixture
+def db(fake_db):
+    started = datetime.utcnow() - timedelta(days=14)
+    fake_db.content_interactions.aggregate_result = [{
+        "totals": [{"sessions": 6, "minutes": 95.5, "first": started}],
+        "active_days": [{"days": 6}]
+    }]
+    fake_db.assessment_results.aggregate_result = [
+        {"attempts": 4, "average_score": 72.5, "passed": 3, "first": started}
+    ]
+    fake_db.emotion_analyses.aggregate_result = [{"_id": "joy", "count": 3}, {"_id": None, "count": 1}]
+    return fake_db
+
+@pytest.mark.asyncio
+async def test_user_analytics_come_from_server_side_summaries(db):
+    analytics = await AnalyticsService(db).generate_user_analytics("u1")
+
+    assert analytics.total_study_time == 95
+    assert analytics.completion_rate == 0.75
+    assert analytics.emotional_states == {"joy": 3}
+    assert analytics.engagement_level == "medium"
+    assert analytics.learning_pace == "steady"
+    # Each collection is reduced to one summary inside MongoDB
+    assert "$facet" in db.content_interactions.pipelines[0][-1]
+    assert "$group" in db.assessment_results.pipelines[0][-1]
+    assert db.user_analytics.updates[0][0] == {"user_id": "u1"}
+
+@pytest.mark.asyncio
+async def test_progress_report_matches_the_period(db):
+    report = await AnalyticsService(db).generate_progress_report("u1", "weekly")
+
+    current, overall = db.assessment_results.pipelines
+    assert "$gte" in current[0]["$match"]["completed_at"]
+    assert "completed_at" not in overall[0]["$match"]
+    assert report.metrics["pass_rate"] == 0.75
+
+def test_study_time_comes_from_interactions():
+    totals = AnalyticsService(None)._study_pipeline("u1", None)[-1]["$facet"]["totals"][0]["$group"]
+    assert "$time_spent" in str(totals["minutes"])
+
+def test_chunked_content_metrics_match_a_single_pass():
+    interactions = [
+        {"content_id": "c1", "time_spent": 120, "completed": True, "difficulty_rating": 2, "dominant_emotion": "joy"},
+        {"content_id": "c1", "time_spent": 60, "completed": False, "difficulty_rating": 4, "dominant_emotion": "joy"},
+        {"content_id": "c2", "time_spent": 30, "completed": True, "accessibility_rating": 0.5},
+        {"content_id": "c1", "completed": True, "dominant_emotion": "fear"},
+    ]
+    computed_at = datetime.utcnow()
+    single = metrics_documents(summarise_interactions(interactions), computed_at)
+    chunked = metrics_documents(
+        summarise_interactions(interactions[:2]).add(summarise_interactions(interactions[2:]), fill_value=0),
+        computed_at
+    )
+
+    assert chunked == single
+    c1, c2 = sorted(single, key=lambda m: m["content_id"])
+    assert c1["total_views"] == 3
+    assert c1["average_completion_time"] == 90.0
+    assert c1["success_rate"] == pytest.approx(2 / 3)
+    assert c1["emotional_responses"] == {"joy": 2, "fear": 1}
+    assert c2["accessibility_score"] == 0.5
+    assert c2["emotional_responses"] == {}
+    assert c2["computed_at"] == computed_at
+
+@pytest.mark.asyncio
+async def test_recompute_runs_in_the_background_once_at_a_time(fake_db):
+    fake_db.content_interactions.docs = [
+        {"content_id": "c1", "user_id": "u1", "time_spent": 60, "completed": True},
+        {"content_id": "c2", "user_id": "u1", "time_spent": 30, "completed": False},
+    ]
+    service = AnalyticsService(fake_db)
+
+    assert service.start_content_metrics_recompute()
+    assert not service.start_content_metrics_recompute()
+    assert await analytics_service._recompute_task == 2
+    assert fake_db.content_metrics.batches == [2]
+    assert service.start_content_metrics_recompute()
+    await analytics_service._recompute_task
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime
+from bson import ObjectId
+from app.models.assessment_models import AssessmentSubmission
+from app.services.assessment_service import AssessmentService
+
+ASSESSMENT_ID = str(ObjectId())
+
+def seed(db):
+    now = datetime.utcnow()
+    db.assessments.docs = [{
+        "_id": ObjectId(ASSESSMENT_ID),
+        "title_rw": "Isuzuma", "title_en": None, "description_rw": "", "description_en": None,
+        "content_id": "c1", "time_limit": 10, "passing_score": 50, "difficulty_level": "easy",
+        "questions": [{"correct_answer": "a"}, {"correct_answer": "b"}],
+        "created_at": now, "updated_at": now
+    }]
+    return db
+
+@pytest.fixture
+def db(fake_db):
+    return seed(fake_db)
+
+@pytest.mark.asyncio
+async def test_submit_reads_the_assessment_once(db):
+    result = await AssessmentService(db).submit_assessment(
+        "u1", ASSESSMENT_ID, {"answers": [{"answer": "a"}, {"answer": "c"}], "time_taken": 30}
+    )
+    assert result.score == 50
+    # 50 is below the default mastery threshold but meets this assessment's passing_score
+    assert result.passed and db.assessment_results.docs[0]["passed"]
+    assert db.assessments.calls.count("find_one") == 1
+    assert db.user_progress.calls == ["update_one"]
+    # A standalone server has no transactions
+    assert db.client.sessions == []
+
+@pytest.mark.asyncio
+async def test_submit_on_a_replica_set_writes_in_one_transaction(replica_set_db):
+    db = seed(replica_set_db)
+    await AssessmentService(db).submit_assessment(
+        "u1", ASSESSMENT_ID, {"answers": [{"answer": "a"}, {"answer": "b"}], "time_taken": 30}
+    )
+
+    session, = db.client.sessions
+    assert session.committed
+    assert db.assessment_results.sessions == [session]
+    assert db.user_progress.sessions == [session]
+    assert db.assessment_history.sessions == [session]
+
+@pytest.mark.asyncio
+async def test_bulk_submit_writes_each_collection_once(db):
+    answers = [{"answer": "a"}, {"answer": "b"}]
+    submissions = [
+        AssessmentSubmission(assessment_id=ASSESSMENT_ID, answers=answers, time_taken=20, user_id=f"u{i}")
+        for i in range(30)
+    ] + [AssessmentSubmission(assessment_id="missing", answers=answers, time_taken=20, user_id="u1")]
+
+    outcome = await AssessmentService(db).submit_many(submissions)
+
+    assert outcome.submitted == 30
+    assert outcome.errors == [{"index": 30, "detail": "Assessment not found"}]
+    assert db.assessment_results.calls == ["insert_many"]
+    assert db.user_progress.calls == ["bulk_write"]
+    assert db.user_progress.batches == [30]
+    assert db.assessment_history.calls == ["bulk_write"]
+    assert db.assessment_history.batches == [30]
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import threading
+import pytest
+from app.core.audio_cache import AudioCache
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_synthesize_once(tmp_path):
+    cache = AudioCache(str(tmp_path), "/audio", max_bytes=10_000)
+    calls = []
+
+    async def synthesize(path):
+        calls.append(path)
+        await asyncio.sleep(0.01)
+        with open(path, "wb") as f:
+            f.write(b"RIFF" + b"\0" * 96)
+
+    key = cache.key("tacotron2", "en", "Muraho")
+    paths = await asyncio.gather(*(cache.get_or_create(key, synthesize) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert set(paths) == {cache.path_for(key)}
+    assert os.listdir(tmp_path) == [f"{key}.wav"]
+    assert cache.url_for(key) == f"/audio/{key}.wav"
+    assert cache.stats()["hits"] == 4
+
+@pytest.mark.asyncio
+async def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = AudioCache(str(tmp_path), "/audio", max_bytes=250)
+
+    def writer(size):
+        async def synthesize(path):
+            with open(path, "wb") as f:
+                f.write(b"\0" * size)
+        return synthesize
+
+    keys = [cache.key("m", "en", str(i)) for i in range(3)]
+    await cache.get_or_create(keys[0], writer(100))
+    await cache.get_or_create(keys[1], writer(100))
+    os.utime(cache.path_for(keys[0]), (0, 0))
+    await cache.get_or_create(keys[2], writer(100))
+
+    assert not os.path.exists(cache.path_for(keys[0]))
+    assert os.path.exists(cache.path_for(keys[2]))
+    assert cache.stats()["evictions"] == 1
+
+@pytest.mark.asyncio
+async def test_failed_synthesis_leaves_no_files(tmp_path):
+    cache = AudioCache(str(tmp_path), "/audio", max_bytes=1000)
+
+    async def synthesize(path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise RuntimeError("vocoder failed")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_create(cache.key("m", "en", "x"), synthesize)
+    assert os.listdir(tmp_path) == []
+
+@pytest.mark.asyncio
+async def test_cancelled_request_lets_the_synthesis_finish(tmp_path):
+    cache = AudioCache(str(tmp_path), "/audio", max_bytes=1000)
+    started = asyncio.Event()
+    finish = asyncio.Event()
+
+    async def synthesize(path):
+        with open(path, "wb") as f:
+            f.write(b"RIFF")
+            started.set()
+            await finish.wait()
+            f.write(b"\0" * 96)
+
+    key = cache.key("m", "en", "prefetched")
+    request = asyncio.ensure_future(cache.get_or_create(key, synthesize))
+    await started.wait()
+    request.cancel()
+    await asyncio.sleep(0)
+    # The temporary file is still being written, so it must not be removed
+    assert len(os.listdir(tmp_path)) == 1
+
+    finish.set()
+    while cache.stats()["in_flight"]:
+        await asyncio.sleep(0.001)
+    assert os.listdir(tmp_path) == [f"{key}.wav"]
+    assert os.path.getsize(cache.path_for(key)) == 100
+
+@pytest.mark.asyncio
+async def test_eviction_sweeps_stale_temporary_files(tmp_path):
+    cache = AudioCache(str(tmp_path), "/audio", max_bytes=150)
+    key = cache.key("m", "en", "x")
+    stale = tmp_path / f"{key}.{'0' * 32}.tmp.wav"
+    fresh = tmp_path / f"{key}.{'1' * 32}.tmp.wav"
+    stale.write_bytes(b"\0" * 10)
+    fresh.write_bytes(b"\0" * 10)
+    os.utime(stale, (0, 0))
+
+    async def synthesize(path):
+        with open(path, "wb") as f:
+            f.write(b"\0" * 100)
+
+    await cache.get_or_create(cache.key("m", "en", "a"), synthesize)
+    await cache.get_or_create(cache.key("m", "en", "b"), synthesize)
+
+    assert not stale.exists()
+    # Another worker may still be writing a recent one
+    assert fresh.exists()
+
+@pytest.mark.asyncio
+async def test_directory_walks_run_off_the_event_loop(tmp_path, monkeypatch):
+    cache = AudioCache(str(tmp_path), "/audio", max_bytes=150)
+    scanned_on = set()
+    scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned_on.add(threading.current_thread().name)
+        return scandir(path)
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+
+    async def synthesize(path):
+        with open(path, "wb") as f:
+            f.write(b"\0" * 100)
+
+    await cache.get_or_create(cache.key("m", "en", "a"), synthesize)
+    await cache.get_or_create(cache.key("m", "en", "b"), synthesize)
+
+    assert cache.stats()["evictions"] == 1
+    assert scanned_on and all(name.startswith("audio-cache") for name in scanned_on)
+    cache.close()
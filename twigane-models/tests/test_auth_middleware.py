@@ -0,0 +1,78 @@
+import time
+import jwt
+import pytest
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from app.core.config import settings
+from app.middleware.auth import AuthMiddleware, TokenCache, token_cache
+
+def make_request(token=None):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/api/x", "headers": headers})
+
+def make_token(**claims):
+    return jwt.encode({"sub": "u1", **claims}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+@pytest.mark.asyncio
+async def test_dependency_reuses_the_principal_from_the_middleware():
+    token_cache.clear()
+    auth = AuthMiddleware()
+    request = make_request(make_token(exp=int(time.time()) + 60))
+
+    principal = await auth.authenticate(request)
+    assert principal["sub"] == "u1"
+    misses = token_cache.misses
+    assert await auth(request) == principal
+    # The second request with the same token is served from the cache
+    assert (await auth(make_request(make_token(exp=principal["exp"]))))["sub"] == "u1"
+    assert token_cache.misses == misses
+
+@pytest.mark.asyncio
+async def test_missing_token_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        await AuthMiddleware()(make_request())
+    assert error.value.status_code == 401
+
+def test_cached_tokens_expire_with_exp():
+    cache = TokenCache(max_entries=3, ttl=300)
+    cache.set("expired", {"sub": "u1", "exp": time.time() - 1})
+    cache.set("valid", {"sub": "u2", "exp": time.time() + 60})
+    cache.set("no-exp", {"sub": "u3"})
+
+    assert cache.get("expired") is None
+    assert cache.expired == 1
+    assert cache.get("valid")["sub"] == "u2"
+    assert cache.get("no-exp")["sub"] == "u3"
+
+    cache.set("a", {"sub": "u4"})
+    cache.set("b", {"sub": "u5"})
+    # Least recently used entry goes first
+    assert cache.get("valid") is None
+    assert cache.stats()["entries"] == 3
+
+def test_websockets_need_a_valid_token():
+    app = FastAPI()
+    auth = AuthMiddleware()
+
+    @app.websocket("/ws")
+    async def ws(websocket: WebSocket):
+        user = await auth.authenticate_websocket(websocket)
+        if user is None:
+            return
+        await websocket.accept()
+        await websocket.send_json({"sub": user["sub"]})
+        await websocket.close()
+
+    client = TestClient(app)
+    for url in ("/ws", "/ws?token=not-a-jwt"):
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with client.websocket_connect(url):
+                pass
+        assert closed.value.code == 1008
+
+    token = make_token(exp=int(time.time()) + 60)
+    with client.websocket_connect(f"/ws?token={token}") as websocket:
+        assert websocket.receive_json() == {"sub": "u1"}
+    with client.websocket_connect("/ws", headers={"Authorization": f"Bearer {token}"}) as websocket:
+        assert websocket.receive_json() == {"sub": "u1"}
@@ -0,0 +1,41 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.executor import hashing_pool
+from app.models.user import UserCreate, UserLogin
+from app.services.auth_service import AuthService, pwd_context
+
+class FakeUsers:
+    def __init__(self, user=None):
+        self.user = user
+        self.queries = []
+
+    async def find_one(self, query, projection=None):
+        self.queries.append(query)
+        return self.user
+
+class FakeDb:
+    def __init__(self, user=None):
+        self.users = FakeUsers(user)
+
+@pytest.mark.asyncio
+async def test_register_checks_email_and_username_in_one_query():
+    db = FakeDb({"email": "other@example.com", "username": "learner"})
+    with pytest.raises(HTTPException) as error:
+        await AuthService(db).register_user(UserCreate(
+            username="learner", email="learner@example.com", full_name="Learner", password="secret1"
+        ))
+    assert error.value.detail == "Username already taken"
+    assert db.users.queries == [{"$or": [{"email": "learner@example.com"}, {"username": "learner"}]}]
+
+@pytest.mark.asyncio
+async def test_login_verifies_the_password_on_the_hashing_pool():
+    hashed = pwd_context.using(bcrypt__rounds=4).hash("secret1")
+    db = FakeDb({"_id": ObjectId(), "hashed_password": hashed})
+    before = hashing_pool.lane("bcrypt").completed
+
+    result = await AuthService(db).login_user(UserLogin(email="learner@example.com", password="secret1"))
+    assert result["token_type"] == "bearer"
+    with pytest.raises(HTTPException):
+        await AuthService(db).login_user(UserLogin(email="learner@example.com", password="wrong"))
+    assert hashing_pool.lane("bcrypt").completed == before + 2
@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from app.core.batching import MicroBatcher
+
+@pytest.mark.asyncio
+async def test_concurrent_items_share_a_batch():
+    seen_batches = []
+
+    async def batch_fn(items):
+        seen_batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=50)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+    await batcher.close()
+
+    assert results == [0, 2, 4, 6, 8]
+    assert seen_batches == [[0, 1, 2, 3, 4]]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["items"] == 5
+    assert stats["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_size():
+    sizes = []
+
+    async def batch_fn(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=50)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+    await batcher.close()
+
+    assert results == list(range(7))
+    assert sizes == [3, 3, 1]
+    assert batcher.stats()["max_batch_size_observed"] == 3
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    async def batch_fn(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=10)
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+    )
+    await batcher.close()
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert batcher.stats()["errors"] == 1
@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+from app.core.cache import ReadThroughCache
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = ReadThroughCache("test_coalesce")
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return {"title": "Imibare"}
+
+    results = await asyncio.gather(*[cache.get_or_load("c1", load) for _ in range(40)])
+    assert all(r == {"title": "Imibare"} for r in results)
+    assert loads == 1
+
+    await cache.get_or_load("c1", load)
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["memory_hits"]) == (1, 39, 1)
+    assert stats["hit_rate"] == pytest.approx(40 / 41)
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_entries_and_in_flight_loads():
+    cache = ReadThroughCache("test_invalidate", ttl=60, max_entries=1)
+    version = 1
+    started = asyncio.Event()
+
+    async def load():
+        document = {"version": version}
+        started.set()
+        await asyncio.sleep(0.01)
+        return document
+
+    pending = asyncio.ensure_future(cache.get_or_load("c1", load))
+    await started.wait()
+    version = 2
+    await cache.invalidate("c1")
+    # The value read before the write is returned but not kept
+    assert await pending == {"version": 1}
+    assert await cache.get_or_load("c1", load) == {"version": 2}
+
+    await cache.get_or_load("c2", load)
+    assert cache.stats()["evictions"] == 1
+
+@pytest.mark.asyncio
+async def test_missing_documents_are_not_cached():
+    cache = ReadThroughCache("test_missing", ttl=0)
+
+    async def load():
+        return None
+
+    assert await cache.get_or_load("c1", load) is None
+    assert await cache.get_or_load("c1", load) is None
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from app.core.executor import ModelBusyError
+from app.core.model_registry import model_registry
+from app.services.chatbot_service import ChatbotService, _QueueStreamer, _StopWhenCancelled
+
+class FakeTranslation:
+    def __init__(self):
+        self.calls = []
+
+    async def translate(self, text, source_lang="eng", target_lang="kin"):
+        self.calls.append((source_lang, target_lang))
+        return f"[{target_lang}] {text}"
+
+class FakeEmotion:
+    async def analyze_emotion(self, text):
+        return {"joy": 1.0}
+
+class FakeStore:
+    def __init__(self):
+        self.saved = []
+
+    async def get(self, user_id):
+        return []
+
+    async def save(self, user_id, context_ids, eos_token_id):
+        self.saved.append((user_id, context_ids))
+
+@pytest.fixture
+def service(monkeypatch):
+    service = ChatbotService()
+    service.translation_service = FakeTranslation()
+    service.emotion_service = FakeEmotion()
+    service.conversation_store = FakeStore()
+    entry = model_registry._entry("chatbot")
+    monkeypatch.setattr(entry, "model", (SimpleNamespace(eos_token_id=0), None))
+    return service
+
+@pytest.mark.asyncio
+async def test_streamer_hands_text_from_the_generation_thread_to_the_loop():
+    queue = asyncio.Queue()
+    streamer = _QueueStreamer(SimpleNamespace(), asyncio.get_running_loop(), queue)
+
+    def generate():
+        streamer.on_finalized_text("Hello")
+        streamer.on_finalized_text("")
+        streamer.on_finalized_text(" there.", stream_end=True)
+
+    thread = threading.Thread(target=generate)
+    thread.start()
+    thread.join()
+    assert [await queue.get(), await queue.get()] == ["Hello", " there."]
+    assert queue.empty()
+
+    assert _StopWhenCancelled(streamer)(None, None) is False
+    streamer.cancelled = True
+    assert _StopWhenCancelled(streamer)(None, None) is True
+
+@pytest.mark.asyncio
+async def test_reply_streams_tokens_then_translated_sentences(service):
+    def generate(tokenizer, model, history, message, streamer=None):
+        for piece in ["Hello there. ", "How are", " you?"]:
+            streamer.on_finalized_text(piece)
+        return "Hello there. How are you?", [1, 0]
+    service._generate = generate
+
+    events = [event async for event in service.stream_response("u1", "Muraho")]
+
+    assert [e["type"] for e in events] == ["token", "sentence", "token", "token", "sentence", "done"]
+    assert [e["text"] for e in events if e["type"] == "sentence"] == [
+        "[kin] Hello there.", "[kin] How are you?"
+    ]
+    assert events[-1]["response"] == "[kin] Hello there. [kin] How are you?"
+    assert events[-1]["emotion_context"] == {"joy": 1.0}
+    # The learner's message is translated to English first
+    assert service.translation_service.calls[0] == ("kin", "eng")
+    assert service.conversation_store.saved == [("u1", [1, 0])]
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_stops_generation(service):
+    stopped = threading.Event()
+
+    def generate(tokenizer, model, history, message, streamer=None):
+        while not streamer.cancelled:
+            streamer.on_finalized_text("word ")
+            time.sleep(0.005)
+        stopped.set()
+        return "word", [1, 0]
+    service._generate = generate
+
+    stream = service.stream_response("u1", "Muraho")
+    assert (await stream.__anext__())["type"] == "token"
+    await stream.aclose()
+
+    # aclose waits for the generation thread, which saw the cancellation
+    assert stopped.is_set()
+    assert service.conversation_store.saved == []
+
+@pytest.mark.asyncio
+async def test_busy_model_keeps_its_503(service):
+    async def busy(*args, **kwargs):
+        raise ModelBusyError("translation", 7)
+    service.translation_service.translate = busy
+
+    with pytest.raises(ModelBusyError) as error:
+        await service.get_response("u1", "Muraho")
+    assert error.value.headers == {"Retry-After": "7"}
+
+@pytest.mark.asyncio
+async def test_a_stalled_reader_does_not_hold_the_model(service):
+    def generate(tokenizer, model, history, message, streamer=None):
+        streamer.on_finalized_text("Hello there. ")
+        return "Hello there.", [1, 0]
+    service._generate = generate
+    entry = model_registry._entry("chatbot")
+
+    stream = service.stream_response("u1", "Muraho")
+    assert (await stream.__anext__())["type"] == "token"
+    # The reader stops here; generation has finished and released the model
+    for _ in range(100):
+        if entry.in_use == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert entry.in_use == 0
+    await stream.aclose()
@@ -0,0 +1,47 @@
+import json
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.core.ndjson import read_lines
+from app.services.content_service import ContentService
+
+async def body(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+def lesson(**fields):
+    record = {"title_rw": "Isomo", "title_en": None, "content_rw": "...", "content_en": None,
+              "content_type": "lesson", "subject": "math", "difficulty_level": "easy", "grade_level": "P4"}
+    record.update(fields)
+    return json.dumps(record)
+
+@pytest.mark.asyncio
+async def test_import_reports_failed_rows_and_inserts_the_rest(fake_db):
+    existing = str(ObjectId())
+    ndjson = "\n".join([
+        lesson(),
+        "{not json",
+        lesson(subject=None),
+        lesson(id=existing),
+        "",
+        lesson(id=existing),
+        lesson(),
+    ]) + "\n"
+    # Split mid-line, as a request body stream would be
+    lines = read_lines(body(ndjson[:50].encode(), ndjson[50:].encode()))
+
+    report = await ContentService(fake_db).import_records("content", lines, "teacher-1", chunk_size=2)
+
+    assert report.inserted == 3
+    assert report.failed == 3
+    assert [e["line"] for e in report.errors] == [2, 3, 6]
+    assert report.errors[1]["detail"].startswith("subject:")
+    assert fake_db.learning_content.batches == [2, 2]
+    assert fake_db.learning_content.ordered == [False, False]
+    assert len(fake_db.learning_content.docs) == 3
+
+@pytest.mark.asyncio
+async def test_unknown_kind_is_rejected(fake_db):
+    with pytest.raises(HTTPException) as error:
+        await ContentService(fake_db).import_records("users", body(), "teacher-1")
+    assert error.value.status_code == 400
@@ -0,0 +1,34 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.services.content_service import ContentService
+
+@pytest.fixture
+def docs(fake_db):
+    docs = [{"_id": ObjectId(), "title_rw": f"Isomo {i}", "subject": "math" if i % 2 else "kinyarwanda"}
+            for i in range(5)]
+    fake_db.learning_content.docs = docs
+    return docs
+
+@pytest.mark.asyncio
+async def test_pages_follow_the_cursor_without_gaps(fake_db, docs):
+    service = ContentService(fake_db)
+    first = await service.list_content(limit=2)
+    second = await service.list_content(limit=2, cursor=first.next_cursor)
+    last = await service.list_content(limit=2, cursor=second.next_cursor)
+
+    ids = [item["id"] for page in (first, second, last) for item in page.items]
+    assert ids == [str(doc["_id"]) for doc in docs]
+    assert last.next_cursor is None
+
+@pytest.mark.asyncio
+async def test_stream_applies_filters_and_projection(fake_db, docs):
+    service = ContentService(fake_db)
+    items = [item async for item in service.stream_content({"subject": "math"}, fields=["title_rw"])]
+    assert [item["title_rw"] for item in items] == ["Isomo 1", "Isomo 3"]
+    assert set(items[0]) == {"id", "title_rw"}
+
+    with pytest.raises(HTTPException):
+        service.stream_content(fields=["password"])
+    with pytest.raises(HTTPException):
+        await service.list_content(cursor="not-an-id")
@@ -0,0 +1,21 @@
+from app.services.conversation_store import ConversationStore
+
+EOS = 0
+
+def test_trim_keeps_whole_turns_within_the_window():
+    store = ConversationStore(max_users=10, max_tokens=6)
+    history = [1, 2, 3, EOS, 4, 5, EOS, 6, 7, EOS]
+
+    assert store.trim(history, EOS) == [4, 5, EOS, 6, 7, EOS]
+    assert store.trim(history, EOS, max_tokens=5) == [6, 7, EOS]
+    assert store.trim([1, 2, EOS], EOS) == [1, 2, EOS]
+
+def test_least_recently_used_conversations_are_evicted():
+    store = ConversationStore(max_users=2, max_tokens=8)
+    store._remember("a", [1, EOS])
+    store._remember("b", [2, EOS])
+    store._remember("a", [1, EOS, 3, EOS])
+    store._remember("c", [4, EOS])
+
+    assert list(store._windows) == ["a", "c"]
+    assert store.stats()["evictions"] == 1
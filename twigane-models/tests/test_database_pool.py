@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+from pymongo.monitoring import ConnectionCheckOutFailedReason
+from app.core.database import PoolStats
+
+ADDRESS = ("localhost", 27017)
+
+def _event(**kwargs):
+    return SimpleNamespace(address=ADDRESS, **kwargs)
+
+def test_pool_stats_track_checked_out_connections_and_waits():
+    stats = PoolStats()
+    stats.pool_created(_event(options={"maxPoolSize": 10}))
+    stats.connection_created(_event(connection_id=1))
+    stats.connection_check_out_started(_event())
+    stats.connection_checked_out(_event(connection_id=1))
+
+    server = stats.stats()["localhost:27017"]
+    assert server["max_pool_size"] == 10
+    assert server["open"] == 1
+    assert server["checked_out"] == 1
+    assert server["checkouts"] == 1
+    assert server["wait_max_ms"] >= 0
+
+    stats.connection_checked_in(_event(connection_id=1))
+    stats.connection_check_out_started(_event())
+    stats.connection_check_out_failed(_event(reason=ConnectionCheckOutFailedReason.TIMEOUT))
+
+    server = stats.stats()["localhost:27017"]
+    assert server["checked_out"] == 0
+    assert server["max_checked_out"] == 1
+    assert server["wait_queue_timeouts"] == 1
@@ -0,0 +1,64 @@
+import io
+from types import SimpleNamespace
+from PIL import Image, ImageDraw
+from app.core.config import settings
+from app.services.essay_service import EssayService, segment_lines
+
+def page(line_widths, line_height=24, gap=40):
+    """White page with one black bar per text line, ``line_widths`` top to bottom"""
+    image = Image.new("RGB", (600, gap + len(line_widths) * (line_height + gap)), "white")
+    draw = ImageDraw.Draw(image)
+    for i, width in enumerate(line_widths):
+        top = gap + i * (line_height + gap)
+        # Words: short bars separated by small spaces, merged by the smearing
+        for left in range(20, 20 + width, 50):
+            draw.rectangle((left, top, min(left + 40, 20 + width), top + line_height), fill="black")
+    return image
+
+def test_lines_are_cut_in_reading_order():
+    widths = [500, 200, 350]
+    lines = segment_lines(page(widths))
+
+    assert len(lines) == 3
+    # Each crop is trimmed to its line's ink, so the widths keep the page order
+    crop_widths = [line.width for line in lines]
+    assert crop_widths[1] < crop_widths[2] < crop_widths[0]
+    assert all(line.height < 64 for line in lines)
+
+def test_blank_page_is_returned_whole():
+    blank = Image.new("RGB", (600, 400), "white")
+    assert segment_lines(blank) == [blank]
+
+def test_specks_are_not_lines():
+    image = page([500, 400])
+    ImageDraw.Draw(image).rectangle((300, 2, 302, 4), fill="black")
+    assert len(segment_lines(image)) == 2
+
+class StubProcessor:
+    def __call__(self, images, return_tensors=None):
+        return SimpleNamespace(pixel_values=list(images))
+
+    def batch_decode(self, ids, skip_special_tokens=True):
+        return list(ids)
+
+class StubModel:
+    """Reads each line as its crop width and records the batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def generate(self, pixel_values):
+        self.batch_sizes.append(len(pixel_values))
+        return [str(image.width) for image in pixel_values]
+
+def test_lines_are_recognized_in_chunks_and_keep_their_order(monkeypatch):
+    monkeypatch.setattr(settings, "ESSAY_MAX_BATCH_LINES", 2)
+    buffer = io.BytesIO()
+    page([500, 200, 350, 100, 420]).save(buffer, format="PNG")
+    model = StubModel()
+
+    lines = EssayService()._transcribe((StubProcessor(), model), buffer.getvalue())
+
+    assert model.batch_sizes == [2, 2, 1]
+    widths = [int(line) for line in lines]
+    assert widths[3] < widths[1] < widths[2] < widths[4] < widths[0]
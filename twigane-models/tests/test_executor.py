@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.executor import WorkerPool, ModelBusyError
+
+@pytest.mark.asyncio
+async def test_work_runs_off_the_event_loop():
+    pool = WorkerPool(max_workers=2)
+    loop_thread = threading.get_ident()
+
+    worker_thread = await pool.run("model", threading.get_ident)
+    pool.shutdown()
+
+    assert worker_thread != loop_thread
+    assert pool.stats()["lanes"]["model"]["completed"] == 1
+
+@pytest.mark.asyncio
+async def test_lane_concurrency_is_limited():
+    pool = WorkerPool(max_workers=4, concurrency={"model": 1}, queue_size=10)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    await asyncio.gather(*(pool.run("model", work) for _ in range(4)))
+    pool.shutdown()
+
+    assert peak == 1
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    pool = WorkerPool(max_workers=1, concurrency={"model": 1}, queue_size=1, retry_after=7)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(pool.run("model", release.wait))
+    queued = asyncio.ensure_future(pool.run("model", lambda: None))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ModelBusyError) as exc_info:
+        await pool.run("model", lambda: None)
+    release.set()
+    await asyncio.gather(running, queued)
+    pool.shutdown()
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "7"
+    assert pool.stats()["lanes"]["model"]["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_the_lane_until_the_thread_finishes():
+    pool = WorkerPool(max_workers=2, concurrency={"model": 1}, queue_size=10)
+    release = threading.Event()
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(wait):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        if wait:
+            release.wait(1)
+        with lock:
+            active -= 1
+
+    first = asyncio.ensure_future(pool.run("model", work, True))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    second = asyncio.ensure_future(pool.run("model", work, False))
+    await asyncio.sleep(0.02)
+    # The first call is still running on its thread, so the second one waits
+    assert not second.done()
+    assert pool.stats()["lanes"]["model"]["running"] == 1
+
+    release.set()
+    await second
+    pool.shutdown()
+    assert peak == 1
+    assert pool.stats()["lanes"]["model"]["running"] == 0
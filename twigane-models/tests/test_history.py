@@ -0,0 +1,58 @@
+import pytest
+from datetime import datetime
+from app.core.history import HistoryBuckets
+
+class RecordingCollection:
+    def __init__(self):
+        self.updates = []
+        self.pipelines = []
+        self.bulk = []
+
+    async def bulk_write(self, requests, ordered=True, session=None):
+        self.bulk.append(requests)
+
+    async def update_one(self, query, update, upsert=False, session=None):
+        self.updates.append((query, update, upsert))
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return self
+
+    async def to_list(self, length):
+        return []
+
+@pytest.mark.asyncio
+async def test_append_targets_a_bucket_with_room():
+    history = HistoryBuckets("lesson_history", "completed_at", bucket_size=3)
+    collection = RecordingCollection()
+    when = datetime(2024, 5, 1)
+    await history.append({"lesson_history": collection}, "u1", {"lesson_id": "l1", "completed_at": when})
+
+    query, update, upsert = collection.updates[0]
+    assert query == {"user_id": "u1", "count": {"$lt": 3}}
+    assert update["$inc"] == {"count": 1}
+    assert update["$min"] == {"start": when} and update["$max"] == {"end": when}
+    assert upsert
+
+@pytest.mark.asyncio
+async def test_find_only_scans_buckets_overlapping_the_range():
+    history = HistoryBuckets("lesson_history", "completed_at")
+    collection = RecordingCollection()
+    start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+    await history.find({"lesson_history": collection}, "u1", start, end, limit=10)
+
+    pipeline = collection.pipelines[0]
+    assert pipeline[0] == {"$match": {"user_id": "u1", "end": {"$gte": start}, "start": {"$lte": end}}}
+    assert {"$match": {"completed_at": {"$gte": start, "$lte": end}}} in pipeline
+    assert pipeline[-1] == {"$limit": 10}
+
+@pytest.mark.asyncio
+async def test_grouped_append_never_overfills_a_bucket():
+    history = HistoryBuckets("assessment_history", "completed_at", bucket_size=3)
+    collection = RecordingCollection()
+    events = [{"assessment_id": str(i), "completed_at": datetime(2024, 5, i + 1)} for i in range(4)]
+    await history.append_grouped({"assessment_history": collection}, {"u1": events, "u2": events[:1]})
+
+    requests = collection.bulk[0]
+    assert [r._filter["count"] for r in requests] == [{"$lt": 1}, {"$lt": 3}, {"$lt": 3}]
+    assert [r._doc["$inc"]["count"] for r in requests] == [3, 1, 1]
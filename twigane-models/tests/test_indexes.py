@@ -0,0 +1,48 @@
+import pytest
+from app.core.indexes import INDEXES, ensure_indexes
+
+def _index(collection, name):
+    return next(model.document for model in INDEXES[collection] if model.document["name"] == name)
+
+def test_notifications_expire_through_a_ttl_index():
+    ttl = _index("notifications", "expires_at_ttl")
+    assert ttl["expireAfterSeconds"] == 0
+
+def test_user_identifiers_are_unique():
+    assert _index("users", "email_unique")["unique"]
+    assert _index("users", "username_unique")["unique"]
+
+def test_every_content_filter_combination_pages_in_index_order():
+    keys = {tuple(field for field, _ in model.document["key"].items()) for model in INDEXES["learning_content"]}
+    for subject in (True, False):
+        for grade in (True, False):
+            for difficulty in (True, False):
+                fields = [f for f, used in (("subject", subject), ("grade_level", grade),
+                                            ("difficulty_level", difficulty)) if used]
+                if fields:
+                    assert tuple(fields) + ("_id",) in keys
+
+class FakeIndexedCollection:
+    def __init__(self, names):
+        self.names = names
+        self.dropped = []
+
+    async def create_indexes(self, models):
+        return [model.document["name"] for model in models]
+
+    async def index_information(self):
+        return {name: {} for name in self.names}
+
+    async def drop_index(self, name):
+        self.dropped.append(name)
+
+@pytest.mark.asyncio
+async def test_only_replaced_indexes_are_dropped():
+    content = FakeIndexedCollection(["_id_", "subject_grade_difficulty", "difficulty", "difficulty_id", "hand_made"])
+    db = {collection: FakeIndexedCollection(["_id_", "hand_made"]) for collection in INDEXES}
+    db["learning_content"] = content
+
+    await ensure_indexes(db)
+
+    assert content.dropped == ["subject_grade_difficulty", "difficulty"]
+    assert all(not db[c].dropped for c in INDEXES if c != "learning_content")
@@ -0,0 +1,47 @@
+import pytest
+from app.core.model_registry import ModelRegistry
+
+@pytest.mark.asyncio
+async def test_models_load_lazily_and_warm_up_once():
+    calls = {"load": 0, "warmup": 0}
+
+    def loader():
+        calls["load"] += 1
+        return {"weights": "loaded"}
+
+    def warmup(model):
+        calls["warmup"] += 1
+
+    registry = ModelRegistry(memory_budget_mb=100, idle_seconds=0, eviction_interval=60)
+    registry.register("demo", loader, warmup=warmup, memory_mb=10)
+    assert registry.status("demo")["ready"] is False
+    assert calls["load"] == 0
+
+    await registry.warmup("demo")
+    await registry.warmup("demo")
+    assert await registry.get("demo") == {"weights": "loaded"}
+
+    assert calls == {"load": 1, "warmup": 1}
+    assert registry.status("demo")["ready"] is True
+
+@pytest.mark.asyncio
+async def test_idle_models_are_evicted_over_budget():
+    registry = ModelRegistry(memory_budget_mb=15, idle_seconds=0, eviction_interval=60)
+    registry.register("first", lambda: "a", memory_mb=10)
+    registry.register("second", lambda: "b", memory_mb=10)
+
+    await registry.get("first")
+    await registry.get("second")
+
+    assert registry.status("first")["state"] == "unloaded"
+    assert registry.status("second")["ready"] is True
+
+@pytest.mark.asyncio
+async def test_models_in_use_are_not_evicted():
+    registry = ModelRegistry(memory_budget_mb=15, idle_seconds=0, eviction_interval=60)
+    registry.register("first", lambda: "a", memory_mb=10)
+    registry.register("second", lambda: "b", memory_mb=10)
+
+    async with registry.use("first"):
+        await registry.get("second")
+        assert registry.status("first")["ready"] is True
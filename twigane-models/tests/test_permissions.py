@@ -0,0 +1,30 @@
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.analytics_routes import analytics_router
+from app.core.database import get_database
+from app.services.auth_service import AuthService
+
+@pytest.fixture
+def client(fake_db):
+    app = FastAPI()
+    app.include_router(analytics_router, prefix="/api/analytics")
+    app.dependency_overrides[get_database] = lambda: fake_db
+    return TestClient(app)
+
+def headers(fake_db, user_id):
+    token = AuthService(fake_db).create_access_token({"sub": user_id})
+    return {"Authorization": f"Bearer {token}"}
+
+def test_gated_routes_use_the_role_from_the_profile(client, fake_db):
+    fake_db.profiles.docs = [
+        {"user_id": "admin1", "role": "admin", "last_updated": datetime.utcnow()},
+        {"user_id": "student1", "role": "student", "last_updated": datetime.utcnow()},
+    ]
+    url = "/api/analytics/content?content_ids=c1"
+
+    assert client.get(url, headers=headers(fake_db, "admin1")).status_code == 200
+    assert client.get(url, headers=headers(fake_db, "student1")).status_code == 403
+    # Users without a profile are students
+    assert client.get(url, headers=headers(fake_db, "new-user")).status_code == 403
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.core.batching import MicroBatcher
+from app.core.executor import WorkerPool
+from app.core.timing import timed
+from app.middleware.accessibility import AccessibleJSONResponse
+from app.middleware.auth import RequireAuthMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+
+def make_app(slow_threshold_ms=1000):
+    app = FastAPI(default_response_class=AccessibleJSONResponse)
+    pool = WorkerPool(max_workers=1)
+
+    @app.get("/api/lesson")
+    async def lesson():
+        with timed("db"):
+            await asyncio.sleep(0.01)
+        await pool.run("test", sum, [1, 2])
+        return {"title": "Isomo"}
+
+    async def double(items):
+        return await pool.run("test", lambda values: [2 * v for v in values], items)
+    app.state.batcher = MicroBatcher(double, max_wait_ms=20)
+
+    @app.get("/api/batched/{value}")
+    async def batched(value: int):
+        return {"value": await app.state.batcher.submit(value)}
+
+    @app.get("/api/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequireAuthMiddleware, public_paths=["/api/lesson", "/api/batched", "/api/broken"])
+    app.add_middleware(ServerTimingMiddleware, slow_threshold_ms=slow_threshold_ms)
+    return app
+
+def client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+@pytest.mark.asyncio
+async def test_server_timing_header_lists_each_stage():
+    async with client(make_app()) as http:
+        response = await http.get("/api/lesson")
+    assert response.status_code == 200
+    metrics = {entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")}
+    assert metrics == {"db", "model", "serialize", "total"}
+
+@pytest.mark.asyncio
+async def test_slow_requests_are_logged_with_their_stages(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.middleware.timing.slow"):
+        async with client(make_app(slow_threshold_ms=0)) as http:
+            await http.get("/api/lesson")
+    assert "Slow request GET /api/lesson -> 200" in caplog.text
+    assert "'db'" in caplog.text
+
+@pytest.mark.asyncio
+async def test_errors_and_missing_tokens_become_json_responses():
+    async with client(make_app()) as http:
+        broken = await http.get("/api/broken")
+        private = await http.get("/api/profile")
+    assert broken.status_code == 500
+    assert broken.json()["detail"] == "boom"
+    assert "server-timing" in broken.headers
+    assert private.status_code == 401
+    assert private.json()["path"] == "/api/profile"
+    assert "auth;dur=" in private.headers["server-timing"]
+
+@pytest.mark.asyncio
+async def test_batched_requests_each_time_their_own_model_wait():
+    app = make_app()
+    async with client(app) as http:
+        first, second = await asyncio.gather(http.get("/api/batched/1"), http.get("/api/batched/2"))
+    await app.state.batcher.close()
+    assert (first.json(), second.json()) == ({"value": 2}, {"value": 4})
+    for response in (first, second):
+        # The shared batch is not added to whichever request started the worker
+        assert 'model;dur=' in response.headers["server-timing"]
+        assert '"1x"' in response.headers["server-timing"]
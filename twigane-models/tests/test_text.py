@@ -0,0 +1,19 @@
+from app.core.text import split_sentences, segment_document, reassemble, split_complete_sentences
+
+def test_split_sentences_keeps_closing_quotes():
+    assert split_sentences('She said "Muraho." Then she left! Why?') == [
+        'She said "Muraho."', "Then she left!", "Why?"
+    ]
+
+def test_segments_round_trip_layout():
+    document = "First line. Second sentence.\n\nNew paragraph"
+    segments = segment_document(document)
+
+    assert [s for s, _ in segments] == ["First line.", "Second sentence.", "New paragraph"]
+    assert reassemble(segments, [s.upper() for s, _ in segments]) == \
+        "FIRST LINE. SECOND SENTENCE.\n\nNEW PARAGRAPH"
+
+def test_split_complete_sentences_keeps_the_unfinished_tail():
+    assert split_complete_sentences("Hello there. How ") == (["Hello there."], "How ")
+    assert split_complete_sentences("Hello there. ") == (["Hello there."], "")
+    assert split_complete_sentences("Hello") == ([], "Hello")
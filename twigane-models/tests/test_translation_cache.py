@@ -0,0 +1,57 @@
+import pytest
+from app.core.translation_cache import TranslationCache
+
+def test_keys_ignore_whitespace_differences():
+    a = TranslationCache.make_key("nllb", "eng", "kin", "  Good   morning ")
+    b = TranslationCache.make_key("nllb", "eng", "kin", "Good morning")
+    c = TranslationCache.make_key("nllb", "eng", "fra", "Good morning")
+    assert a == b
+    assert a != c
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "translations.sqlite3")
+    cache = TranslationCache(path, memory_entries=10, max_entries=100)
+    key = cache.make_key("nllb", "eng", "kin", "Good morning")
+    cache.set(key, "Mwaramutse")
+    cache.close()
+
+    reopened = TranslationCache(path, memory_entries=10, max_entries=100)
+    assert reopened.get(key) == "Mwaramutse"
+    assert reopened.get(key) == "Mwaramutse"
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+
+def test_disk_tier_is_capped(tmp_path):
+    cache = TranslationCache(str(tmp_path / "t.sqlite3"), memory_entries=2, max_entries=10)
+    for i in range(25):
+        cache.set(f"key-{i}", f"value-{i}")
+
+    assert cache.stats()["disk_entries"] <= 10
+    assert cache.get("key-0") is None
+    assert cache.get("key-24") == "value-24"
+    assert cache.stats()["misses"] == 1
+
+def test_inference_mode_is_part_of_the_key():
+    fp32 = TranslationCache.make_key("nllb", "eng", "kin", "Good morning")
+    int8 = TranslationCache.make_key("nllb", "eng", "kin", "Good morning", "int8")
+    assert fp32 != int8
+
+@pytest.mark.asyncio
+async def test_batches_read_and_write_the_disk_tier_together(tmp_path):
+    path = str(tmp_path / "t.sqlite3")
+    cache = TranslationCache(path, memory_entries=10, max_entries=100)
+    await cache.set_many({"a": "1", "b": "2", "c": "3"})
+    cache.close()
+
+    reopened = TranslationCache(path, memory_entries=10, max_entries=100)
+    assert reopened.get("a") == "1"
+    found = await reopened.get_many(["a", "b", "missing", "b"])
+    reopened.close()
+
+    assert found == {"a": "1", "b": "2"}
+    stats = reopened.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["disk_hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["disk_entries"] == 3
@@ -0,0 +1,131 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from app.api.translation_routes import translation_router
+from app.core.config import settings
+from app.core.model_registry import model_registry
+from app.core.translation_cache import TranslationCache
+from app.services import translation_service
+from app.services.auth_service import AuthService
+from app.services.translation_service import TranslationService
+
+class StubTokenizer:
+    src_lang = None
+
+    def __call__(self, sentences, **kwargs):
+        self.tokenized_as = self.src_lang
+        return {"input_ids": list(sentences)}
+
+    def convert_tokens_to_ids(self, token):
+        return token
+
+    def batch_decode(self, outputs, **kwargs):
+        return list(outputs)
+
+class StubModel:
+    """Upper-cases each sentence and records the batches it was given"""
+
+    def __init__(self):
+        self.batches = []
+        self.forced_bos = []
+
+    def generate(self, input_ids, forced_bos_token_id=None, **kwargs):
+        self.batches.append(list(input_ids))
+        self.forced_bos.append(forced_bos_token_id)
+        return [sentence.upper() for sentence in input_ids]
+
+@pytest.fixture
+def stub_model(monkeypatch, tmp_path):
+    model = StubModel()
+    entry = model_registry._entry("translation")
+    model.tokenizer = StubTokenizer()
+    monkeypatch.setattr(entry, "model", (model.tokenizer, model))
+    cache = TranslationCache(str(tmp_path / "t.sqlite3"), memory_entries=100, max_entries=100)
+    monkeypatch.setattr(translation_service, "translation_cache", cache)
+    monkeypatch.setattr(settings, "TRANSLATION_CACHE_ENABLED", True)
+    yield model
+    cache.close()
+
+def test_buckets_are_capped_by_size_and_padded_length(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_MAX_CHARS", 20)
+    sentences = ["e" * 10, "a", "f" * 15, "ccc", "bb", "dddd"]
+
+    buckets = TranslationService()._length_buckets([(s, s) for s in sentences])
+
+    assert [[s for s, _ in bucket] for bucket in buckets] == [
+        ["a", "bb", "ccc"],      # full at TRANSLATION_BATCH_SIZE
+        ["dddd", "e" * 10],      # 2 x 10 chars fits in 20
+        ["f" * 15],              # 3 x 15 chars would not
+    ]
+
+@pytest.mark.asyncio
+async def test_sentences_are_deduplicated_and_cached(stub_model):
+    texts = ["Good morning. Open your books.", "Good  morning.", "Open your books."]
+
+    translations = await TranslationService().translate_batch(texts)
+
+    assert translations == ["GOOD MORNING. OPEN YOUR BOOKS.", "GOOD MORNING.", "OPEN YOUR BOOKS."]
+    generated = [s for batch in stub_model.batches for s in batch]
+    assert sorted(generated) == ["Good morning.", "Open your books."]
+
+    # A second request is answered from the cache without generating
+    calls = len(stub_model.batches)
+    assert await TranslationService().translate_batch(["Open your books."]) == ["OPEN YOUR BOOKS."]
+    assert len(stub_model.batches) == calls
+
+@pytest.mark.asyncio
+async def test_stream_yields_each_document_once_and_keeps_layout(stub_model, monkeypatch):
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_SIZE", 1)
+    texts = ["A much longer opening sentence here. Short.", "Hi.", "First line.\n\nSecond line."]
+
+    streamed = [item async for item in TranslationService().translate_batch_stream(texts)]
+
+    assert sorted(index for index, _ in streamed) == [0, 1, 2]
+    # Documents are yielded as soon as their last sentence is done, short ones first
+    assert streamed[0][0] == 1
+    assert dict(streamed) == {
+        0: "A MUCH LONGER OPENING SENTENCE HERE. SHORT.",
+        1: "HI.",
+        2: "FIRST LINE.\n\nSECOND LINE.",
+    }
+    assert all(len(batch) == 1 for batch in stub_model.batches)
+
+@pytest.mark.asyncio
+async def test_language_pair_reaches_generation(stub_model):
+    await TranslationService().translate("Mwaramutse.", source_lang="kin", target_lang="eng")
+
+    assert stub_model.tokenizer.tokenized_as == "kin_Latn"
+    assert stub_model.forced_bos == ["eng_Latn"]
+    # The reverse direction has its own cache entries
+    await TranslationService().translate("Mwaramutse.", source_lang="eng", target_lang="kin")
+    assert stub_model.forced_bos == ["eng_Latn", "kin_Latn"]
+
+    with pytest.raises(HTTPException) as error:
+        await TranslationService().translate("Bonjour.", source_lang="fra", target_lang="kin")
+    assert error.value.status_code == 400
+
+def test_streamed_batch_refuses_an_unsupported_language_before_streaming(stub_model, fake_db):
+    app = FastAPI()
+    app.include_router(translation_router, prefix="/api/translation")
+    token = AuthService(fake_db).create_access_token({"sub": "u1"})
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+    response = client.post("/api/translation/batch", json={
+        "texts": ["Bonjour."], "source_lang": "fra", "target_lang": "kin", "stream": True
+    })
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported language 'fra'"
+    assert stub_model.batches == []
+
+@pytest.mark.asyncio
+async def test_stream_releases_the_model_between_buckets(stub_model, monkeypatch):
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_SIZE", 1)
+    entry = model_registry._entry("translation")
+
+    stream = TranslationService().translate_batch_stream(["One.", "Two two."])
+    await stream.__anext__()
+    # Suspended at a yield to the client, no inference call is running
+    assert entry.in_use == 0
+    await stream.aclose()